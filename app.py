@@ -1,14 +1,20 @@
 
 import streamlit as st
 import os
+from application_pages.instrumentation import begin_rerun, checkpoint, end_rerun
 
-# Ensure the application_pages directory exists
-# This part won't run when writing the file, but it's good practice for local execution
-if not os.path.exists("application_pages"):
-    os.makedirs("application_pages")
+# Page modules (and the pandas/plotly imports inside them) are only loaded when their page
+# is selected, so keep heavy imports out of this script.
+LOGO_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "assets", "logo5.jpg")
 
 st.set_page_config(page_title="QuLab", layout="wide")
-st.sidebar.image("https://www.quantuniversity.com/assets/img/logo5.jpg")
+begin_rerun()
+# The logo is read from assets/logo5.jpg and never fetched remotely. The image is not in the
+# repository yet; until it is added there, the sidebar shows the name instead.
+if os.path.exists(LOGO_PATH):
+    st.sidebar.image(LOGO_PATH)
+else:
+    st.sidebar.markdown("**QuantUniversity**")
 st.sidebar.divider()
 st.title("QuLab: Derivative Pricing and Valuation")
 st.divider()
@@ -40,13 +46,32 @@ This application allows you to interactively explore these concepts, visualize t
 """)
 
 # Your code starts here
-page = st.sidebar.selectbox(label="Navigation", options=["FRA Settlement Simulator", "APR Conversion Utility"])
+page = st.sidebar.selectbox(label="Navigation", options=["FRA Settlement Simulator", "FRA Blotter Ingestion", "FRA Risk Ladder", "FRA Book What-If", "FRA Scenario VaR", "APR Conversion Utility"])
+checkpoint("app header")
 
 if page == "FRA Settlement Simulator":
     from application_pages.fra_settlement import run_fra_settlement_page
+    checkpoint("page import")
     run_fra_settlement_page()
+elif page == "FRA Blotter Ingestion":
+    from application_pages.blotter_ingestion import run_blotter_ingestion_page
+    checkpoint("page import")
+    run_blotter_ingestion_page()
+elif page == "FRA Risk Ladder":
+    from application_pages.risk_ladder import run_risk_ladder_page
+    checkpoint("page import")
+    run_risk_ladder_page()
+elif page == "FRA Book What-If":
+    from application_pages.book_whatif import run_book_whatif_page
+    checkpoint("page import")
+    run_book_whatif_page()
+elif page == "FRA Scenario VaR":
+    from application_pages.scenario_var import run_scenario_var_page
+    checkpoint("page import")
+    run_scenario_var_page()
 elif page == "APR Conversion Utility":
     from application_pages.apr_conversion import run_apr_conversion_page
+    checkpoint("page import")
     run_apr_conversion_page()
 
 # Your code ends
@@ -81,3 +106,5 @@ This notebook was created for **educational purposes only** and is **not intende
 
 All rights reserved. For permissions or commercial licensing, contact: [info@quantuniversity.com](mailto:info@quantuniversity.com)
 ''')
+
+end_rerun(page)
@@ -1,10 +1,12 @@
 
 import streamlit as st
-import math
+import numpy as np
+from application_pages.instrumentation import checkpoint
+from pricing.apr import CONTINUOUS, STANDARD_FREQUENCIES, convert_apr, convert_to_frequencies, equivalence_matrix, frequency_label
 
 def run_apr_conversion_page():
     st.header("Annual Percentage Rate (APR) Conversion Utility")
-    st.markdown(\"\"\"
+    st.markdown("""
 This utility helps you convert Annual Percentage Rates (APR) between different compounding frequencies.
 Ensuring rates are on a comparable compounding basis is crucial for accurate financial analysis and calculations.
 
@@ -23,7 +25,12 @@ Where:
 To convert $APR_m$ (compounded $m$ times a year) to $APR_n$ (compounded $n$ times a year), the formula is rearranged to solve for $APR_n$:
 
 $$ APR_n = n \\times \\left( \\left(1 + \\frac{APR_m}{m}\\right)^{\\frac{m}{n}} - 1 \\right) $$
-\"\"\")
+
+For **continuous compounding** ($m \\to \\infty$), $\\left(1 + \\frac{APR_m}{m}\\right)^m$ becomes $e^{APR_\\infty}$, so
+$APR_\\infty = m \\ln\\left(1 + \\frac{APR_m}{m}\\right)$ and $APR_n = n \\left(e^{APR_\\infty / n} - 1\\right)$.
+""")
+
+    checkpoint("page intro")
 
     st.sidebar.header("APR Conversion Inputs")
 
@@ -35,20 +42,38 @@ $$ APR_n = n \\times \\left( \\left(1 + \\frac{APR_m}{m}\\right)^{\\frac{m}{n}}
         format="%.4f",
         help="The Annual Percentage Rate to convert."
     )
-    original_compounding_freq = st.sidebar.number_input(
-        "Original Compounding Frequency (m)",
-        min_value=1,
-        value=2, # Semi-annual
-        step=1,
-        help="The number of times per year the original APR is compounded."
+    original_continuous = st.sidebar.checkbox(
+        "Original APR is continuously compounded",
+        value=False,
+        help="Treat the original APR as continuously compounded (m = ∞)."
     )
-    target_compounding_freq = st.sidebar.number_input(
-        "Target Compounding Frequency (n)",
-        min_value=1,
-        value=12, # Monthly
-        step=1,
-        help="The number of times per year for the target APR compounding."
+    if original_continuous:
+        original_compounding_freq = CONTINUOUS
+    else:
+        original_compounding_freq = st.sidebar.number_input(
+            "Original Compounding Frequency (m)",
+            min_value=1,
+            value=2, # Semi-annual
+            step=1,
+            help="The number of times per year the original APR is compounded."
+        )
+    target_continuous = st.sidebar.checkbox(
+        "Target APR is continuously compounded",
+        value=False,
+        help="Convert to a continuously compounded APR (n = ∞)."
     )
+    if target_continuous:
+        target_compounding_freq = CONTINUOUS
+    else:
+        target_compounding_freq = st.sidebar.number_input(
+            "Target Compounding Frequency (n)",
+            min_value=1,
+            value=12, # Monthly
+            step=1,
+            help="The number of times per year for the target APR compounding."
+        )
+
+    checkpoint("widget parsing")
 
     st.subheader("Conversion Results")
 
@@ -56,44 +81,83 @@ $$ APR_n = n \\times \\left( \\left(1 + \\frac{APR_m}{m}\\right)^{\\frac{m}{n}}
         st.error("Error: Compounding frequencies must be positive integers.")
         return
 
-    # Calculate the equivalent effective annual rate first for robustness
-    # (1 + APR_m/m)^m = (1 + EAR)
-    # EAR = (1 + APR_m/m)^m - 1
-    
-    # Calculate the target APR
-    # APR_n = n * ((1 + EAR)^(1/n) - 1)
-    # Substituting EAR: APR_n = n * ((1 + APR_m/m)^(m/n) - 1)
+    conversion = convert_apr(original_apr, original_compounding_freq, target_compounding_freq)
+    if not conversion.valid:
+        st.error("Error: The term (1 + Original APR / Original Compounding Frequency) must be positive.")
+        return
+    target_apr = float(conversion.apr)
+    checkpoint("conversion math")
+
+    original_label = frequency_label(original_compounding_freq)
+    target_label = frequency_label(target_compounding_freq)
+    st.markdown(f"**Original APR (compounded {original_label}):** {original_apr:.4f} ({original_apr:.2%})")
+    st.markdown(f"**Target Compounding Frequency (n):** {target_label}")
+    st.markdown(f"**Equivalent APR (compounded {target_label}):** {target_apr:.4f} ({target_apr:.2%})")
+
+    import pandas as pd
+    checkpoint("pandas import")
+
+    st.markdown("---")
+    st.subheader("Equivalence Across Standard Compounding Frequencies")
+    labels = [frequency_label(f) for f in STANDARD_FREQUENCIES]
+    equivalents = convert_to_frequencies(original_apr, original_compounding_freq)
+    st.markdown(f"APRs equivalent to {original_apr:.4%} compounded {original_label}:")
+    st.dataframe(
+        pd.DataFrame([equivalents.apr], columns=labels).style.format("{:.4%}"),
+        hide_index=True
+    )
+    st.markdown(f"Full equivalence matrix for an APR of {original_apr:.4%}: row = frequency the APR is quoted at, column = equivalent APR at that frequency.")
+    matrix = equivalence_matrix(original_apr)
+    st.dataframe(
+        pd.DataFrame(matrix.apr, index=labels, columns=labels).style.format("{:.4%}", na_rep="invalid")
+    )
+
+    checkpoint("equivalence tables")
+
+    st.markdown("---")
+    _render_batch_conversion(original_compounding_freq, original_label)
+
+
+def _render_batch_conversion(original_compounding_freq, original_label):
+    import pandas as pd
+
+    st.subheader("Batch Conversion")
+    st.markdown(f"""
+Upload a CSV file with a column of quoted APRs (as decimals, e.g. 0.06 for 6%). Every rate is treated as compounded
+{original_label} (the Original Compounding Frequency above) and converted to all standard frequencies at once.
+Rates that cannot be converted (missing, non-numeric, or with $1 + APR/m \\le 0$) are flagged rather than stopping the batch.
+""")
+    uploaded = st.file_uploader("Rates File (CSV)", type=["csv"])
+    if uploaded is None:
+        return
 
     try:
-        # Avoid division by zero if original_compounding_freq is 0
-        if original_compounding_freq == 0:
-            st.error("Error: Original compounding frequency cannot be zero.")
-            return
-
-        # Calculate the base term (1 + APR_m/m)
-        base_term = 1 + (original_apr / original_compounding_freq)
-        
-        # Check for non-positive base to prevent math domain error for fractional powers
-        if base_term <= 0:
-            st.error("Error: The term (1 + Original APR / Original Compounding Frequency) must be positive.")
-            return
-
-        # Calculate the power (m/n)
-        power_term = original_compounding_freq / target_compounding_freq
-
-        # Calculate (1 + APR_m/m)^(m/n)
-        intermediate_result = base_term ** power_term
-
-        # Calculate APR_n
-        target_apr = target_compounding_freq * (intermediate_result - 1)
-
-        st.markdown(f"**Original APR (compounded {original_compounding_freq} times/year):** {original_apr:.4f} ({original_apr:.2%})")
-        st.markdown(f"**Target Compounding Frequency (n):** {target_compounding_freq}")
-        st.markdown(f"**Equivalent APR (compounded {target_compounding_freq} times/year):** {target_apr:.4f} ({target_apr:.2%})")
-
-    except ZeroDivisionError:
-        st.error("Error: Original Compounding Frequency (m) cannot be zero.")
-    except ValueError as e:
-        st.error(f"Calculation Error: {e}. Please ensure inputs result in valid mathematical operations (e.g., positive base for fractional powers).")
-    except Exception as e:
-        st.error(f"An unexpected error occurred: {e}")
+        rates_df = pd.read_csv(uploaded)
+    except (ValueError, pd.errors.ParserError) as e:
+        st.error(f"Error: Could not read the uploaded file: {e}")
+        return
+    if rates_df.empty:
+        st.warning("The uploaded file contains no rows.")
+        return
+
+    rate_column = st.selectbox("Rate Column", options=list(rates_df.columns))
+    rates = pd.to_numeric(rates_df[rate_column], errors="coerce").to_numpy(dtype=np.float64)
+    converted = convert_to_frequencies(rates, original_compounding_freq)
+    checkpoint("conversion math: batch")
+
+    result_df = pd.DataFrame(converted.apr, columns=[f"APR {frequency_label(f)}" for f in STANDARD_FREQUENCIES])
+    result_df.insert(0, rate_column, rates_df[rate_column])
+    result_df["Valid"] = converted.valid.all(axis=1)
+    checkpoint("DataFrame construction: batch")
+
+    invalid_count = int((~result_df["Valid"]).sum())
+    st.markdown(f"**Rates converted:** {len(result_df) - invalid_count:,} of {len(result_df):,}")
+    if invalid_count:
+        st.warning(f"{invalid_count:,} rates could not be converted and are marked invalid.")
+    st.dataframe(result_df.head(1_000))
+    st.download_button(
+        "Download Converted Rates (CSV)",
+        data=result_df.to_csv(index=False),
+        file_name="converted_aprs.csv",
+        mime="text/csv"
+    )
@@ -0,0 +1,233 @@
+import os
+import re
+
+import streamlit as st
+from application_pages.calendars import render_holiday_calendar
+from application_pages.instrumentation import checkpoint
+from pricing.blotter import BLOTTER_COLUMNS, DEFAULT_CHUNKSIZE, generate_sample_blotter, process_blotter, validated_blotter_chunks
+from pricing.parallel import DEFAULT_WORKERS, value_blotter
+from pricing.store import DEFAULT_STORE_DIR, TradeStore, available_trade_stores, write_trade_store
+
+
+# Server-side blotters and result files are confined to this directory
+DATA_DIR = os.environ.get("QULAB_DATA_DIR", os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data"))
+
+
+def resolve_data_path(path, data_dir=DATA_DIR):
+    """Resolve a path entered in the UI inside `data_dir`.
+
+    The path must be relative and stay inside the directory once '..' components and
+    symlinks are resolved, so browser sessions cannot read or overwrite other files
+    on the server. Raises ValueError otherwise.
+    """
+    if os.path.isabs(path) or ".." in re.split(r"[\\/]", path):
+        raise ValueError(f"Paths must be relative to the data directory {data_dir} and may not contain '..'.")
+    root = os.path.realpath(data_dir)
+    resolved = os.path.realpath(os.path.join(root, path))
+    if os.path.commonpath([root, resolved]) != root:
+        raise ValueError(f"Path {path} resolves outside the data directory {data_dir}.")
+    return resolved
+
+
+@st.cache_data(max_entries=4, show_spinner=False)
+def _cached_sample_blotter(n_trades, seed):
+    return generate_sample_blotter(n_trades, seed)
+
+
+# One memory-mapped store per directory is shared by every session; the manifest's
+# modification time invalidates it when the store is rewritten.
+@st.cache_resource(max_entries=8, show_spinner=False)
+def _cached_trade_store(path, mtime):
+    return TradeStore(path)
+
+
+def render_blotter_source():
+    """Sidebar controls choosing an FRA blotter.
+
+    Returns a path, an uploaded file, a sample DataFrame or a TradeStore; None if
+    nothing has been chosen yet; or False after reporting an error.
+    """
+    st.sidebar.header("Blotter Source")
+    source_kind = st.sidebar.radio(
+        "Read blotter from",
+        options=["Upload", "Server file path", "Saved trade store", "Sample book"],
+        help=f"Upload a file from your machine, read a file already present in the server data directory ({DATA_DIR}), "
+             "reopen a book saved as a trade store, or generate a random book."
+    )
+    if source_kind == "Saved trade store":
+        stores = available_trade_stores()
+        if not stores:
+            st.sidebar.caption(f"No trade stores in {DEFAULT_STORE_DIR} yet. Save one from the FRA Blotter Ingestion page.")
+            return None
+        name = st.sidebar.selectbox("Trade Store", options=list(stores))
+        try:
+            return _cached_trade_store(stores[name], os.path.getmtime(os.path.join(stores[name], "manifest.json")))
+        except (ValueError, OSError) as e:
+            st.error(f"Error: {e}")
+            return False
+    if source_kind == "Upload":
+        return st.sidebar.file_uploader("FRA Blotter (CSV or Parquet)", type=["csv", "parquet"])
+    if source_kind == "Server file path":
+        source_path = st.sidebar.text_input("Blotter Path", help=f"Path to a CSV or Parquet blotter, relative to {DATA_DIR}.")
+        if not source_path:
+            return None
+        try:
+            resolved = resolve_data_path(source_path)
+        except ValueError as e:
+            st.error(f"Error: {e}")
+            return False
+        if not os.path.isfile(resolved):
+            st.error(f"Error: Blotter file not found: {source_path}")
+            return False
+        return resolved
+
+    n_trades = st.sidebar.select_slider(
+        "Sample Book Size (trades)",
+        options=[1_000, 10_000, 100_000, 1_000_000],
+        value=100_000,
+        format_func=lambda n: f"{n:,}"
+    )
+    seed = st.sidebar.number_input("Sample Book Seed", min_value=0, value=0, step=1)
+    return _cached_sample_blotter(n_trades, int(seed))
+
+
+def run_blotter_ingestion_page():
+    st.header("FRA Blotter Ingestion")
+    st.markdown("""
+---
+### Overview
+
+This page settles a whole **FRA trade blotter** rather than a single contract. The blotter is read in bounded-size
+chunks, so files far larger than the available memory can be processed. Each chunk flows through the same pipeline:
+
+1. **Parse** the next chunk of rows from the CSV or Parquet file.
+2. **Validate** the same constraints the FRA Settlement Simulator enforces: End Period (B) must be greater than
+   Start Period (A), the Days in Year Basis must be positive, and the discount factor $1 + MRR_{B-A} \\times \\text{Period Fraction}$
+   must be positive. Rows that fail are counted and skipped.
+3. **Settle** every valid trade with the vectorized FRA settlement kernel.
+4. **Aggregate** running totals of Net Payment and Cash Settlement (PV), optionally streaming per-trade results to disk.
+
+### Blotter Format
+
+The blotter must contain the columns below (one row per trade). `days_in_year_basis`, `trade_id`, `trade_date` and
+`day_count` are optional. With a `trade_date`, the period fraction is computed from real accrual dates: A and B months
+after the trade date, rolled modified-following on the selected holiday calendar, under the row's `day_count`
+(ACT/360, ACT/365F, 30/360 or ACT/ACT) or, without that column, actual days / `days_in_year_basis`.
+""")
+    st.code(", ".join(BLOTTER_COLUMNS + ["days_in_year_basis", "trade_id", "trade_date", "day_count"]), language="text")
+
+    source = render_blotter_source()
+    if source is False:
+        return
+
+    chunksize = st.sidebar.number_input(
+        "Chunk Size (rows)",
+        min_value=1_000,
+        max_value=5_000_000,
+        value=DEFAULT_CHUNKSIZE,
+        step=1_000,
+        help="Number of trades read and settled per chunk. Bounds peak memory use."
+    )
+    output_path = st.sidebar.text_input(
+        "Results Output Path (optional)",
+        help=f"If set, per-trade settlement results are streamed to this CSV or Parquet file, relative to {DATA_DIR}."
+    )
+    if output_path:
+        try:
+            output_path = resolve_data_path(output_path)
+        except ValueError as e:
+            st.error(f"Error: {e}")
+            return
+    calendar = render_holiday_calendar()
+    if calendar is False:
+        return
+    workers = render_valuation_workers()
+
+    checkpoint("widget parsing")
+
+    st.subheader("Settlement Totals")
+    if source is None:
+        st.info("Upload a blotter, enter a server file path or generate a sample book in the sidebar to begin.")
+        return
+
+    if isinstance(source, TradeStore):
+        st.caption(f"Trade store `{source.path}`: {len(source):,} trades, memory-mapped.")
+    else:
+        _render_save_trade_store(source, int(chunksize), calendar)
+
+    if not st.button("Settle Blotter"):
+        return
+
+    progress = st.empty()
+    totals = None
+    try:
+        if workers > 1 and not output_path:
+            with st.spinner(f"Settling across {workers} worker processes..."):
+                totals, _ = value_blotter(source, workers=workers, chunksize=int(chunksize), calendar=calendar)
+            with progress.container():
+                _render_totals(totals)
+        else:
+            for totals in process_blotter(source, output_path or None, chunksize=int(chunksize), calendar=calendar):
+                with progress.container():
+                    _render_totals(totals)
+    except (ValueError, ImportError, OSError) as e:
+        st.error(f"Error: {e}")
+        return
+
+    checkpoint("blotter settlement")
+    if totals is None:
+        st.warning("The blotter contains no rows.")
+        return
+
+    st.success(f"Settled {totals.trades:,} trades in {totals.chunks:,} chunks.")
+    if totals.rejected:
+        st.warning(f"{totals.rejected:,} rows failed validation and were skipped.")
+    if output_path:
+        st.markdown(f"Per-trade results written to `{output_path}`.")
+
+
+def render_valuation_workers():
+    """Sidebar input for the number of valuation worker processes."""
+    return int(st.sidebar.number_input(
+        "Valuation Worker Processes",
+        min_value=1,
+        max_value=max(os.cpu_count() or 1, DEFAULT_WORKERS),
+        value=min(DEFAULT_WORKERS, max(os.cpu_count() or 1, DEFAULT_WORKERS)),
+        step=1,
+        help="Above 1, the book is sharded across processes through shared memory (trade stores are mapped directly) "
+             "and only partial totals come back. Per-trade results output always uses the single-process pipeline."
+    ))
+
+
+def _render_save_trade_store(source, chunksize, calendar):
+    with st.expander("Save as Trade Store"):
+        st.markdown(f"""
+Validate the blotter once and save it as a **trade store** in `{DEFAULT_STORE_DIR}`: one binary `.npy` file per
+column plus a manifest. Any page can then reopen it as **Saved trade store** without parsing it again; the columns
+are memory-mapped, so sessions share a single copy of the data.
+""")
+        name = st.text_input("Trade Store Name", value="fra_book")
+        if not st.button("Save Trade Store"):
+            return
+        if not re.fullmatch(r"[A-Za-z0-9_.-]+", name) or name.startswith("."):
+            st.error("Error: Trade store names may only contain letters, digits, '.', '_' and '-'.")
+            return
+        try:
+            with st.spinner("Validating and saving the book..."):
+                store = write_trade_store(
+                    validated_blotter_chunks(source, chunksize, calendar=calendar),
+                    os.path.join(DEFAULT_STORE_DIR, name),
+                    source=getattr(source, "name", source if isinstance(source, str) else None),
+                )
+        except (ValueError, ImportError, OSError) as e:
+            st.error(f"Error: {e}")
+            return
+        st.success(f"Saved {len(store):,} trades to `{store.path}` ({store.rejected:,} rows rejected).")
+
+
+def _render_totals(totals):
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Trades Settled", f"{totals.trades:,}")
+    col2.metric("Total Net Payment at Maturity", f"${totals.total_net_payment:,.2f}")
+    col3.metric("Total Cash Settlement (PV)", f"${totals.total_cash_settlement_pv:,.2f}")
+    st.caption(f"Chunks processed: {totals.chunks:,} | Rows rejected: {totals.rejected:,}")
@@ -0,0 +1,139 @@
+import time
+
+import streamlit as st
+from application_pages.blotter_ingestion import render_blotter_source
+from application_pages.calendars import render_holiday_calendar
+from application_pages.instrumentation import checkpoint
+from pricing.blotter import DEFAULT_CHUNKSIZE
+from pricing.incremental import load_book
+
+
+def _render_trade_editor(book):
+    st.subheader("Edit a Single Trade")
+    trade = int(st.number_input("Trade Row", min_value=0, max_value=len(book) - 1, value=0, step=1))
+    with st.form(f"whatif_trade_{trade}"):
+        col1, col2 = st.columns(2)
+        notional_principal = col1.number_input(
+            "Notional Principal (N)", min_value=1.0, value=float(book.notional_principal[trade]), step=100_000.0
+        )
+        fixed_rate = col2.number_input(
+            "Fixed Rate (IFR)", min_value=0.0, max_value=1.0, value=float(book.fixed_rate[trade]), step=0.0001, format="%.4f"
+        )
+        dated_help = "Fixed for blotters with trade dates: edit the dates in the blotter and reload it." if book.dated else None
+        start_period = col1.number_input(
+            "Start Period (A) (months)", min_value=0.0, value=float(book.start_period[trade]), step=1.0,
+            disabled=book.dated, help=dated_help,
+        )
+        end_period = col2.number_input(
+            "End Period (B) (months)", min_value=0.0, value=float(book.end_period[trade]), step=1.0,
+            disabled=book.dated, help=dated_help,
+        )
+        submitted = st.form_submit_button("Apply Edit")
+    if submitted:
+        # Only fields the user changed are passed, so untouched terms keep their exact stored values
+        entered = {
+            "notional_principal": notional_principal,
+            "fixed_rate": fixed_rate,
+            "start_period": start_period,
+            "end_period": end_period,
+        }
+        edits = {name: value for name, value in entered.items() if value != getattr(book, name)[trade]}
+        try:
+            book.update_trade(trade, **edits)
+        except ValueError as e:
+            st.error(f"Error: {e}")
+            return
+        st.success(f"Trade row {trade} updated; book totals adjusted by the trade's change.")
+
+
+def run_book_whatif_page():
+    st.header("FRA Book What-If")
+    st.markdown("""
+---
+### Overview
+
+This page keeps a loaded FRA book in memory and revalues it **incrementally**. The parts of each trade that do not
+depend on the market — the period fraction $\\tau$, the accrual $N \\tau$ and the fixed leg $N \\times IFR \\times \\tau$ —
+are computed once when the book is loaded. Only the Market Reference Rate terms are recomputed afterwards:
+
+$$ PV = \\frac{MRR \\cdot N\\tau - IFR \\cdot N\\tau}{1 + MRR \\, \\tau} $$
+
+With a single MRR for the whole book, the totals need only the accrual and fixed-leg sums per distinct tenor, so
+moving the slider does not touch individual trades. Editing one trade adjusts those sums and the book totals by the
+difference between the trade's old and new contributions.
+
+---
+""")
+    checkpoint("page intro")
+
+    source = render_blotter_source()
+    if source is False:
+        return
+    chunksize = st.sidebar.number_input(
+        "Chunk Size (rows)",
+        min_value=1_000,
+        max_value=5_000_000,
+        value=DEFAULT_CHUNKSIZE,
+        step=1_000,
+        help="Number of trades read and validated per chunk while loading the book."
+    )
+    calendar = render_holiday_calendar()
+    if calendar is False:
+        return
+    checkpoint("widget parsing")
+
+    if source is not None and st.button("Load Book"):
+        try:
+            with st.spinner("Loading and validating the book..."):
+                st.session_state["whatif_book"] = load_book(source, int(chunksize), calendar)
+        except (ValueError, ImportError, OSError) as e:
+            st.error(f"Error: {e}")
+            return
+        checkpoint("book load")
+
+    loaded = st.session_state.get("whatif_book")
+    if loaded is None:
+        st.info("Choose a blotter in the sidebar and press Load Book to begin.")
+        return
+    book, blotter_mrr, rejected = loaded
+    if len(book) == 0:
+        st.warning("The blotter contains no valid trades.")
+        return
+    st.caption(f"Loaded trades: {len(book):,} | Rows rejected by validation: {rejected:,}")
+
+    st.sidebar.header("Market Rate")
+    market_source = st.sidebar.radio(
+        "Market Reference Rate",
+        options=["Single MRR", "Blotter MRR column"],
+        help="Revalue every trade at one rate, or at each trade's own market_reference_rate from the blotter."
+    )
+    if market_source == "Single MRR":
+        market_reference_rate = st.sidebar.slider(
+            "Market Reference Rate (MRR)",
+            min_value=0.01,
+            max_value=0.10,
+            value=0.055,
+            step=0.0001,
+            format="%.4f%%"
+        )
+    else:
+        market_reference_rate = blotter_mrr
+
+    _render_trade_editor(book)
+    checkpoint("trade edit")
+
+    started = time.perf_counter()
+    valuation = book.revalue(market_reference_rate)
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    checkpoint("settlement math: incremental revaluation")
+
+    st.subheader("Book Totals")
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Net Payment at Maturity", f"${valuation.total_net_payment:,.2f}")
+    col2.metric("Cash Settlement (PV)", f"${valuation.total_cash_settlement_pv:,.2f}")
+    col3.metric("Revaluation Time", f"{elapsed_ms:,.3f} ms")
+    stats = book.stats
+    st.caption(
+        f"Tenor-level revaluations: {stats['tenor_revaluations']:,} | Per-trade revaluations: {stats['full_revaluations']:,} | "
+        f"Cached valuations reused: {stats['cache_hits']:,} | Trade edits: {stats['trade_edits']:,}"
+    )
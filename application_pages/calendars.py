@@ -0,0 +1,35 @@
+import os
+
+import streamlit as st
+from pricing.daycount import DEFAULT_CALENDAR_DIR, available_calendars, load_holiday_calendar
+
+WEEKENDS_ONLY = "Weekends only"
+
+
+# The calendar builds its business-day index lazily, so one shared instance per file
+# keeps the index warm across reruns and sessions.
+@st.cache_resource(max_entries=8, show_spinner=False)
+def _cached_holiday_calendar(path, mtime):
+    return load_holiday_calendar(path)
+
+
+def render_holiday_calendar(container=None):
+    """Sidebar select box for the holiday calendar used in date rolls.
+
+    Returns a BusinessDayCalendar, None for weekends only, or False after reporting an error.
+    """
+    container = container or st.sidebar
+    calendars = available_calendars()
+    name = container.selectbox(
+        "Holiday Calendar",
+        options=[WEEKENDS_ONLY] + list(calendars),
+        help=f"Business-day calendar for modified-following date rolls. Calendar files are read from {DEFAULT_CALENDAR_DIR}."
+    )
+    if name == WEEKENDS_ONLY:
+        return None
+    path = calendars[name]
+    try:
+        return _cached_holiday_calendar(path, os.path.getmtime(path))
+    except (ValueError, OSError) as e:
+        st.error(f"Error: {e}")
+        return False
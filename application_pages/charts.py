@@ -0,0 +1,117 @@
+"""Plotly trace builders that keep the chart payload bounded for large series.
+
+`st.plotly_chart` serializes every point of every trace to the browser. These helpers
+switch to WebGL traces and LTTB downsampling above a point threshold, and aggregate
+histograms and heatmaps on the server, so the payload size depends on the display
+budget rather than on how much data sits behind the chart.
+"""
+import numpy as np
+import plotly.graph_objects as go
+
+
+WEBGL_THRESHOLD = 1_000
+MAX_LINE_POINTS = 2_000
+MAX_HISTOGRAM_BINS = 200
+MAX_HEATMAP_CELLS = 30_000
+
+
+def lttb_downsample(x, y, n_out):
+    """Largest-Triangle-Three-Buckets downsampling of a series to `n_out` points.
+
+    Keeps the first and last points and, from each interior bucket, the point forming
+    the largest triangle with the previously kept point and the next bucket's mean,
+    which preserves peaks and the visual shape of the curve. `x` must be sorted.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return x, y
+
+    # Interior points split into n_out - 2 buckets; bucket k covers [edges[k], edges[k + 1])
+    edges = (np.arange(n_out - 1) * ((n - 2) / (n_out - 2))).astype(np.int64) + 1
+    edges[-1] = n - 1
+    counts = np.diff(edges)
+    # Sum interior points only, so the last bucket's sum stops before x[-1] as its count does
+    mean_x = np.add.reduceat(x[1:-1], edges[:-1] - 1) / counts
+    mean_y = np.add.reduceat(y[1:-1], edges[:-1] - 1) / counts
+    # The "next bucket" for the final interior bucket is the last point itself
+    mean_x = np.append(mean_x[1:], x[-1])
+    mean_y = np.append(mean_y[1:], y[-1])
+
+    selected = np.empty(n_out, dtype=np.int64)
+    selected[0] = 0
+    selected[-1] = n - 1
+    a = 0
+    for k in range(n_out - 2):
+        lo, hi = edges[k], edges[k + 1]
+        area = np.abs((x[a] - mean_x[k]) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (mean_y[k] - y[a]))
+        a = lo + int(np.argmax(area))
+        selected[k + 1] = a
+    return x[selected], y[selected]
+
+
+def line_trace(x, y, name=None, max_points=MAX_LINE_POINTS, webgl_threshold=WEBGL_THRESHOLD, **kwargs):
+    """A line trace that stays light however many points are passed.
+
+    Small series get a regular SVG `Scatter` with markers. Larger ones drop non-finite
+    points, are downsampled with LTTB to `max_points`, and use `Scattergl` without markers.
+    """
+    x = np.asarray(x)
+    y = np.asarray(y)
+    if len(x) <= webgl_threshold:
+        return go.Scatter(x=x, y=y, name=name, mode="lines+markers", **kwargs)
+
+    finite = np.isfinite(y)
+    x, y = lttb_downsample(x[finite], y[finite], max_points)
+    return go.Scattergl(x=x, y=y, name=name, mode="lines", **kwargs)
+
+
+def binned_bar_trace(counts, edges, max_bins=MAX_HISTOGRAM_BINS, normalize=True, trim=True, **kwargs):
+    """A `Bar` trace from pre-aggregated histogram counts, merged down to at most `max_bins`.
+
+    Adjacent bins are summed in groups (edges must be evenly spaced for the merged bars
+    to stay even). Empty bins at both ends are trimmed, and counts become probabilities
+    when `normalize` is set.
+    """
+    counts = np.asarray(counts)
+    edges = np.asarray(edges, dtype=np.float64)
+    group = -(-len(counts) // max_bins)
+    if group > 1:
+        padded = np.zeros(group * -(-len(counts) // group), dtype=counts.dtype)
+        padded[:len(counts)] = counts
+        counts = padded.reshape(-1, group).sum(axis=1)
+        edges = np.append(edges[:-1:group], edges[-1])
+    if trim and counts.any():
+        nonzero = np.flatnonzero(counts)
+        lo, hi = nonzero[0], nonzero[-1] + 1
+        counts, edges = counts[lo:hi], edges[lo:hi + 1]
+    total = counts.sum()
+    y = counts / total if normalize and total else counts
+    return go.Bar(x=(edges[:-1] + edges[1:]) / 2, y=y, width=np.diff(edges), **kwargs)
+
+
+def histogram_trace(values, bins=MAX_HISTOGRAM_BINS, bin_range=None, **kwargs):
+    """Histogram of raw `values` aggregated server-side into at most `bins` bars over `bin_range`."""
+    values = np.asarray(values, dtype=np.float64)
+    values = values[np.isfinite(values)]
+    counts, edges = np.histogram(values, bins=bins, range=bin_range)
+    return binned_bar_trace(counts, edges, max_bins=bins, **kwargs)
+
+
+def heatmap_trace(x, y, z, max_cells=MAX_HEATMAP_CELLS, **kwargs):
+    """A `Heatmap` whose rows are averaged in blocks so that it has at most `max_cells` cells.
+
+    Every row is kept: when the rows do not divide evenly, the last block averages the
+    leftover rows.
+    """
+    x = np.asarray(x)
+    y = np.asarray(y, dtype=np.float64)
+    z = np.asarray(z, dtype=np.float64)
+    group = -(-len(y) // max(max_cells // max(z.shape[1], 1), 1))
+    if group > 1:
+        starts = np.arange(0, len(y), group)
+        counts = np.diff(np.append(starts, len(y)))
+        y = np.add.reduceat(y, starts) / counts
+        z = np.add.reduceat(z, starts, axis=0) / counts[:, np.newaxis]
+    return go.Heatmap(x=x, y=y, z=z, **kwargs)
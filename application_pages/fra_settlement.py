@@ -1,13 +1,101 @@
 
 import streamlit as st
-import plotly.express as px
-import plotly.graph_objects as go
-import pandas as pd
+import datetime
+import os
 import numpy as np
+from application_pages.calendars import render_holiday_calendar
+from application_pages.instrumentation import checkpoint
+from pricing.curve import INTERPOLATION_METHODS, DiscountCurve, bootstrap_curve
+from pricing.daycount import DAY_COUNT_CONVENTIONS, accrual_dates, year_fraction
+from pricing.fra import cash_settlement_pv, settle_fra
+from pricing.monte_carlo import HullWhiteModel, VasicekModel, simulate_settlement
+from pricing.risk import fra_risk
+from pricing.sensitivity import mrr_grid, tenor_grid, settlement_surface
+
+
+MONTHS_DAY_COUNT = "Months (B - A) / 12"
+DEFAULT_DEPOSIT_QUOTES = {
+    "Tenor (months)": [1, 3, 6],
+    "Rate": [0.0530, 0.0540, 0.0545],
+}
+DEFAULT_FRA_QUOTES = {
+    "Start (A) (months)": [3, 6, 12, 18, 24, 36, 48],
+    "End (B) (months)": [9, 12, 18, 24, 36, 48, 60],
+    "Rate": [0.0550, 0.0555, 0.0560, 0.0565, 0.0570, 0.0575, 0.0580],
+}
+
+
+# Sensitivity results depend only on the contract terms, not on the MRR slider,
+# so moving the slider (or any unrelated widget) reuses the cached arrays.
+@st.cache_data(max_entries=32, show_spinner=False)
+def _cached_sensitivity_curve(notional_principal, fixed_rate, start_period, end_period, points=100, period_fraction=None):
+    mrr_range = mrr_grid(0.01, 0.10, points)
+    curve = cash_settlement_pv(
+        notional_principal, fixed_rate, start_period, end_period, mrr_range, period_fraction
+    )
+    return mrr_range, curve
+
+
+# The curve (and its interpolation index) is built once per distinct set of quotes
+@st.cache_data(max_entries=16, show_spinner=False)
+def _cached_bootstrap_curve(deposit_quotes, fra_quotes, method):
+    deposits = deposit_quotes.dropna().itertuples(index=False, name=None)
+    fras = fra_quotes.dropna().itertuples(index=False, name=None)
+    return bootstrap_curve(deposits, fras, method)
+
+
+def _render_yield_curve_inputs():
+    import pandas as pd
+
+    st.subheader("Yield Curve")
+    st.markdown("""
+The fixed rate is the **implied forward rate** $IFR_{A,B-A}$ read off a discount curve bootstrapped from the deposit
+and FRA quotes below. Deposits fix $DF(T) = 1 / (1 + r \\times T/12)$; an $A \\times B$ FRA then fixes
+$DF(B) = DF(A) / (1 + F \\times (B-A)/12)$. The implied forward rate for any strip follows from
+
+$$ IFR_{A,B-A} = \\left(\\frac{DF(A)}{DF(B)} - 1\\right) \\times \\frac{12}{B - A} $$
+""")
+    with st.expander("Curve Quotes", expanded=False):
+        col1, col2 = st.columns(2)
+        with col1:
+            st.markdown("**Deposits**")
+            deposit_quotes = st.data_editor(pd.DataFrame(DEFAULT_DEPOSIT_QUOTES), num_rows="dynamic", key="deposit_quotes")
+        with col2:
+            st.markdown("**FRAs**")
+            fra_quotes = st.data_editor(pd.DataFrame(DEFAULT_FRA_QUOTES), num_rows="dynamic", key="fra_quotes")
+        method = st.selectbox(
+            "Interpolation",
+            options=list(INTERPOLATION_METHODS),
+            format_func=lambda m: {"log_linear": "Log-linear discount factors", "monotone_cubic": "Monotone cubic"}[m],
+            help="How discount factors are interpolated between curve nodes."
+        )
+
+    try:
+        curve = _cached_bootstrap_curve(deposit_quotes, fra_quotes, method)
+    except ValueError as e:
+        st.error(f"Error: Could not bootstrap the yield curve: {e}")
+        return None
+
+    with st.expander("Bootstrapped Curve", expanded=False):
+        st.dataframe(pd.DataFrame({
+            "Tenor (months)": curve.node_months,
+            "Discount Factor": curve.discount_factors,
+            "Zero Rate (cont.)": curve.zero_rate(curve.node_months),
+        }).style.format({"Discount Factor": "{:.6f}", "Zero Rate (cont.)": "{:.4%}"}, na_rep="-"))
+    return curve
+
+
+@st.cache_data(max_entries=16, show_spinner=False)
+def _cached_settlement_surface(notional_principal, fixed_rate, mrr_points, max_tenor_months, tenor_fractions=None):
+    mrr_range = mrr_grid(0.01, 0.10, mrr_points)
+    tenors = tenor_grid(max_tenor_months)
+    return mrr_range, tenors, settlement_surface(
+        notional_principal, fixed_rate, mrr_range, tenors, year_fractions=tenor_fractions
+    )
 
 def run_fra_settlement_page():
     st.header("Forward Rate Agreement (FRA) Settlement Simulator")
-    st.markdown(\"\"\"
+    st.markdown("""
 ---
 ### Overview
 
@@ -44,7 +132,8 @@ This simulator brings the theoretical concept of FRAs to life by:
 - **Highlighting Present Value**: Emphasizes that FRA settlement happens at the start of the interest period (settlement date) but is based on rates observed then, thus requiring discounting to present value.
 
 ---
-\"\"\")
+""")
+    checkpoint("page intro")
 
     st.sidebar.header("FRA Parameters")
 
@@ -57,15 +146,21 @@ This simulator brings the theoretical concept of FRAs to life by:
         step=100_000,
         help="The principal amount on which interest payments are based."
     )
-    fixed_rate = st.sidebar.slider(
-        "Fixed Rate (IFR)",
-        min_value=0.00,
-        max_value=0.10,
-        value=0.0525,
-        step=0.0001,
-        format="%.4f%%",
-        help="The implied forward rate ($IFR_{A,B-A}$) agreed at the inception of the FRA."
+    fixed_rate_source = st.sidebar.radio(
+        "Fixed Rate Source",
+        options=["Manual", "Implied from Yield Curve"],
+        help="Enter the fixed rate directly, or derive it as the implied forward rate from a bootstrapped yield curve."
     )
+    if fixed_rate_source == "Manual":
+        fixed_rate = st.sidebar.slider(
+            "Fixed Rate (IFR)",
+            min_value=0.00,
+            max_value=0.10,
+            value=0.0525,
+            step=0.0001,
+            format="%.4f%%",
+            help="The implied forward rate ($IFR_{A,B-A}$) agreed at the inception of the FRA."
+        )
     start_period = st.sidebar.number_input(
         "Start Period (A) (months)",
         min_value=0,
@@ -82,13 +177,20 @@ This simulator brings the theoretical concept of FRAs to life by:
         step=1,
         help="Months from today until the FRA's interest period ends."
     )
-    days_in_year_basis = st.sidebar.number_input(
-        "Days in Year Basis",
-        min_value=1,
-        value=360,
-        step=1,
-        help="The day count convention for annualizing rates (e.g., 360 for 30/360 or 365 for Actual/365)."
+    day_count = st.sidebar.selectbox(
+        "Day Count Convention",
+        options=[MONTHS_DAY_COUNT] + list(DAY_COUNT_CONVENTIONS),
+        help="How the period fraction is measured: whole months (B - A) / 12, or actual accrual dates under a day count convention."
     )
+    if day_count != MONTHS_DAY_COUNT:
+        trade_date = st.sidebar.date_input(
+            "Trade Date",
+            value=datetime.date.today(),
+            help="The accrual period runs from A to B months after this date, with each date rolled modified-following."
+        )
+        calendar = render_holiday_calendar()
+        if calendar is False:
+            return
 
     st.sidebar.header("Market Rate Simulation")
     market_reference_rate = st.sidebar.slider(
@@ -100,6 +202,20 @@ This simulator brings the theoretical concept of FRAs to life by:
         format="%.4f%%",
         help="The prevailing market interest rate ($MRR_{B-A}$) observed at the settlement date, used for floating interest calculation and discounting."
     )
+    monte_carlo_mode = st.sidebar.checkbox(
+        "Monte Carlo Simulation Mode",
+        value=False,
+        help="Also simulate the MRR at settlement from a short-rate model and show the distribution of the cash settlement."
+    )
+
+    checkpoint("widget parsing")
+
+    curve = None
+    if fixed_rate_source == "Implied from Yield Curve":
+        curve = _render_yield_curve_inputs()
+        checkpoint("yield curve")
+        if curve is None:
+            return
 
     st.subheader("FRA Settlement Calculations")
 
@@ -107,68 +223,94 @@ This simulator brings the theoretical concept of FRAs to life by:
         st.error("Error: End Period (B) must be greater than Start Period (A). Please adjust the input values.")
         return
 
-    if days_in_year_basis <= 0:
-        st.error("Error: Days in Year Basis must be a positive number. Please adjust the input value.")
-        return
+    if fixed_rate_source == "Implied from Yield Curve":
+        fixed_rate = float(curve.forward_rate(start_period, end_period))
+        st.markdown(f"**Implied Forward Rate** $IFR_{{{start_period},{end_period - start_period}}}$: {fixed_rate:.4f} ({fixed_rate:.2%})")
 
-    # Calculate Period Fraction (assuming 30/360 convention for simplicity, or based on days_in_year_basis)
-    period_in_months = end_period - start_period
-    period_fraction = period_in_months / 12 # This is (B-A)/12 for annual rate
+    day_count_fraction = None
+    if day_count != MONTHS_DAY_COUNT:
+        accrual_start, accrual_end = accrual_dates(np.datetime64(trade_date, "D"), start_period, end_period, calendar)
+        day_count_fraction = float(year_fraction(accrual_start, accrual_end, day_count))
 
-    st.markdown(r"**Period Fraction:** $\frac{\text{End Period} - \text{Start Period}}{12} = \frac{" + f"{end_period} - {start_period}" + r"}{12} = " + f"{period_fraction:.4f}$")
+    # Settle the contract with the same vectorized kernel used for batch revaluation
+    settlement = settle_fra(
+        notional_principal, fixed_rate, start_period, end_period, market_reference_rate, day_count_fraction
+    )
+    period_fraction = float(settlement.period_fraction)
+    checkpoint("settlement math")
+
+    if day_count_fraction is None:
+        st.markdown(r"**Period Fraction:** $\frac{\text{End Period} - \text{Start Period}}{12} = \frac{" + f"{end_period} - {start_period}" + r"}{12} = " + f"{period_fraction:.4f}$")
+    else:
+        accrual_days = int((accrual_end - accrual_start).astype(np.int64))
+        st.markdown(f"**Period Fraction ({day_count}):** {accrual_start} to {accrual_end} ({accrual_days} days) = {period_fraction:.4f}")
 
     # Fixed Interest Payment
-    fixed_interest_payment = notional_principal * fixed_rate * period_fraction
+    fixed_interest_payment = float(settlement.fixed_interest_payment)
     st.markdown(r"**Fixed Interest Payment:** $" + f"{notional_principal:,.2f}" + r" \times " + f"{fixed_rate:.4f}" + r" \times " + f"{period_fraction:.4f}" + r" = $" + f"{fixed_interest_payment:,.2f}")
 
     # Floating Interest Payment
-    floating_interest_payment = notional_principal * market_reference_rate * period_fraction
+    floating_interest_payment = float(settlement.floating_interest_payment)
     st.markdown(r"**Floating Interest Payment:** $" + f"{notional_principal:,.2f}" + r" \times " + f"{market_reference_rate:.4f}" + r" \times " + f"{period_fraction:.4f}" + r" = $" + f"{floating_interest_payment:,.2f}")
 
     # Net Payment at Maturity (undiscounted)
-    net_payment_at_maturity = floating_interest_payment - fixed_interest_payment
+    net_payment_at_maturity = float(settlement.net_payment_at_maturity)
     st.markdown(r"**Net Payment at Maturity (undiscounted):** $" + f"{floating_interest_payment:,.2f}" + r" - $" + f"{fixed_interest_payment:,.2f}" + r" = $" + f"{net_payment_at_maturity:,.2f}")
-    st.markdown(\"\"\"
+    st.markdown("""
 The **Net Payment** formula is:
 $$ (MRR_{B-A} - IFR_{A,B-A}) \\times \\text{Notional Principal} \\times \\text{Period Fraction} $$
 Where $\\text{Period Fraction}$ is typically `Days / 360` or `1 / Number of Periods per year`.
-\"\"\")
+""")
 
     # Cash Settlement (Present Value)
-    discount_factor = 1 + (market_reference_rate * period_fraction)
+    discount_factor = float(settlement.discount_factor)
     if discount_factor <= 0:
         st.error("Error: Discount factor is zero or negative. Please adjust input rates.")
         return
 
-    cash_settlement_pv = net_payment_at_maturity / discount_factor
+    cash_settlement_pv = float(settlement.cash_settlement_pv)
     st.markdown(r"**Cash Settlement (Present Value):** $ \frac{" + f"{net_payment_at_maturity:,.2f}" + r"}{1 + " + f"{market_reference_rate:.4f}" + r" \times " + f"{period_fraction:.4f}" + r"} = $" + f"{cash_settlement_pv:,.2f}")
-    st.markdown(\"\"\"
+    st.markdown("""
 The **Cash Settlement (Present Value)** formula is:
 $$ \\text{Cash Settlement (PV)} = \\frac{\\text{Net Payment}}{1 + MRR_{B-A} \\times \\text{Period Fraction}} $$
-\"\"\")
+""")
+
+    # Closed-form sensitivities of the cash settlement to a one basis point rate move
+    risk = fra_risk(notional_principal, fixed_rate, start_period, end_period, market_reference_rate, day_count_fraction)
+    st.markdown(f"**PV01 (MRR):** ${float(risk.pv01_mrr):,.2f} per +1bp in $MRR_{{B-A}}$ (floating leg and discounting) | "
+                f"**PV01 (Fixed Rate):** ${float(risk.pv01_fixed_rate):,.2f} per +1bp in $IFR_{{A,B-A}}$")
 
     st.markdown("---")
     st.subheader("Narrative Interpretation of Net Payment")
     if market_reference_rate > fixed_rate:
-        st.markdown(f\"\"\"
+        st.markdown(f"""
         Since the Market Reference Rate ($MRR_{{B-A}}$) of {market_reference_rate:.4f} ({market_reference_rate:.2%}) is **higher** than the Fixed Rate ($IFR_{{A,B-A}}$) of {fixed_rate:.4f} ({fixed_rate:.2%}), the fixed-rate payer (borrower) benefits.
         The borrower effectively pays a lower fixed rate than the current market rate, and thus **receives a payment** from the fixed-rate receiver (lender) to compensate for the difference.
         The Net Payment at Maturity is ${net_payment_at_maturity:,.2f}, and the Cash Settlement (PV) is ${cash_settlement_pv:,.2f}.
-        \"\"\")
+        """)
     elif market_reference_rate < fixed_rate:
-        st.markdown(f\"\"\"
+        st.markdown(f"""
         Since the Market Reference Rate ($MRR_{{B-A}}$) of {market_reference_rate:.4f} ({market_reference_rate:.2%}) is **lower** than the Fixed Rate ($IFR_{{A,B-A}}$) of {fixed_rate:.4f} ({fixed_rate:.2%}), the fixed-rate receiver (lender) benefits.
         The borrower effectively pays a higher fixed rate than the current market rate, and thus **makes a payment** to the fixed-rate receiver.
         The Net Payment at Maturity is ${net_payment_at_maturity:,.2f}, and the Cash Settlement (PV) is ${cash_settlement_pv:,.2f}.
-        \"\"\")
+        """)
     else:
-        st.markdown(f\"\"\"
+        st.markdown(f"""
         Since the Market Reference Rate ($MRR_{{B-A}}$) of {market_reference_rate:.4f} ({market_reference_rate:.2%}) is **equal** to the Fixed Rate ($IFR_{{A,B-A}}$) of {fixed_rate:.4f} ({fixed_rate:.2%}), the Net Payment is zero.
         Both parties are indifferent, and there is no cash settlement.
-        \"\"\")
+        """)
 
     st.markdown("---")
     st.subheader("Visualizations")
+    checkpoint("results markdown")
+
+    # pandas and plotly are imported where they are first needed, so the page header and
+    # settlement figures render before those libraries load on a cold start.
+    import pandas as pd
+    import plotly.express as px
+    import plotly.graph_objects as go
+    from application_pages.charts import heatmap_trace, line_trace
+    checkpoint("pandas/plotly import")
 
     # Bar Chart: Aggregated Comparison
     fra_data = {
@@ -176,6 +318,7 @@ $$ \\text{Cash Settlement (PV)} = \\frac{\\text{Net Payment}}{1 + MRR_{B-A} \\ti
         "Amount": [fixed_interest_payment, floating_interest_payment, net_payment_at_maturity]
     }
     fra_df = pd.DataFrame(fra_data)
+    checkpoint("DataFrame construction: bar")
 
     fig_bar = px.bar(
         fra_df,
@@ -192,37 +335,40 @@ $$ \\text{Cash Settlement (PV)} = \\frac{\\text{Net Payment}}{1 + MRR_{B-A} \\ti
         hover_data={"Amount": ':.2f'}
     )
     fig_bar.update_layout(title_x=0.5, font_size=12) # Center title and set font size
+    checkpoint("figure build: bar")
     st.plotly_chart(fig_bar, use_container_width=True)
+    checkpoint("st.plotly_chart: bar")
 
     # Line Chart: Cash Settlement vs. Market Reference Rate
-    mrr_range = np.linspace(0.01, 0.10, 100) # 1% to 10%
-    cash_settlement_sensitivity = []
-
-    for mrr_val in mrr_range:
-        float_int_pay_sens = notional_principal * mrr_val * period_fraction
-        net_pay_sens = float_int_pay_sens - fixed_interest_payment
-        discount_factor_sens = 1 + (mrr_val * period_fraction)
-        if discount_factor_sens > 0:
-            cash_settlement_sens = net_pay_sens / discount_factor_sens
-        else:
-            cash_settlement_sens = np.nan # Handle invalid discount factor
-        cash_settlement_sensitivity.append(cash_settlement_sens)
-
-    sensitivity_df = pd.DataFrame({
-        "Market Reference Rate (MRR)": mrr_range,
-        "Cash Settlement ($)": cash_settlement_sensitivity
-    })
-
-    fig_line = px.line(
-        sensitivity_df,
-        x="Market Reference Rate (MRR)",
-        y="Cash Settlement ($)",
+    sensitivity_points = st.select_slider(
+        "Sensitivity Curve Points",
+        options=[100, 1_000, 10_000, 100_000, 1_000_000],
+        value=100,
+        format_func=lambda n: f"{n:,}",
+        help="Number of MRR values evaluated. Above 1,000 points the curve is drawn with WebGL and downsampled for display."
+    )
+    mrr_range, cash_settlement_sensitivity = _cached_sensitivity_curve(
+        notional_principal, fixed_rate, start_period, end_period, sensitivity_points, day_count_fraction
+    )
+    checkpoint("settlement math: sensitivity curve")
+
+    # Built from arrays directly (no DataFrame); large curves switch to a downsampled WebGL trace
+    fig_line = go.Figure(
+        line_trace(
+            mrr_range,
+            cash_settlement_sensitivity,
+            name="Cash Settlement ($)",
+            hovertemplate="Market Reference Rate (MRR): %{x:.2%}<br>Cash Settlement ($): %{y:,.2f}<extra></extra>"
+        )
+    )
+    fig_line.update_layout(
         title="FRA Cash Settlement vs. Market Reference Rate (MRR)",
-        markers=True,
-        labels={"Market Reference Rate (MRR)": "Market Reference Rate (MRR) (%)", "Cash Settlement ($)": "Cash Settlement ($)"},
-        hover_data={"Market Reference Rate (MRR)": ':.2%', "Cash Settlement ($)": ':.2f'}
+        title_x=0.5,
+        hovermode="x unified",
+        font_size=12,
+        xaxis_title="Market Reference Rate (MRR) (%)",
+        yaxis_title="Cash Settlement ($)"
     )
-    fig_line.update_layout(title_x=0.5, hovermode="x unified", font_size=12)
     fig_line.update_xaxes(tickformat=".2%") # Format x-axis as percentage
 
     # Add vertical line for Fixed Rate (IFR)
@@ -242,4 +388,185 @@ $$ \\text{Cash Settlement (PV)} = \\frac{\\text{Net Payment}}{1 + MRR_{B-A} \\ti
         annotation_text="Zero Settlement",
         annotation_position="bottom right"
     )
+    checkpoint("figure build: sensitivity")
     st.plotly_chart(fig_line, use_container_width=True)
+    checkpoint("st.plotly_chart: sensitivity")
+
+    # Heatmap: Cash Settlement over MRR x Tenor (B - A)
+    st.markdown("""
+The surface below extends the sensitivity curve across interest period lengths: each column is an FRA with the
+same notional and fixed rate but a different tenor $(B - A)$, each row a different Market Reference Rate.
+""")
+    surface_mrr_points = st.select_slider(
+        "Surface MRR Grid Points",
+        options=[100, 250, 500, 1000],
+        value=250,
+        help="Number of Market Reference Rate values on the surface's vertical axis."
+    )
+    tenor_fractions = None
+    if day_count_fraction is not None:
+        # Each tenor's accrual period starts at the contract's A, under the selected day count
+        tenor_start, tenor_end = accrual_dates(
+            np.datetime64(trade_date, "D"), start_period, start_period + tenor_grid(120), calendar
+        )
+        tenor_fractions = year_fraction(tenor_start, tenor_end, day_count)
+    surface_mrrs, surface_tenors, surface = _cached_settlement_surface(
+        notional_principal, fixed_rate, surface_mrr_points, 120, tenor_fractions
+    )
+    checkpoint("settlement math: surface")
+    fig_surface = go.Figure(
+        heatmap_trace(
+            x=surface_tenors,
+            y=surface_mrrs,
+            z=surface,
+            colorscale="RdBu",
+            zmid=0,
+            colorbar={"title": "Cash Settlement ($)"},
+            hovertemplate="Tenor: %{x} months<br>MRR: %{y:.2%}<br>Cash Settlement: $%{z:,.2f}<extra></extra>"
+        )
+    )
+    fig_surface.add_vline(
+        x=end_period - start_period,
+        line_dash="dash",
+        line_color="black",
+        annotation_text=f"Current Tenor: {end_period - start_period}M",
+        annotation_position="top right"
+    )
+    fig_surface.update_layout(
+        title="FRA Cash Settlement Surface: Market Reference Rate vs. Tenor (B - A)",
+        title_x=0.5,
+        xaxis_title="Tenor (B - A) (months)",
+        yaxis_title="Market Reference Rate (MRR) (%)",
+        font_size=12
+    )
+    fig_surface.update_yaxes(tickformat=".2%")
+    checkpoint("figure build: surface")
+    st.plotly_chart(fig_surface, use_container_width=True)
+    checkpoint("st.plotly_chart: surface")
+
+    if monte_carlo_mode:
+        st.markdown("---")
+        _render_monte_carlo_section(
+            notional_principal, fixed_rate, start_period, end_period, market_reference_rate, curve, day_count_fraction
+        )
+
+
+@st.cache_data(max_entries=8, show_spinner=False)
+def _cached_simulate_settlement(model_name, a, sigma, b, r0, curve_nodes, notional_principal,
+                                fixed_rate, start_period, end_period, n_paths, seed, workers, year_fraction=None):
+    if model_name == "Vasicek":
+        model = VasicekModel(a, b, sigma, r0)
+    else:
+        model = HullWhiteModel(a, sigma, DiscountCurve(*curve_nodes))
+    return simulate_settlement(
+        model, notional_principal, fixed_rate, start_period, end_period, n_paths, seed=seed, workers=workers,
+        year_fraction=year_fraction
+    )
+
+
+def _render_monte_carlo_section(notional_principal, fixed_rate, start_period, end_period, market_reference_rate, curve,
+                                day_count_fraction=None):
+    import pandas as pd
+    import plotly.graph_objects as go
+    from application_pages.charts import binned_bar_trace
+
+    st.subheader("Monte Carlo Simulation of Cash Settlement")
+    st.markdown("""
+Instead of a single Market Reference Rate, the short rate $r$ is simulated to the settlement date $A$ under a
+one-factor model, and $MRR_{B-A}$ is read off the model's zero-coupon bond price $P(A, B)$:
+
+$$ MRR_{B-A} = \\frac{1}{\\text{Period Fraction}} \\left(\\frac{1}{P(A, B)} - 1\\right) $$
+
+- **Vasicek**: $dr = a(b - r)\\,dt + \\sigma\\,dW$, mean-reverting to a long-run level $b$.
+- **Hull-White (one-factor)**: $dr = (\\theta(t) - a r)\\,dt + \\sigma\\,dW$, with $\\theta(t)$ fitted to today's yield curve
+  (the bootstrapped curve when the fixed rate is implied from it, otherwise a flat curve at the current MRR).
+
+Each simulated MRR is settled with the same formula as above, and the distribution of the Cash Settlement (PV) is summarized.
+""")
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        model_name = st.selectbox("Short-Rate Model", options=["Vasicek", "Hull-White"])
+        n_paths = st.select_slider(
+            "Number of Paths",
+            options=[10_000, 100_000, 1_000_000, 10_000_000, 50_000_000],
+            value=1_000_000,
+            format_func=lambda n: f"{n:,}"
+        )
+    with col2:
+        a = st.number_input("Mean Reversion Speed (a)", min_value=0.001, max_value=5.0, value=0.10, step=0.01, format="%.3f")
+        sigma = st.number_input("Volatility (σ)", min_value=0.0001, max_value=0.10, value=0.01, step=0.001, format="%.4f")
+    with col3:
+        if model_name == "Vasicek":
+            b = st.number_input("Long-Run Mean (b)", min_value=-0.05, max_value=0.20, value=market_reference_rate, step=0.001, format="%.4f")
+            r0 = st.number_input("Initial Short Rate (r0)", min_value=-0.05, max_value=0.20, value=market_reference_rate, step=0.001, format="%.4f")
+        else:
+            b = r0 = None
+        seed = st.number_input("Random Seed", min_value=0, value=42, step=1)
+        workers = st.number_input(
+            "Worker Processes",
+            min_value=1,
+            max_value=os.cpu_count() or 1,
+            value=os.cpu_count() or 1,
+            step=1,
+            help="Paths are sharded across this many processes. Results are identical for any worker count."
+        )
+
+    if model_name == "Hull-White":
+        if curve is None:
+            curve = DiscountCurve([0, 120], [1.0, np.exp(-market_reference_rate * 10)])
+        curve_nodes = (tuple(curve.node_months), tuple(curve.discount_factors), curve.method)
+    else:
+        curve_nodes = None
+
+    if not st.button("Run Simulation"):
+        return
+
+    checkpoint("widget parsing: simulation")
+    with st.spinner(f"Simulating {n_paths:,} paths..."):
+        stats = _cached_simulate_settlement(
+            model_name, a, sigma, b, r0, curve_nodes, notional_principal, fixed_rate,
+            start_period, end_period, n_paths, int(seed), int(workers), day_count_fraction
+        )
+    checkpoint("settlement math: simulation")
+
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Expected Cash Settlement (PV)", f"${stats.mean:,.2f}")
+    col2.metric("Standard Deviation", f"${stats.std:,.2f}")
+    col3.metric("Probability of Receiving Payment", f"{stats.probability_positive:.2%}")
+
+    percentiles = [1, 5, 25, 50, 75, 95, 99]
+    st.dataframe(pd.DataFrame({
+        "Percentile": [f"{p}%" for p in percentiles],
+        "Cash Settlement (PV) ($)": stats.percentile(percentiles),
+    }).style.format({"Cash Settlement (PV) ($)": "{:,.2f}"}), hide_index=True)
+
+    checkpoint("simulation summary")
+    # The streamed histogram is merged down to a few hundred bars before it reaches the browser
+    fig_hist = go.Figure(
+        binned_bar_trace(
+            stats.counts,
+            stats.edges,
+            marker_color="royalblue",
+            hovertemplate="Cash Settlement: $%{x:,.2f}<br>Probability: %{y:.4%}<extra></extra>"
+        )
+    )
+    fig_hist.add_vline(
+        x=stats.mean,
+        line_dash="dash",
+        line_color="red",
+        annotation_text=f"Expected: ${stats.mean:,.0f}",
+        annotation_position="top right"
+    )
+    for p, value in zip([5, 95], stats.percentile([5, 95])):
+        fig_hist.add_vline(x=value, line_dash="dot", line_color="grey", annotation_text=f"P{p}", annotation_position="top left")
+    fig_hist.update_layout(
+        title="Distribution of Simulated FRA Cash Settlement (PV)",
+        title_x=0.5,
+        xaxis_title="Cash Settlement (PV) ($)",
+        yaxis_title="Probability",
+        bargap=0,
+        font_size=12
+    )
+    checkpoint("figure build: simulation histogram")
+    st.plotly_chart(fig_hist, use_container_width=True)
+    checkpoint("st.plotly_chart: simulation histogram")
@@ -0,0 +1,152 @@
+"""Opt-in per-rerun timing of the QuLab script.
+
+Enable with the ``QULAB_PROFILE=1`` environment variable or the ``?profile=1`` query
+parameter. ``app.py`` calls `begin_rerun` and `end_rerun` around each script run, and
+pages call `checkpoint(name)` to close a named segment covering everything since the
+previous checkpoint (widget parsing, settlement math, DataFrame construction, figure
+build, ``st.plotly_chart``). When profiling is off these calls return immediately.
+
+At the end of a profiled rerun the segments are shown in a sidebar diagnostics panel,
+logged as one JSON line on the ``qulab.profile`` logger, and accumulated into
+process-wide Prometheus-style counters, written to ``QULAB_PROFILE_PROM_FILE`` if set
+(e.g. for the node_exporter textfile collector).
+"""
+import json
+import logging
+import os
+import threading
+import time
+
+import streamlit as st
+
+
+PROFILE_ENV_VAR = "QULAB_PROFILE"
+PROFILE_QUERY_PARAM = "profile"
+PROMETHEUS_FILE_ENV_VAR = "QULAB_PROFILE_PROM_FILE"
+_SESSION_KEY = "_qulab_rerun_profile"
+_TRUTHY = ("1", "true", "yes", "on")
+
+logger = logging.getLogger("qulab.profile")
+
+# Process-wide counters shared by all sessions: (page, segment) -> [count, total seconds]
+_counters_lock = threading.Lock()
+_segment_counters = {}
+_rerun_counters = {}
+
+
+class RerunProfile:
+    def __init__(self):
+        self.start = time.perf_counter()
+        self._last = self.start
+        self.segments = []
+
+    def checkpoint(self, name):
+        now = time.perf_counter()
+        self.segments.append((name, now - self._last))
+        self._last = now
+
+    @property
+    def total(self):
+        return self._last - self.start
+
+
+def profiling_enabled():
+    if os.environ.get(PROFILE_ENV_VAR, "").lower() in _TRUTHY:
+        return True
+    return str(st.query_params.get(PROFILE_QUERY_PARAM, "")).lower() in _TRUTHY
+
+
+def begin_rerun():
+    """Start timing this script run if profiling is enabled."""
+    st.session_state[_SESSION_KEY] = RerunProfile() if profiling_enabled() else None
+
+
+def checkpoint(name):
+    """Close the segment since the previous checkpoint under `name`."""
+    profile = st.session_state.get(_SESSION_KEY)
+    if profile is not None:
+        profile.checkpoint(name)
+
+
+def end_rerun(page):
+    """Finish timing `page`: record counters, emit the log line and render the sidebar panel."""
+    profile = st.session_state.get(_SESSION_KEY)
+    if profile is None:
+        return
+    st.session_state[_SESSION_KEY] = None
+    profile.checkpoint("page footer")
+
+    _record(page, profile)
+    logger.info(json.dumps({
+        "event": "rerun_profile",
+        "page": page,
+        "total_ms": round(profile.total * 1000, 3),
+        "segments_ms": {name: round(seconds * 1000, 3) for name, seconds in profile.segments},
+    }))
+    path = os.environ.get(PROMETHEUS_FILE_ENV_VAR)
+    if path:
+        _write_prometheus_file(path)
+    _render_panel(profile)
+
+
+def _record(page, profile):
+    with _counters_lock:
+        for name, seconds in profile.segments:
+            counter = _segment_counters.setdefault((page, name), [0, 0.0])
+            counter[0] += 1
+            counter[1] += seconds
+        counter = _rerun_counters.setdefault(page, [0, 0.0])
+        counter[0] += 1
+        counter[1] += profile.total
+
+
+def _escape(value):
+    return value.replace("\\", "\\\\").replace('"', '\\"')
+
+
+def prometheus_text():
+    """Current counters in the Prometheus text exposition format."""
+    lines = [
+        "# HELP qulab_rerun_seconds_total Wall time spent in Streamlit script reruns.",
+        "# TYPE qulab_rerun_seconds_total counter",
+    ]
+    with _counters_lock:
+        reruns = dict(_rerun_counters)
+        segments = dict(_segment_counters)
+    for page, (_, seconds) in sorted(reruns.items()):
+        lines.append(f'qulab_rerun_seconds_total{{page="{_escape(page)}"}} {seconds:.6f}')
+    lines += ["# HELP qulab_reruns_total Profiled Streamlit script reruns.", "# TYPE qulab_reruns_total counter"]
+    for page, (count, _) in sorted(reruns.items()):
+        lines.append(f'qulab_reruns_total{{page="{_escape(page)}"}} {count}')
+    lines += [
+        "# HELP qulab_rerun_segment_seconds_total Wall time per named rerun segment.",
+        "# TYPE qulab_rerun_segment_seconds_total counter",
+    ]
+    for (page, name), (_, seconds) in sorted(segments.items()):
+        lines.append(
+            f'qulab_rerun_segment_seconds_total{{page="{_escape(page)}",segment="{_escape(name)}"}} {seconds:.6f}'
+        )
+    return "\n".join(lines) + "\n"
+
+
+def _write_prometheus_file(path):
+    # Write then rename so a scraper never reads a partially written file
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, "w") as f:
+            f.write(prometheus_text())
+        os.replace(tmp_path, path)
+    except OSError as e:
+        logger.warning("Could not write profiling counters to %s: %s", path, e)
+
+
+def _render_panel(profile):
+    with st.sidebar.expander("Diagnostics: Rerun Timings", expanded=True):
+        st.markdown(f"**Total rerun:** {profile.total * 1000:,.1f} ms")
+        slowest = max(seconds for _, seconds in profile.segments) if profile.segments else 0
+        rows = "\n".join(
+            f"| **{name}** | **{seconds * 1000:,.1f}** |" if seconds == slowest else f"| {name} | {seconds * 1000:,.1f} |"
+            for name, seconds in profile.segments
+        )
+        st.markdown("| Segment | ms |\n|---|---:|\n" + rows)
+        st.caption("Each segment covers the work since the previous checkpoint; the slowest is in bold.")
@@ -0,0 +1,199 @@
+import os
+import time
+
+import streamlit as st
+from application_pages.blotter_ingestion import DATA_DIR, render_blotter_source, resolve_data_path
+from application_pages.calendars import render_holiday_calendar
+from application_pages.instrumentation import checkpoint
+from pricing.blotter import DEFAULT_CHUNKSIZE
+from pricing.incremental import load_book
+from pricing.scenarios import (
+    DEFAULT_MEMORY_BUDGET_MB,
+    load_historical_scenarios,
+    parallel_scenarios,
+    scenario_pnl,
+    summarize_pnl,
+    twist_scenarios,
+)
+
+
+def _render_scenario_inputs():
+    """Sidebar controls for the scenario set. Returns a ScenarioSet, None if incomplete, or False after an error."""
+    st.sidebar.header("Scenarios")
+    kind = st.sidebar.radio(
+        "Scenario Type",
+        options=["Parallel", "Twist", "Historical"],
+        help="Parallel shifts move every tenor equally; twists move the short and long ends independently; "
+             "historical scenarios replay daily rate changes from a file."
+    )
+    if kind == "Parallel":
+        min_shift, max_shift = st.sidebar.slider("Shift Range (bp)", min_value=-500, max_value=500, value=(-200, 200), step=5)
+        count = st.sidebar.number_input("Number of Scenarios", min_value=2, max_value=100_000, value=1_001, step=100)
+        return parallel_scenarios(min_shift, max_shift, int(count))
+    if kind == "Twist":
+        max_shift = st.sidebar.slider("Maximum Shift at Either End (bp)", min_value=5, max_value=500, value=100, step=5)
+        count = st.sidebar.number_input(
+            "Shifts per End", min_value=2, max_value=300, value=32, step=1,
+            help="Short- and long-end shifts are combined pairwise, giving this number squared scenarios."
+        )
+        long_node = st.sidebar.number_input("Long End (months)", min_value=1, max_value=240, value=120, step=1)
+        return twist_scenarios(max_shift, int(count), 0, float(long_node))
+
+    st.sidebar.caption("CSV with an optional `date` column and one column of daily changes (bp) per tenor, e.g. `3M`, `6M`, `1Y`.")
+    source = st.sidebar.file_uploader("Historical Rate Changes (CSV)", type=["csv"])
+    if source is None:
+        path = st.sidebar.text_input("or Server File Path", help=f"Path to a scenario CSV, relative to {DATA_DIR}.")
+        if path:
+            try:
+                source = resolve_data_path(path)
+            except ValueError as e:
+                st.error(f"Error: {e}")
+                return False
+            if not os.path.isfile(source):
+                st.error(f"Error: Scenario file not found: {path}")
+                return False
+    if source is None:
+        return None
+    try:
+        return load_historical_scenarios(source)
+    except (ValueError, OSError) as e:
+        st.error(f"Error: {e}")
+        return False
+
+
+def run_scenario_var_page():
+    st.header("FRA Scenario VaR")
+    st.markdown("""
+---
+### Overview
+
+This page revalues a whole FRA book under thousands of **rate-shift scenarios** and reports the distribution of the
+change in **Cash Settlement (PV)**. Each scenario is a shift curve over tenors; every trade's Market Reference Rate
+moves by the shift interpolated at its start period (A), and the book is revalued with the settlement formula
+
+$$ PV = \\frac{N \\tau (MRR + \\Delta - IFR)}{1 + (MRR + \\Delta) \\, \\tau} $$
+
+From the scenario P&L we report **Value at Risk** (the loss exceeded in only $1 - c$ of scenarios at confidence $c$)
+and **Expected Shortfall** (the average loss in those worst scenarios). The scenario × trade grid is evaluated in
+tiles across worker threads, so peak memory stays within the budget set in the sidebar however large the book.
+
+---
+""")
+    checkpoint("page intro")
+
+    source = render_blotter_source()
+    if source is False:
+        return
+    chunksize = st.sidebar.number_input(
+        "Chunk Size (rows)",
+        min_value=1_000,
+        max_value=5_000_000,
+        value=DEFAULT_CHUNKSIZE,
+        step=1_000,
+        help="Number of trades read and validated per chunk while loading the book."
+    )
+    calendar = render_holiday_calendar()
+    if calendar is False:
+        return
+    st.sidebar.header("Market Rate")
+    override_mrr = st.sidebar.checkbox(
+        "Use a single MRR for the whole book",
+        value=False,
+        help="Ignore the blotter's market_reference_rate column and evaluate every trade at the rate below."
+    )
+    market_reference_rate = None
+    if override_mrr:
+        market_reference_rate = st.sidebar.slider(
+            "Market Reference Rate (MRR)",
+            min_value=0.01,
+            max_value=0.10,
+            value=0.055,
+            step=0.0001,
+            format="%.4f%%"
+        )
+    scenarios = _render_scenario_inputs()
+    if scenarios is False:
+        return
+
+    st.sidebar.header("Execution")
+    confidence = st.sidebar.select_slider(
+        "Confidence Level",
+        options=[0.9, 0.95, 0.975, 0.99, 0.995],
+        value=0.99,
+        format_func=lambda c: f"{c:.1%}"
+    )
+    workers = st.sidebar.number_input("Worker Threads", min_value=1, max_value=256, value=os.cpu_count() or 1, step=1)
+    memory_budget_mb = st.sidebar.number_input(
+        "Memory Budget (MB)", min_value=16, max_value=65_536, value=DEFAULT_MEMORY_BUDGET_MB, step=16,
+        help="Upper bound on the scenario x trade working set shared by all worker threads."
+    )
+    checkpoint("widget parsing")
+
+    if source is None or scenarios is None:
+        st.info("Choose a blotter and a scenario set in the sidebar to begin.")
+        return
+    if not st.button("Run Scenario Analysis"):
+        return
+
+    try:
+        with st.spinner("Loading the book..."):
+            book, blotter_mrr, rejected = load_book(source, int(chunksize), calendar)
+        checkpoint("book load")
+        if len(book) == 0:
+            st.warning("The blotter contains no valid trades.")
+            return
+        with st.spinner(f"Revaluing {len(book):,} trades under {len(scenarios.names):,} scenarios..."):
+            started = time.perf_counter()
+            pnl = scenario_pnl(
+                book,
+                blotter_mrr if market_reference_rate is None else market_reference_rate,
+                scenarios,
+                workers=int(workers),
+                memory_budget_mb=int(memory_budget_mb),
+            )
+            elapsed = time.perf_counter() - started
+        summary = summarize_pnl(pnl, confidence)
+    except (ValueError, ImportError, OSError) as e:
+        st.error(f"Error: {e}")
+        return
+    checkpoint("settlement math: scenarios")
+
+    import pandas as pd
+    import plotly.graph_objects as go
+    from application_pages.charts import histogram_trace
+
+    st.subheader("Scenario P&L")
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric(f"VaR ({confidence:.1%})", f"${summary.value_at_risk:,.2f}")
+    col2.metric(f"Expected Shortfall ({confidence:.1%})", f"${summary.expected_shortfall:,.2f}")
+    col3.metric("Mean P&L", f"${summary.mean:,.2f}")
+    col4.metric("Worst P&L", f"${summary.worst:,.2f}")
+    evaluations = len(book) * summary.scenarios
+    st.caption(
+        f"Trades: {len(book):,} | Rows rejected by validation: {rejected:,} | Scenarios: {summary.scenarios:,} | "
+        f"{evaluations:,} trade revaluations in {elapsed:,.2f} s ({evaluations / max(elapsed, 1e-9) / 1e6:,.1f} M/s)"
+    )
+
+    fig_pnl = go.Figure(histogram_trace(pnl, bins=100, name="Scenarios", marker_color="royalblue"))
+    fig_pnl.add_vline(x=-summary.value_at_risk, line_dash="dash", line_color="salmon",
+                      annotation_text=f"VaR {confidence:.1%}")
+    fig_pnl.update_layout(
+        title="Distribution of Scenario P&L (Cash Settlement PV)",
+        title_x=0.5,
+        xaxis_title="P&L ($)",
+        yaxis_title="Probability",
+        font_size=12
+    )
+    checkpoint("figure build: scenario P&L")
+    st.plotly_chart(fig_pnl, use_container_width=True)
+    checkpoint("st.plotly_chart: scenario P&L")
+
+    pnl_df = pd.DataFrame({"Scenario": scenarios.names, "P&L ($)": pnl})
+    st.subheader("Worst Scenarios")
+    st.dataframe(pnl_df.nsmallest(10, "P&L ($)").style.format({"P&L ($)": "{:,.2f}"}), hide_index=True)
+    st.download_button(
+        "Download Scenario P&L (CSV)",
+        data=pnl_df.to_csv(index=False),
+        file_name="fra_scenario_pnl.csv",
+        mime="text/csv"
+    )
@@ -0,0 +1,171 @@
+"""QuLab performance benchmark suite.
+
+Measures FRA settlement throughput, APR conversion throughput, sensitivity curve and
+surface generation time, and full page script execution time through Streamlit's
+AppTest harness. Results are written as JSON and checked against regression
+thresholds; the exit status is non-zero if any threshold is breached.
+
+Usage:
+    python benchmarks/run_benchmarks.py [--output results.json] [--thresholds benchmarks/thresholds.json]
+                                        [--max-trades 1e8] [--repeat 5] [--skip-pages]
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import numpy as np
+
+from pricing.apr import convert_apr, convert_to_frequencies
+from pricing.fra import cash_settlement_pv, settle_fra
+from pricing.sensitivity import mrr_grid, settlement_surface, tenor_grid
+
+DEFAULT_THRESHOLDS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "thresholds.json")
+TRADE_COUNTS = [10 ** k for k in range(3, 9)]
+# Books larger than this are settled as repeated passes over one block, so a 1e8-trade
+# run measures kernel throughput without allocating tens of GB of inputs.
+BLOCK_TRADES = 10_000_000
+PAGES = ["FRA Settlement Simulator", "FRA Blotter Ingestion", "FRA Risk Ladder", "FRA Book What-If", "FRA Scenario VaR",
+         "APR Conversion Utility"]
+
+
+def _best_of(fn, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings), statistics.median(timings)
+
+
+def _random_book(n, rng):
+    start = rng.integers(0, 60, n)
+    return (
+        rng.uniform(1e5, 1e8, n),
+        rng.uniform(0.0, 0.10, n),
+        start,
+        start + rng.integers(1, 60, n),
+        rng.uniform(0.01, 0.10, n),
+    )
+
+
+def bench_fra_settlement(max_trades, repeat):
+    rng = np.random.default_rng(0)
+    results = {}
+    for n in [c for c in TRADE_COUNTS if c <= max_trades]:
+        block = _random_book(min(n, BLOCK_TRADES), rng)
+        passes = max(n // BLOCK_TRADES, 1)
+        runs = repeat if n <= BLOCK_TRADES else 1
+        for name, kernel in (("settle_fra", settle_fra), ("cash_settlement_pv", cash_settlement_pv)):
+            best, median = _best_of(lambda: [kernel(*block) for _ in range(passes)], runs)
+            results[f"{name}/{n:.0e}"] = {"trades": n, "seconds": best, "median_seconds": median,
+                                          "trades_per_sec": n / best}
+    return results
+
+
+def bench_apr_conversion(max_trades, repeat):
+    rng = np.random.default_rng(1)
+    n = min(10_000_000, max_trades)
+    apr = rng.uniform(0.0, 0.20, n)
+    results = {}
+    best, median = _best_of(lambda: convert_apr(apr, 2, 12), repeat)
+    results["convert_apr/pair"] = {"rates": n, "seconds": best, "median_seconds": median, "rates_per_sec": n / best}
+    m = min(1_000_000, n)
+    best, median = _best_of(lambda: convert_to_frequencies(apr[:m], 12), repeat)
+    results["convert_to_frequencies/standard"] = {"rates": m, "seconds": best, "median_seconds": median,
+                                                  "rates_per_sec": m / best}
+    return results
+
+
+def bench_sensitivity(repeat):
+    results = {}
+    for label, mrrs, tenors in (("curve/100", mrr_grid(points=100), [3]),
+                                ("surface/1000x120", mrr_grid(points=1000), tenor_grid(120))):
+        best, median = _best_of(lambda: settlement_surface(10_000_000, 0.0525, mrrs, tenors, 3), repeat * 10)
+        results[label] = {"points": len(mrrs) * len(tenors), "seconds": best, "median_seconds": median}
+    return results
+
+
+def bench_pages(repeat):
+    from streamlit.testing.v1 import AppTest
+
+    results = {}
+    for page in PAGES:
+        at = AppTest.from_file(os.path.join(ROOT, "app.py"), default_timeout=120).run()
+        at.sidebar.selectbox[0].set_value(page).run()
+        if at.exception:
+            raise RuntimeError(f"{page} raised: {[e.value for e in at.exception]}")
+        best, median = _best_of(at.run, repeat)
+        results[page] = {"seconds": best, "median_seconds": median}
+    return results
+
+
+def check_thresholds(results, thresholds):
+    """Return a list of human-readable regression messages."""
+    failures = []
+    for path, limits in thresholds.items():
+        section, _, name = path.partition(":")
+        measured = results.get(section, {}).get(name)
+        if measured is None:
+            continue
+        for metric, limit in limits.items():
+            bound, _, key = metric.partition("_")
+            value = measured.get(key)
+            if value is None:
+                continue
+            if bound == "min" and value < limit:
+                failures.append(f"{path} {key}={value:.4g} below minimum {limit:.4g}")
+            elif bound == "max" and value > limit:
+                failures.append(f"{path} {key}={value:.4g} above maximum {limit:.4g}")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--output", help="Write results JSON here (default: stdout).")
+    parser.add_argument("--thresholds", default=DEFAULT_THRESHOLDS, help="Regression thresholds JSON.")
+    parser.add_argument("--max-trades", type=float, default=1e8, help="Largest FRA book size to benchmark.")
+    parser.add_argument("--repeat", type=int, default=5, help="Repetitions per measurement (best is reported).")
+    parser.add_argument("--skip-pages", action="store_true", help="Skip the Streamlit AppTest page benchmarks.")
+    args = parser.parse_args()
+
+    results = {
+        "environment": {
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "machine": platform.machine(),
+            "cpu_count": os.cpu_count(),
+        },
+        "fra_settlement": bench_fra_settlement(int(args.max_trades), args.repeat),
+        "apr_conversion": bench_apr_conversion(int(args.max_trades), args.repeat),
+        "sensitivity": bench_sensitivity(args.repeat),
+    }
+    if not args.skip_pages:
+        results["pages"] = bench_pages(args.repeat)
+
+    thresholds = {}
+    if args.thresholds and os.path.exists(args.thresholds):
+        with open(args.thresholds) as f:
+            thresholds = json.load(f)
+    failures = check_thresholds(results, thresholds)
+    results["regressions"] = failures
+
+    report = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(report)
+    else:
+        print(report)
+    for failure in failures:
+        print(f"REGRESSION: {failure}", file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,101 @@
+"""Measure QuLab cold-start and rerun costs.
+
+Each measurement runs in a fresh interpreter so module caches start empty:
+
+- ``imports``: cold import time of each heavy library and page module, on top of
+  ``import streamlit`` (which every rerun already pays).
+- ``first_run`` / ``rerun``: wall time, through Streamlit's AppTest harness, of the
+  first script run showing a page in a new process and of a subsequent rerun. For
+  the default page ``first_run`` is the cold start; other pages are measured on
+  their first visit after it.
+
+Usage: python benchmarks/startup.py [--repeat N]  (prints JSON)
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+MODULES = [
+    "numpy",
+    "pandas",
+    "plotly.express",
+    "pricing.fra",
+    "application_pages.fra_settlement",
+    "application_pages.apr_conversion",
+    "application_pages.blotter_ingestion",
+    "application_pages.risk_ladder",
+    "application_pages.book_whatif",
+    "application_pages.scenario_var",
+]
+PAGES = ["FRA Settlement Simulator", "FRA Blotter Ingestion", "FRA Risk Ladder", "FRA Book What-If", "FRA Scenario VaR",
+         "APR Conversion Utility"]
+
+_IMPORT_SNIPPET = """
+import sys, time, json
+import streamlit
+sys.path.insert(0, {root!r})
+start = time.perf_counter()
+import {module}
+print(json.dumps(time.perf_counter() - start))
+"""
+
+_APP_SNIPPET = """
+import json, time
+from streamlit.testing.v1 import AppTest
+at = AppTest.from_file({app!r}, default_timeout=120)
+start = time.perf_counter()
+at.run()
+if at.sidebar.selectbox[0].value != {page!r}:
+    # Pages other than the default are measured on their first visit after startup
+    at.sidebar.selectbox[0].set_value({page!r})
+    start = time.perf_counter()
+    at.run()
+first = time.perf_counter() - start
+start = time.perf_counter()
+at.run()
+rerun = time.perf_counter() - start
+assert not at.exception, [e.value for e in at.exception]
+print(json.dumps({{"first_run": first, "rerun": rerun}}))
+"""
+
+
+def _run(snippet):
+    out = subprocess.run(
+        [sys.executable, "-c", snippet], cwd=ROOT, capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def measure_imports(repeat):
+    return {
+        module: statistics.median(_run(_IMPORT_SNIPPET.format(root=ROOT, module=module)) for _ in range(repeat))
+        for module in MODULES
+    }
+
+
+def measure_pages(repeat):
+    app = os.path.join(ROOT, "app.py")
+    results = {}
+    for page in PAGES:
+        runs = [_run(_APP_SNIPPET.format(app=app, page=page)) for _ in range(repeat)]
+        results[page] = {
+            "first_run": statistics.median(r["first_run"] for r in runs),
+            "rerun": statistics.median(r["rerun"] for r in runs),
+        }
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=3, help="Fresh processes per measurement (median is reported).")
+    args = parser.parse_args()
+    print(json.dumps({"imports": measure_imports(args.repeat), "pages": measure_pages(args.repeat)}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
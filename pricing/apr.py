@@ -0,0 +1,84 @@
+import numpy as np
+from typing import NamedTuple
+
+
+CONTINUOUS = np.inf
+STANDARD_FREQUENCIES = (1, 2, 4, 12, 52, 365, CONTINUOUS)
+FREQUENCY_LABELS = {
+    1: "Annual (1)",
+    2: "Semi-annual (2)",
+    4: "Quarterly (4)",
+    12: "Monthly (12)",
+    52: "Weekly (52)",
+    365: "Daily (365)",
+    CONTINUOUS: "Continuous (∞)",
+}
+
+
+class APRConversion(NamedTuple):
+    apr: np.ndarray
+    valid: np.ndarray
+
+
+def frequency_label(frequency):
+    return FREQUENCY_LABELS.get(frequency, f"{frequency:g}")
+
+
+def _log_growth(apr, m):
+    """ln(1 + EAR) for an APR compounded m times a year (m = inf for continuous)."""
+    continuous = np.isinf(m)
+    finite_m = np.where(continuous, 1.0, m)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(continuous, apr, finite_m * np.log1p(apr / finite_m))
+
+
+def _apr_from_log_growth(growth, n):
+    continuous = np.isinf(n)
+    finite_n = np.where(continuous, 1.0, n)
+    with np.errstate(over="ignore", invalid="ignore"):
+        return np.where(continuous, growth, finite_n * np.expm1(growth / finite_n))
+
+
+def valid_apr_inputs(apr, m, n=1):
+    """Mask of conversions that are mathematically defined.
+
+    Requires a finite APR, positive frequencies and a positive base 1 + APR/m.
+    """
+    apr = np.asarray(apr, dtype=np.float64)
+    m = np.asarray(m, dtype=np.float64)
+    n = np.asarray(n, dtype=np.float64)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        base = np.where(np.isinf(m), 1.0, 1 + apr / m)
+    return np.isfinite(apr) & (m > 0) & (n > 0) & (base > 0)
+
+
+def convert_apr(apr, m, n):
+    """Convert APRs compounded m times a year to the equivalent APRs compounded n times.
+
+    APR_n = n * ((1 + APR_m / m)^(m / n) - 1), evaluated as n * expm1(m / n * log1p(APR_m / m))
+    for accuracy at small rates; m or n of `CONTINUOUS` (inf) means continuous compounding.
+    Arguments broadcast. Invalid entries are NaN in `apr` and False in `valid`.
+    """
+    apr = np.asarray(apr, dtype=np.float64)
+    m = np.asarray(m, dtype=np.float64)
+    n = np.asarray(n, dtype=np.float64)
+    valid = valid_apr_inputs(apr, m, n)
+    converted = _apr_from_log_growth(_log_growth(apr, m), n)
+    return APRConversion(np.where(valid, converted, np.nan), valid)
+
+
+def convert_to_frequencies(apr, m, frequencies=STANDARD_FREQUENCIES):
+    """Equivalent APRs at every frequency; shape `np.broadcast(apr, m).shape + (len(frequencies),)`."""
+    apr = np.asarray(apr, dtype=np.float64)[..., np.newaxis]
+    m = np.asarray(m, dtype=np.float64)[..., np.newaxis]
+    return convert_apr(apr, m, np.asarray(frequencies, dtype=np.float64))
+
+
+def equivalence_matrix(apr, frequencies=STANDARD_FREQUENCIES):
+    """Matrix whose [i, j] entry is the APR at frequencies[j] equivalent to `apr` quoted at frequencies[i].
+
+    For an array of APRs the result has shape `apr.shape + (F, F)`.
+    """
+    frequencies = np.asarray(frequencies, dtype=np.float64)
+    apr = np.asarray(apr, dtype=np.float64)[..., np.newaxis, np.newaxis]
+    return convert_apr(apr, frequencies[:, np.newaxis], frequencies[np.newaxis, :])
@@ -0,0 +1,304 @@
+import os
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from pricing.daycount import DAY_COUNT_CONVENTIONS, accrual_dates, actual_over_basis, year_fraction
+from pricing.fra import period_fraction, settle_fra, valid_terms
+from pricing.store import TradeStore, is_trade_store
+
+
+BLOTTER_COLUMNS = [
+    "notional_principal",
+    "fixed_rate",
+    "start_period",
+    "end_period",
+    "market_reference_rate",
+]
+DEFAULT_DAYS_IN_YEAR_BASIS = 360
+DEFAULT_CHUNKSIZE = 250_000
+# Read size when scanning a CSV for its row count
+_COUNT_BLOCK_BYTES = 16 * 2**20
+_COMPRESSED_SUFFIXES = (".gz", ".bz2", ".zip", ".xz", ".zst", ".tar")
+
+RESULT_COLUMNS = [
+    "period_fraction",
+    "fixed_interest_payment",
+    "floating_interest_payment",
+    "net_payment_at_maturity",
+    "cash_settlement_pv",
+]
+# Columns of per-trade results, in file order after the optional trade_id
+OUTPUT_COLUMNS = BLOTTER_COLUMNS + ["days_in_year_basis"] + RESULT_COLUMNS
+
+
+@dataclass
+class BlotterTotals:
+    """Running aggregates over a streamed blotter."""
+    chunks: int = 0
+    trades: int = 0
+    rejected: int = 0
+    total_net_payment: float = 0.0
+    total_cash_settlement_pv: float = 0.0
+
+    def update(self, settled, rejected):
+        self.chunks += 1
+        self.trades += len(settled)
+        self.rejected += rejected
+        self.total_net_payment += float(settled["net_payment_at_maturity"].sum())
+        self.total_cash_settlement_pv += float(settled["cash_settlement_pv"].sum())
+
+
+def _blotter_format(source, fmt=None):
+    if fmt:
+        return fmt.lower()
+    name = source if isinstance(source, (str, os.PathLike)) else getattr(source, "name", "")
+    return "parquet" if str(name).lower().endswith((".parquet", ".pq")) else "csv"
+
+
+def generate_sample_blotter(n_trades, seed=0):
+    """A random FRA book with realistic term ranges, for demos and benchmarks."""
+    rng = np.random.default_rng(seed)
+    start_period = rng.integers(0, 61, n_trades)
+    return pd.DataFrame({
+        "trade_id": np.arange(n_trades),
+        "notional_principal": rng.integers(1, 1001, n_trades) * 100_000.0,
+        "fixed_rate": np.round(rng.uniform(0.02, 0.08, n_trades), 4),
+        "start_period": start_period,
+        "end_period": start_period + rng.choice([1, 3, 6, 9, 12], n_trades),
+        "market_reference_rate": np.round(rng.uniform(0.02, 0.08, n_trades), 4),
+    })
+
+
+def read_blotter_chunks(source, chunksize=DEFAULT_CHUNKSIZE, fmt=None):
+    """Yield the blotter as DataFrames of at most `chunksize` rows.
+
+    `source` is a path, a binary file-like object (e.g. a Streamlit upload) or an
+    in-memory DataFrame. Parquet files are read batch by batch through pyarrow, so
+    only one chunk is ever held in memory.
+    """
+    if isinstance(source, pd.DataFrame):
+        for start in range(0, len(source), chunksize):
+            yield source.iloc[start:start + chunksize]
+        return
+    if hasattr(source, "seek"):
+        # File-like sources (e.g. uploads) may already have been read once
+        source.seek(0)
+    fmt = _blotter_format(source, fmt)
+    if fmt == "csv":
+        with pd.read_csv(source, chunksize=chunksize) as reader:
+            yield from reader
+    elif fmt == "parquet":
+        try:
+            import pyarrow.parquet as pq
+        except ImportError as e:
+            raise ImportError("Reading Parquet blotters requires pyarrow (pip install pyarrow).") from e
+        parquet_file = pq.ParquetFile(source)
+        for batch in parquet_file.iter_batches(batch_size=chunksize):
+            yield batch.to_pandas()
+    else:
+        raise ValueError(f"Unsupported blotter format: {fmt!r}. Expected 'csv' or 'parquet'.")
+
+
+def count_blotter_rows(source, fmt=None):
+    """An upper bound on the number of trades in a blotter, without parsing it; None if unknown.
+
+    Parquet files report their row count in the footer; CSV files are scanned for line
+    breaks. Compressed CSVs return None.
+    """
+    if isinstance(source, pd.DataFrame):
+        return len(source)
+    if is_trade_store(source):
+        source = TradeStore(source)
+    if isinstance(source, TradeStore):
+        return len(source)
+    if hasattr(source, "seek"):
+        source.seek(0)
+    fmt = _blotter_format(source, fmt)
+    if fmt == "parquet":
+        try:
+            import pyarrow.parquet as pq
+        except ImportError:
+            return None
+        return pq.ParquetFile(source).metadata.num_rows
+    name = source if isinstance(source, (str, os.PathLike)) else getattr(source, "name", "")
+    if fmt != "csv" or str(name).lower().endswith(_COMPRESSED_SUFFIXES):
+        return None
+    # Every row but possibly the last ends in a line break, so this never undercounts
+    rows = 1
+    f = open(source, "rb") if isinstance(source, (str, os.PathLike)) else source
+    try:
+        for block in iter(lambda: f.read(_COUNT_BLOCK_BYTES), f.read(0)):
+            rows += block.count(b"\n" if isinstance(block, bytes) else "\n")
+    finally:
+        if f is not source:
+            f.close()
+    return rows
+
+
+def _dated_period_fractions(chunk, terms, mask, calendar, roll):
+    """Day-count period fractions for rows with a trade_date; rejects rows that cannot be dated."""
+    trade_dates = pd.to_datetime(chunk["trade_date"], errors="coerce").to_numpy(dtype="datetime64[D]")
+    start_period = terms["start_period"].to_numpy()
+    end_period = terms["end_period"].to_numpy()
+    with np.errstate(invalid="ignore"):
+        mask = mask & ~np.isnat(trade_dates) & (start_period == np.round(start_period)) & (end_period == np.round(end_period))
+
+    fractions = np.full(len(terms), np.nan)
+    rows = np.flatnonzero(mask)
+    if len(rows) == 0:
+        return fractions, mask
+    start_dates, end_dates = accrual_dates(
+        trade_dates[rows], start_period[rows].astype(np.int64), end_period[rows].astype(np.int64), calendar, roll
+    )
+    if "day_count" in chunk.columns:
+        conventions = chunk["day_count"].astype(str).str.upper().to_numpy()[rows]
+        for convention in np.unique(conventions):
+            selected = conventions == convention
+            if convention in DAY_COUNT_CONVENTIONS:
+                fractions[rows[selected]] = year_fraction(start_dates[selected], end_dates[selected], convention)
+            else:
+                mask[rows[selected]] = False
+    else:
+        fractions[rows] = actual_over_basis(start_dates, end_dates, terms["days_in_year_basis"].to_numpy()[rows])
+    return fractions, mask
+
+
+def validate_chunks(chunks, calendar=None, roll="modified_following"):
+    """Split each chunk into valid trades and a count of rejected rows.
+
+    Applies the same constraints as the FRA Settlement Simulator page: all terms
+    present and numeric, End Period (B) > Start Period (A), a positive day basis and
+    a positive discount factor. Adds a period_fraction column: (B - A) / 12, or, when
+    the blotter has a trade_date column, the day-count fraction between the accrual
+    dates A and B months after the trade date, rolled on `calendar`. The convention
+    comes from an optional day_count column, else actual days / days_in_year_basis.
+    Chunks of a dated blotter are flagged with `attrs["dated"]`, so books built from
+    them know their fractions cannot be re-derived from A and B alone.
+    """
+    for chunk in chunks:
+        missing = [c for c in BLOTTER_COLUMNS if c not in chunk.columns]
+        if missing:
+            raise ValueError(f"Blotter is missing required columns: {', '.join(missing)}")
+
+        terms = chunk[BLOTTER_COLUMNS].apply(pd.to_numeric, errors="coerce")
+        if "days_in_year_basis" in chunk.columns:
+            terms["days_in_year_basis"] = pd.to_numeric(chunk["days_in_year_basis"], errors="coerce")
+        else:
+            terms["days_in_year_basis"] = DEFAULT_DAYS_IN_YEAR_BASIS
+
+        mask = terms.notna().all(axis=1).to_numpy() & valid_terms(
+            terms["start_period"].to_numpy(),
+            terms["end_period"].to_numpy(),
+            terms["days_in_year_basis"].to_numpy(),
+        )
+        if "trade_date" in chunk.columns:
+            terms["period_fraction"], mask = _dated_period_fractions(chunk, terms, mask, calendar, roll)
+        else:
+            terms["period_fraction"] = period_fraction(terms["start_period"].to_numpy(), terms["end_period"].to_numpy())
+        with np.errstate(invalid="ignore"):
+            mask &= 1 + terms["market_reference_rate"].to_numpy() * terms["period_fraction"].to_numpy() > 0
+        if "trade_id" in chunk.columns:
+            terms.insert(0, "trade_id", chunk["trade_id"])
+        valid = terms[mask]
+        valid.attrs["dated"] = "trade_date" in chunk.columns
+        yield valid, int((~mask).sum())
+
+
+def validated_blotter_chunks(source, chunksize=DEFAULT_CHUNKSIZE, fmt=None, calendar=None):
+    """`validate_chunks` over any blotter source; trade stores skip parsing and validation."""
+    if is_trade_store(source):
+        source = TradeStore(source)
+    if isinstance(source, TradeStore):
+        return source.validated_chunks(chunksize)
+    return validate_chunks(read_blotter_chunks(source, chunksize, fmt), calendar)
+
+
+def settle_chunks(validated):
+    """Attach settlement results to each validated chunk."""
+    for terms, rejected in validated:
+        settlement = settle_fra(
+            terms["notional_principal"].to_numpy(),
+            terms["fixed_rate"].to_numpy(),
+            terms["start_period"].to_numpy(),
+            terms["end_period"].to_numpy(),
+            terms["market_reference_rate"].to_numpy(),
+            terms["period_fraction"].to_numpy(),
+        )
+        settled = terms.copy()
+        for column in RESULT_COLUMNS:
+            settled[column] = getattr(settlement, column)
+        yield settled, rejected
+
+
+def _result_schema(with_trade_id):
+    """Fixed Parquet schema for per-trade results: float64 terms and results, string trade ids.
+
+    Inferring the schema per chunk would make the file depend on where the data falls,
+    e.g. a blank cell turning an integer column into floats in a later chunk.
+    """
+    import pyarrow as pa
+
+    fields = [(c, pa.float64()) for c in OUTPUT_COLUMNS]
+    if with_trade_id:
+        fields.insert(0, ("trade_id", pa.string()))
+    return pa.schema(fields)
+
+
+class _ResultWriter:
+    """Appends settled chunks to a CSV or Parquet file as they are produced."""
+
+    def __init__(self, path, fmt=None):
+        self.path = path
+        self.fmt = _blotter_format(path, fmt)
+        self._parquet_writer = None
+        self._wrote_header = False
+
+    def write(self, settled):
+        if self.fmt == "parquet":
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+
+            if self._parquet_writer is None:
+                self._schema = _result_schema("trade_id" in settled.columns)
+                self._parquet_writer = pq.ParquetWriter(self.path, self._schema)
+            if "trade_id" in self._schema.names:
+                settled = settled.assign(trade_id=settled["trade_id"].astype("string"))
+            self._parquet_writer.write_table(pa.Table.from_pandas(settled, schema=self._schema, preserve_index=False))
+        else:
+            settled.to_csv(self.path, mode="a" if self._wrote_header else "w", header=not self._wrote_header, index=False)
+            self._wrote_header = True
+
+    def close(self):
+        if self._parquet_writer is not None:
+            self._parquet_writer.close()
+
+
+def process_blotter(source, output_path=None, chunksize=DEFAULT_CHUNKSIZE, fmt=None, output_fmt=None, calendar=None):
+    """Stream a blotter through parse -> validate -> settle -> aggregate.
+
+    Yields the running `BlotterTotals` after every chunk, so callers can report
+    progress. When `output_path` is given, per-trade results are appended to it
+    chunk by chunk.
+    """
+    totals = BlotterTotals()
+    writer = _ResultWriter(output_path, output_fmt) if output_path else None
+    try:
+        pipeline = settle_chunks(validated_blotter_chunks(source, chunksize, fmt, calendar))
+        for settled, rejected in pipeline:
+            if writer is not None:
+                writer.write(settled)
+            totals.update(settled, rejected)
+            yield totals
+    finally:
+        if writer is not None:
+            writer.close()
+
+
+def settle_blotter(source, output_path=None, chunksize=DEFAULT_CHUNKSIZE, fmt=None, output_fmt=None, calendar=None):
+    """Run `process_blotter` to completion and return the final totals."""
+    totals = BlotterTotals()
+    for totals in process_blotter(source, output_path, chunksize, fmt, output_fmt, calendar):
+        pass
+    return totals
@@ -0,0 +1,152 @@
+"""Command-line entry point for headless FRA settlement and APR conversion.
+
+    python -m pricing.cli fra-settle blotter.csv results.csv
+    python -m pricing.cli fra-store blotter.csv trade_stores/book
+    python -m pricing.cli apr-convert rates.csv converted.csv --column apr --m 2 --n 12
+    python -m pricing.cli serve --port 8600
+"""
+import argparse
+import sys
+
+from pricing.apr import CONTINUOUS, STANDARD_FREQUENCIES, convert_apr, convert_to_frequencies
+from pricing.blotter import DEFAULT_CHUNKSIZE, process_blotter, validated_blotter_chunks
+from pricing.daycount import load_holiday_calendar
+from pricing.parallel import value_blotter
+from pricing.store import write_trade_store
+
+
+def _frequency(value):
+    if value.lower() in ("continuous", "inf", "infinity"):
+        return CONTINUOUS
+    frequency = float(value)
+    if frequency <= 0:
+        raise argparse.ArgumentTypeError("Compounding frequency must be positive.")
+    return frequency
+
+
+def _apr_column(frequency):
+    return "apr_continuous" if frequency == CONTINUOUS else f"apr_{frequency:g}"
+
+
+def fra_settle(args):
+    totals = None
+    calendar = load_holiday_calendar(args.calendar) if args.calendar else None
+    if args.workers > 1 and not args.output:
+        totals, _ = value_blotter(args.input, workers=args.workers, chunksize=args.chunksize,
+                                  fmt=args.format, calendar=calendar)
+    else:
+        for totals in process_blotter(args.input, args.output, chunksize=args.chunksize,
+                                      fmt=args.format, output_fmt=args.output_format, calendar=calendar):
+            if args.progress:
+                print(f"chunks={totals.chunks} trades={totals.trades:,} rejected={totals.rejected:,}", file=sys.stderr)
+    if totals is None:
+        print("The blotter contains no rows.", file=sys.stderr)
+        return 1
+    print(f"Trades settled: {totals.trades:,}")
+    print(f"Rows rejected: {totals.rejected:,}")
+    print(f"Total net payment at maturity: {totals.total_net_payment:,.2f}")
+    print(f"Total cash settlement (PV): {totals.total_cash_settlement_pv:,.2f}")
+    return 0
+
+
+def fra_store(args):
+    calendar = load_holiday_calendar(args.calendar) if args.calendar else None
+    store = write_trade_store(
+        validated_blotter_chunks(args.input, args.chunksize, args.format, calendar), args.store, source=args.input
+    )
+    print(f"Trades stored: {len(store):,}")
+    print(f"Rows rejected: {store.rejected:,}")
+    print(f"Trade store: {store.path}")
+    return 0
+
+
+def apr_convert(args):
+    import numpy as np
+    import pandas as pd
+
+    converted_rows = 0
+    invalid_rows = 0
+    with pd.read_csv(args.input, chunksize=args.chunksize) as reader:
+        for i, chunk in enumerate(reader):
+            if args.column not in chunk.columns:
+                raise SystemExit(f"error: column {args.column!r} not found in {args.input}")
+            rates = pd.to_numeric(chunk[args.column], errors="coerce").to_numpy(dtype=np.float64)
+            if args.n is None:
+                conversion = convert_to_frequencies(rates, args.m)
+                for j, frequency in enumerate(STANDARD_FREQUENCIES):
+                    chunk[_apr_column(frequency)] = conversion.apr[:, j]
+                valid = conversion.valid.all(axis=1)
+            else:
+                conversion = convert_apr(rates, args.m, args.n)
+                chunk[_apr_column(args.n)] = conversion.apr
+                valid = conversion.valid
+            chunk["valid"] = valid
+            chunk.to_csv(args.output, mode="w" if i == 0 else "a", header=i == 0, index=False)
+            converted_rows += int(valid.sum())
+            invalid_rows += int((~valid).sum())
+    print(f"Rates converted: {converted_rows:,}")
+    print(f"Rates invalid: {invalid_rows:,}")
+    return 0
+
+
+def serve(args):
+    from pricing.service import serve as run_service
+
+    run_service(args.host, args.port, args.workers, args.max_batch, args.max_wait_ms)
+    return 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m pricing.cli", description="QuLab headless pricing tools.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    fra = commands.add_parser("fra-settle", help="Settle an FRA blotter file and write per-trade results.")
+    fra.add_argument("input", help="CSV or Parquet blotter, or a trade store directory.")
+    fra.add_argument("output", nargs="?", help="CSV or Parquet file for per-trade results (optional).")
+    fra.add_argument("--chunksize", type=int, default=DEFAULT_CHUNKSIZE, help="Trades per chunk.")
+    fra.add_argument("--format", choices=["csv", "parquet"], help="Input format (default: from extension).")
+    fra.add_argument("--output-format", choices=["csv", "parquet"], help="Output format (default: from extension).")
+    fra.add_argument("--calendar", help="Holiday calendar file for rolling accrual dates of dated trades (default: weekends only).")
+    fra.add_argument("--workers", type=int, default=1,
+                     help="Worker processes for totals-only runs (no output file); the book is shared, not pickled.")
+    fra.add_argument("--progress", action="store_true", help="Print running totals to stderr.")
+    fra.set_defaults(func=fra_settle)
+
+    store = commands.add_parser("fra-store", help="Validate a blotter once and save it as a memory-mappable trade store.")
+    store.add_argument("input", help="CSV or Parquet blotter.")
+    store.add_argument("store", help="Directory to write the trade store to. An existing trade store there is replaced; any other existing path is an error.")
+    store.add_argument("--chunksize", type=int, default=DEFAULT_CHUNKSIZE, help="Trades per chunk.")
+    store.add_argument("--format", choices=["csv", "parquet"], help="Input format (default: from extension).")
+    store.add_argument("--calendar", help="Holiday calendar file for rolling accrual dates of dated trades (default: weekends only).")
+    store.set_defaults(func=fra_store)
+
+    apr = commands.add_parser("apr-convert", help="Convert a CSV column of APRs between compounding frequencies.")
+    apr.add_argument("input", help="CSV file containing the rates.")
+    apr.add_argument("output", help="CSV file for the converted rates.")
+    apr.add_argument("--column", default="apr", help="Column holding the APRs (default: apr).")
+    apr.add_argument("--m", type=_frequency, required=True, help="Original compounding frequency, or 'continuous'.")
+    apr.add_argument("--n", type=_frequency, help="Target frequency, or 'continuous'. Default: all standard frequencies.")
+    apr.add_argument("--chunksize", type=int, default=DEFAULT_CHUNKSIZE, help="Rows per chunk.")
+    apr.set_defaults(func=apr_convert)
+
+    service = commands.add_parser("serve", help="Run the local HTTP pricing service.")
+    service.add_argument("--host", default="127.0.0.1")
+    service.add_argument("--port", type=int, default=8600)
+    service.add_argument("--workers", type=int, default=4, help="Warm worker threads for kernel calls.")
+    service.add_argument("--max-batch", type=int, default=100_000, help="Maximum rows coalesced into one call.")
+    service.add_argument("--max-wait-ms", type=float, default=0.0, help="Batching window in milliseconds (0: batch whatever is queued).")
+    service.set_defaults(func=serve)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    try:
+        return args.func(args)
+    except (ValueError, ImportError, OSError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
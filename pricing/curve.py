@@ -0,0 +1,170 @@
+import numpy as np
+
+from pricing.fra import MONTHS_PER_YEAR
+
+
+INTERPOLATION_METHODS = ("log_linear", "monotone_cubic")
+# Fixed-point sweeps allowed for monotone cubic bootstraps, and their convergence tolerance
+_MAX_BOOTSTRAP_SWEEPS = 200
+_BOOTSTRAP_TOLERANCE = 1e-15
+
+
+def _pchip_slopes(x, y):
+    """Fritsch-Carlson slopes for a monotone-preserving cubic Hermite interpolant."""
+    h = np.diff(x)
+    delta = np.diff(y) / h
+    slopes = np.zeros_like(y)
+    if len(x) == 2:
+        slopes[:] = delta[0]
+        return slopes
+
+    # Interior nodes: weighted harmonic mean where neighbouring secants agree in sign
+    w1 = 2 * h[1:] + h[:-1]
+    w2 = h[1:] + 2 * h[:-1]
+    same_sign = delta[:-1] * delta[1:] > 0
+    with np.errstate(divide="ignore", invalid="ignore"):
+        harmonic = (w1 + w2) / (w1 / delta[:-1] + w2 / delta[1:])
+    slopes[1:-1] = np.where(same_sign, harmonic, 0.0)
+
+    # End points: one-sided three-point estimate, clipped to preserve monotonicity
+    for end, (h0, h1, d0, d1) in ((0, (h[0], h[1], delta[0], delta[1])),
+                                  (-1, (h[-1], h[-2], delta[-1], delta[-2]))):
+        slope = ((2 * h0 + h1) * d0 - h0 * d1) / (h0 + h1)
+        if np.sign(slope) != np.sign(d0):
+            slope = 0.0
+        elif np.sign(d0) != np.sign(d1) and abs(slope) > abs(3 * d0):
+            slope = 3 * d0
+        slopes[end] = slope
+    return slopes
+
+
+class DiscountCurve:
+    """Discount factors on a set of node times with a precomputed interpolation index.
+
+    Node times are in months from today, consistent with the FRA Start/End Periods.
+    Interpolation works on -ln(DF), so `log_linear` gives piecewise-flat forward
+    rates and `monotone_cubic` gives a smooth, shape-preserving curve. Everything
+    the interpolant needs (node arrays, segment slopes/coefficients) is computed once
+    in the constructor; each lookup is a `searchsorted` plus a few array operations.
+    Beyond the last node the final forward rate is extrapolated flat.
+    """
+
+    def __init__(self, node_months, discount_factors, method="log_linear"):
+        if method not in INTERPOLATION_METHODS:
+            raise ValueError(f"Unknown interpolation method: {method!r}. Expected one of {INTERPOLATION_METHODS}.")
+        node_months = np.asarray(node_months, dtype=np.float64)
+        discount_factors = np.asarray(discount_factors, dtype=np.float64)
+        if node_months[0] != 0:
+            node_months = np.concatenate(([0.0], node_months))
+            discount_factors = np.concatenate(([1.0], discount_factors))
+        if np.any(np.diff(node_months) <= 0):
+            raise ValueError("Curve node times must be strictly increasing.")
+        if np.any(discount_factors <= 0):
+            raise ValueError("Discount factors must be positive.")
+
+        self.method = method
+        self.node_months = node_months
+        self.discount_factors = discount_factors
+        self._log_df = -np.log(discount_factors)
+        self._h = np.diff(node_months)
+        self._secants = np.diff(self._log_df) / self._h
+        if method == "monotone_cubic" and len(node_months) > 2:
+            self._slopes = _pchip_slopes(node_months, self._log_df)
+        else:
+            self._slopes = None
+
+    def _neg_log_df(self, months):
+        months = np.asarray(months, dtype=np.float64)
+        last = len(self.node_months) - 1
+        i = np.clip(np.searchsorted(self.node_months, months, side="right") - 1, 0, last - 1)
+        x0 = self.node_months[i]
+        y0 = self._log_df[i]
+        if self._slopes is None:
+            value = y0 + self._secants[i] * (months - x0)
+        else:
+            h = self._h[i]
+            t = (months - x0) / h
+            y1 = self._log_df[i + 1]
+            m0 = self._slopes[i] * h
+            m1 = self._slopes[i + 1] * h
+            t2 = t * t
+            t3 = t2 * t
+            value = ((2 * t3 - 3 * t2 + 1) * y0 + (t3 - 2 * t2 + t) * m0
+                     + (-2 * t3 + 3 * t2) * y1 + (t3 - t2) * m1)
+        # Flat forward extrapolation past the last node
+        beyond = months > self.node_months[-1]
+        if np.any(beyond):
+            extrapolated = self._log_df[-1] + self._secants[-1] * (months - self.node_months[-1])
+            value = np.where(beyond, extrapolated, value)
+        return value
+
+    def discount_factor(self, months):
+        return np.exp(-self._neg_log_df(months))
+
+    def zero_rate(self, months):
+        """Continuously compounded zero rate to `months` from today."""
+        months = np.asarray(months, dtype=np.float64)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.where(months > 0, self._neg_log_df(months) / (months / MONTHS_PER_YEAR), np.nan)
+
+    def forward_rate(self, start_period, end_period):
+        """Simple-compounded implied forward rate IFR_{A,B-A} for A x B strips, in batch.
+
+        IFR = (DF(A) / DF(B) - 1) / ((B - A) / 12)
+        """
+        start_period = np.asarray(start_period, dtype=np.float64)
+        end_period = np.asarray(end_period, dtype=np.float64)
+        growth = np.exp(self._neg_log_df(end_period) - self._neg_log_df(start_period))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return (growth - 1) / ((end_period - start_period) / MONTHS_PER_YEAR)
+
+
+def bootstrap_curve(deposits=(), fras=(), method="log_linear"):
+    """Bootstrap a `DiscountCurve` from deposit and FRA quotes.
+
+    `deposits` is an iterable of (tenor_months, rate) simple-rate quotes from today;
+    `fras` an iterable of (start_months, end_months, rate) quotes. Instruments are
+    solved in order of maturity: a deposit fixes DF(T) = 1 / (1 + r T / 12), an
+    A x B FRA fixes DF(B) = DF(A) / (1 + F (B - A) / 12), with DF(A) interpolated on
+    the curve built so far. Log-linear DF(A) only depends on earlier nodes, so one
+    pass is exact. Monotone cubic slopes depend on later nodes too, so the nodes are
+    then re-solved against the full cubic curve until they stop moving, and every
+    quote reprices on the returned curve.
+    """
+    if method not in INTERPOLATION_METHODS:
+        raise ValueError(f"Unknown interpolation method: {method!r}. Expected one of {INTERPOLATION_METHODS}.")
+    instruments = [(float(t), 0.0, float(r)) for t, r in deposits]
+    instruments += [(float(b), float(a), float(r)) for a, b, r in fras]
+    if not instruments:
+        raise ValueError("At least one deposit or FRA quote is required to bootstrap a curve.")
+    instruments.sort(key=lambda q: q[0])
+
+    node_months = [0.0]
+    discount_factors = [1.0]
+    for end, start, rate in instruments:
+        if end <= start:
+            raise ValueError(f"Invalid quote: end {end:g}M must be after start {start:g}M.")
+        if end in node_months:
+            raise ValueError(f"Duplicate curve node at {end:g}M.")
+        if start == 0:
+            df_start = 1.0
+        else:
+            if start > node_months[-1]:
+                raise ValueError(f"FRA {start:g}x{end:g} starts beyond the curve built so far ({node_months[-1]:g}M).")
+            df_start = float(np.exp(np.interp(start, node_months, np.log(discount_factors))))
+        node_months.append(end)
+        discount_factors.append(df_start / (1 + rate * (end - start) / MONTHS_PER_YEAR))
+
+    curve = DiscountCurve(node_months, discount_factors, method)
+    if method == "log_linear":
+        return curve
+
+    end_months, start_months, rates = (np.array(column) for column in zip(*instruments))
+    growth = 1 + rates * (end_months - start_months) / MONTHS_PER_YEAR
+    for _ in range(_MAX_BOOTSTRAP_SWEEPS):
+        solved = np.concatenate(([1.0], curve.discount_factor(start_months) / growth))
+        converged = np.max(np.abs(np.log(solved / curve.discount_factors))) < _BOOTSTRAP_TOLERANCE
+        curve = DiscountCurve(node_months, solved, method)
+        if converged:
+            return curve
+    raise ValueError("The monotone cubic bootstrap did not converge; check the quotes for inconsistencies.")
@@ -0,0 +1,179 @@
+import os
+
+import numpy as np
+
+
+DAY_COUNT_CONVENTIONS = ("ACT/360", "ACT/365F", "30/360", "ACT/ACT")
+ROLL_CONVENTIONS = ("unadjusted", "following", "preceding", "modified_following")
+DEFAULT_WEEKMASK = "1111100"
+DEFAULT_CALENDAR_DIR = os.environ.get(
+    "QULAB_CALENDAR_DIR", os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "calendars")
+)
+# Days added either side of the requested dates when the business-day index is (re)built
+INDEX_PADDING_DAYS = 366
+
+
+def to_dates(values):
+    """Coerce dates, strings or datetime64 values to a datetime64[D] array."""
+    return np.asarray(values, dtype="datetime64[D]")
+
+
+def _year_month_day(dates):
+    months = dates.astype("datetime64[M]")
+    year = dates.astype("datetime64[Y]").astype(np.int64) + 1970
+    month = months.astype(np.int64) % 12 + 1
+    day = (dates - months.astype("datetime64[D]")).astype(np.int64) + 1
+    return year, month, day
+
+
+def add_months(dates, months):
+    """Shift dates by whole months, clipping to the end of shorter months (Jan 31 + 1M = Feb 28/29)."""
+    dates = to_dates(dates)
+    months = np.asarray(months, dtype=np.int64)
+    month_start = dates.astype("datetime64[M]")
+    day_offset = (dates - month_start.astype("datetime64[D]")).astype(np.int64)
+    target = month_start + months
+    month_length = ((target + 1).astype("datetime64[D]") - target.astype("datetime64[D]")).astype(np.int64)
+    return target.astype("datetime64[D]") + np.minimum(day_offset, month_length - 1)
+
+
+def year_fraction(start_dates, end_dates, convention="ACT/360"):
+    """Accrual year fraction between dates under a day count convention, vectorized.
+
+    Supports ACT/360, ACT/365F, 30/360 (ISDA bond basis) and ACT/ACT (ISDA, days in
+    each calendar year over that year's length).
+    """
+    start_dates = to_dates(start_dates)
+    end_dates = to_dates(end_dates)
+    if convention == "ACT/360":
+        return (end_dates - start_dates).astype(np.int64) / 360.0
+    if convention == "ACT/365F":
+        return (end_dates - start_dates).astype(np.int64) / 365.0
+    if convention == "30/360":
+        y1, m1, d1 = _year_month_day(start_dates)
+        y2, m2, d2 = _year_month_day(end_dates)
+        d1 = np.minimum(d1, 30)
+        d2 = np.where((d2 == 31) & (d1 == 30), 30, d2)
+        return (360 * (y2 - y1) + 30 * (m2 - m1) + (d2 - d1)) / 360.0
+    if convention == "ACT/ACT":
+        y1 = start_dates.astype("datetime64[Y]")
+        y2 = end_dates.astype("datetime64[Y]")
+        y1_length = ((y1 + 1).astype("datetime64[D]") - y1.astype("datetime64[D]")).astype(np.int64)
+        y2_length = ((y2 + 1).astype("datetime64[D]") - y2.astype("datetime64[D]")).astype(np.int64)
+        # Remainder of the first year + whole years between + elapsed part of the last year;
+        # collapses to days / year length when both dates fall in the same year.
+        head = ((y1 + 1).astype("datetime64[D]") - start_dates).astype(np.int64) / y1_length
+        tail = (end_dates - y2.astype("datetime64[D]")).astype(np.int64) / y2_length
+        return head + (y2 - y1).astype(np.int64) - 1 + tail
+    raise ValueError(f"Unknown day count convention: {convention}. Choose one of {', '.join(DAY_COUNT_CONVENTIONS)}.")
+
+
+def actual_over_basis(start_dates, end_dates, days_in_year_basis):
+    """Actual days over an arbitrary day basis, e.g. a blotter's days_in_year_basis column."""
+    days = (to_dates(end_dates) - to_dates(start_dates)).astype(np.int64)
+    return days / np.asarray(days_in_year_basis, dtype=np.float64)
+
+
+class BusinessDayCalendar:
+    """Weekends plus a holiday list, with a precomputed index for bulk date rolls.
+
+    The index maps every day in a covered range to the nearest business day on or after
+    it and on or before it, so rolling millions of dates is two array lookups rather
+    than a per-date search. The range grows automatically when dates fall outside it.
+    """
+
+    def __init__(self, holidays=(), weekmask=DEFAULT_WEEKMASK, name=None):
+        self.holidays = np.unique(to_dates(list(holidays)))
+        self.weekmask = weekmask
+        self.name = name
+        self._busdaycalendar = np.busdaycalendar(weekmask=weekmask, holidays=self.holidays)
+        # (origin, end, rolled day offsets per convention). Instances are shared across
+        # Streamlit sessions, so a rebuilt index is published with one assignment and
+        # each roll reads a single consistent snapshot.
+        self._index = None
+
+    def _build_index(self, first, last, index):
+        if index is not None:
+            origin, end, _ = index
+            first = min(first, origin + INDEX_PADDING_DAYS)
+            last = max(last, end - INDEX_PADDING_DAYS)
+        first = first - INDEX_PADDING_DAYS
+        last = last + INDEX_PADDING_DAYS
+        days = np.arange(first, last + 1, dtype="datetime64[D]")
+        business = np.flatnonzero(np.is_busday(days, busdaycal=self._busdaycalendar))
+        if len(business) == 0:
+            raise ValueError("The calendar has no business days in the requested range.")
+        offsets = np.arange(len(days))
+        # Days beyond the first/last business day of the padded range clip to it
+        following = business[np.minimum(np.searchsorted(business, offsets), len(business) - 1)]
+        preceding = business[np.maximum(np.searchsorted(business, offsets, side="right") - 1, 0)]
+        # Modified following: roll forward unless that crosses into the next month
+        months = days.astype("datetime64[M]")
+        crossed = months[following] != months
+        index = (first, last, {
+            "following": following,
+            "preceding": preceding,
+            "modified_following": np.where(crossed, preceding, following),
+        })
+        self._index = index
+        return index
+
+    def is_business_day(self, dates):
+        return np.is_busday(to_dates(dates), busdaycal=self._busdaycalendar)
+
+    def roll(self, dates, convention="modified_following"):
+        """Adjust dates that fall on weekends or holidays."""
+        dates = to_dates(dates)
+        if convention == "unadjusted" or dates.size == 0:
+            return dates
+        if convention not in ROLL_CONVENTIONS:
+            raise ValueError(f"Unknown roll convention: {convention}. Choose one of {', '.join(ROLL_CONVENTIONS)}.")
+        first, last = dates.min(), dates.max()
+        index = self._index
+        if index is None or first < index[0] or last > index[1]:
+            index = self._build_index(first, last, index)
+        origin, _, rolled = index
+        return origin + rolled[convention][(dates - origin).astype(np.int64)]
+
+
+def load_holiday_calendar(path, weekmask=DEFAULT_WEEKMASK):
+    """Read a holiday file: one ISO date per line (extra comma-separated fields and # comments ignored)."""
+    holidays = []
+    with open(path) as f:
+        for line in f:
+            line = line.split("#", 1)[0].strip()
+            if line:
+                holidays.append(line.split(",", 1)[0].strip())
+    try:
+        holidays = to_dates(holidays)
+    except ValueError as e:
+        raise ValueError(f"Invalid date in holiday calendar {path}: {e}") from e
+    name = os.path.splitext(os.path.basename(path))[0]
+    return BusinessDayCalendar(holidays, weekmask, name)
+
+
+def available_calendars(directory=DEFAULT_CALENDAR_DIR):
+    """Holiday calendar files in `directory`, as {name: path}."""
+    if not os.path.isdir(directory):
+        return {}
+    return {
+        os.path.splitext(entry)[0]: os.path.join(directory, entry)
+        for entry in sorted(os.listdir(directory))
+        if entry.endswith((".txt", ".csv"))
+    }
+
+
+def accrual_dates(trade_dates, start_period, end_period, calendar=None, roll="modified_following"):
+    """Accrual start and end dates A and B months after the trade dates, rolled on `calendar`."""
+    trade_dates = to_dates(trade_dates)
+    start_dates = add_months(trade_dates, start_period)
+    end_dates = add_months(trade_dates, end_period)
+    if calendar is None:
+        calendar = BusinessDayCalendar()
+    return calendar.roll(start_dates, roll), calendar.roll(end_dates, roll)
+
+
+def accrual_fractions(trade_dates, start_period, end_period, convention="ACT/360", calendar=None, roll="modified_following"):
+    """Day-count period fractions for a whole book of FRAs in one pass."""
+    start_dates, end_dates = accrual_dates(trade_dates, start_period, end_period, calendar, roll)
+    return year_fraction(start_dates, end_dates, convention)
@@ -0,0 +1,97 @@
+import numpy as np
+from typing import NamedTuple
+
+
+MONTHS_PER_YEAR = 12
+
+
+class FRASettlement(NamedTuple):
+    period_fraction: np.ndarray
+    fixed_interest_payment: np.ndarray
+    floating_interest_payment: np.ndarray
+    net_payment_at_maturity: np.ndarray
+    discount_factor: np.ndarray
+    cash_settlement_pv: np.ndarray
+
+
+def period_fraction(start_period, end_period):
+    """Year fraction of the FRA interest period, (B - A) / 12 with A and B in months."""
+    start_period = np.asarray(start_period, dtype=np.float64)
+    end_period = np.asarray(end_period, dtype=np.float64)
+    return (end_period - start_period) / MONTHS_PER_YEAR
+
+
+def valid_terms(start_period, end_period, days_in_year_basis=360):
+    """Boolean mask of contracts satisfying the simulator's input constraints."""
+    start_period = np.asarray(start_period)
+    end_period = np.asarray(end_period)
+    days_in_year_basis = np.asarray(days_in_year_basis)
+    return (end_period > start_period) & (days_in_year_basis > 0)
+
+
+def settle_fra(notional_principal, fixed_rate, start_period, end_period, market_reference_rate, year_fraction=None):
+    """Settle one or many FRAs in a single vectorized pass.
+
+    All arguments broadcast against each other, so a scalar MRR can be applied to a
+    whole book. Contracts whose discount factor is zero or negative get a NaN cash
+    settlement instead of raising. `year_fraction`, if given, replaces the (B - A) / 12
+    period fraction, e.g. with a date-based day count from `pricing.daycount`.
+    """
+    notional_principal = np.asarray(notional_principal, dtype=np.float64)
+    fixed_rate = np.asarray(fixed_rate, dtype=np.float64)
+    market_reference_rate = np.asarray(market_reference_rate, dtype=np.float64)
+
+    if year_fraction is None:
+        pf = period_fraction(start_period, end_period)
+    else:
+        pf = np.asarray(year_fraction, dtype=np.float64)
+    accrual = notional_principal * pf
+    fixed_interest_payment = accrual * fixed_rate
+    floating_interest_payment = accrual * market_reference_rate
+    net_payment_at_maturity = floating_interest_payment - fixed_interest_payment
+
+    discount_factor = market_reference_rate * pf
+    discount_factor += 1.0
+    with np.errstate(divide="ignore", invalid="ignore"):
+        cash_settlement_pv = np.where(
+            discount_factor > 0, net_payment_at_maturity / discount_factor, np.nan
+        )
+
+    return FRASettlement(
+        pf,
+        fixed_interest_payment,
+        floating_interest_payment,
+        net_payment_at_maturity,
+        discount_factor,
+        cash_settlement_pv,
+    )
+
+
+def cash_settlement_pv(notional_principal, fixed_rate, start_period, end_period, market_reference_rate, year_fraction=None):
+    """Cash settlement PV only, with fewer temporaries than `settle_fra` for large books."""
+    notional_principal = np.asarray(notional_principal, dtype=np.float64)
+    fixed_rate = np.asarray(fixed_rate, dtype=np.float64)
+    market_reference_rate = np.asarray(market_reference_rate, dtype=np.float64)
+
+    if year_fraction is None:
+        pf = period_fraction(start_period, end_period)
+    else:
+        pf = np.asarray(year_fraction, dtype=np.float64)
+    shape = np.broadcast_shapes(
+        notional_principal.shape, fixed_rate.shape, market_reference_rate.shape, pf.shape
+    )
+
+    # Net payment = N * pf * (MRR - IFR); discount factor = 1 + MRR * pf
+    pv = np.empty(shape)
+    np.subtract(market_reference_rate, fixed_rate, out=pv)
+    pv *= notional_principal
+    pv *= pf
+
+    discount_factor = np.empty(shape)
+    np.multiply(market_reference_rate, pf, out=discount_factor)
+    discount_factor += 1.0
+
+    invalid = discount_factor <= 0
+    np.divide(pv, discount_factor, out=pv, where=~invalid)
+    pv[invalid] = np.nan
+    return pv
@@ -0,0 +1,247 @@
+import hashlib
+from collections import OrderedDict
+from typing import NamedTuple
+
+import numpy as np
+
+from pricing.blotter import DEFAULT_CHUNKSIZE, validated_blotter_chunks
+from pricing.fra import period_fraction as months_fraction
+from pricing.store import TradeStore, is_trade_store
+
+
+# Valuations kept per book, least recently used first out
+MAX_CACHED_VALUATIONS = 256
+
+
+class BookValuation(NamedTuple):
+    trades: int
+    total_net_payment: float
+    total_cash_settlement_pv: float
+
+
+def fingerprint(*arrays):
+    """Stable digest of array contents, used as a cache key for derived results.
+
+    Contiguous arrays, including memory-mapped store columns, are hashed through their
+    buffer without a copy.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for array in arrays:
+        array = np.ascontiguousarray(array)
+        digest.update(str((array.dtype.str, array.shape)).encode())
+        digest.update(memoryview(array).cast("B"))
+    return digest.hexdigest()
+
+
+def _adopt(values):
+    """Float64 copy of writable inputs.
+
+    Read-only arrays (e.g. memory-mapped trade stores) are used as they are and only
+    copied when a trade is edited.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    return values if not values.flags.writeable else values.copy()
+
+
+class IncrementalBook:
+    """An FRA book that revalues incrementally as market inputs or single trades change.
+
+    The market-independent terms of each trade (period fraction tau, accrual N * tau and
+    fixed leg N * IFR * tau) are computed once, when the book is loaded. With PV = (MRR * accrual - fixed_leg) / (1 + MRR * tau), a market move only
+    recomputes the MRR-dependent part:
+
+    - a single book-wide MRR needs just the accrual and fixed-leg sums per distinct tau,
+      so revaluation costs O(number of distinct tenors) rather than O(trades);
+    - a per-trade MRR array reuses the cached legs in one vectorized pass.
+
+    Editing one trade adjusts the per-tenor sums and the cached totals by the trade's
+    old and new contributions, without a pass over the book. The last
+    `MAX_CACHED_VALUATIONS` valuations are cached by market fingerprint, so returning
+    to a recent MRR is free.
+    """
+
+    def __init__(self, notional_principal, fixed_rate, start_period, end_period, period_fraction=None, dated=False):
+        self.notional_principal = _adopt(notional_principal)
+        self.fixed_rate = _adopt(fixed_rate)
+        self.start_period = _adopt(start_period)
+        self.end_period = _adopt(end_period)
+
+        # Fractions measured between rolled accrual dates depend on each trade's date, day
+        # count and calendar, which the book does not keep, so A and B are fixed for them
+        self.dated = dated
+        # Market-independent legs, computed once per set of terms
+        if period_fraction is None:
+            self.tau = months_fraction(self.start_period, self.end_period)
+        else:
+            self.tau = _adopt(period_fraction)
+        self.accrual = self.notional_principal * self.tau
+        self.fixed_leg = self.accrual * self.fixed_rate
+
+        # Per-tenor sums for book-wide MRR revaluation
+        self._tenors, self._tenor_index = np.unique(self.tau, return_inverse=True)
+        self._tenor_slot = {t: i for i, t in enumerate(self._tenors.tolist())}
+        self._accrual_by_tenor = np.bincount(self._tenor_index, weights=self.accrual, minlength=len(self._tenors))
+        self._fixed_by_tenor = np.bincount(self._tenor_index, weights=self.fixed_leg, minlength=len(self._tenors))
+
+        self._valuations = OrderedDict()
+        self.stats = {"full_revaluations": 0, "tenor_revaluations": 0, "cache_hits": 0, "trade_edits": 0}
+
+    def __len__(self):
+        return len(self.tau)
+
+    def _market_key(self, market_reference_rate):
+        if np.ndim(market_reference_rate) == 0:
+            return ("scalar", float(market_reference_rate))
+        return ("array", fingerprint(np.asarray(market_reference_rate, dtype=np.float64)))
+
+    def revalue(self, market_reference_rate):
+        """Book totals at a single MRR (scalar) or per-trade MRRs (array)."""
+        key = self._market_key(market_reference_rate)
+        cached = self._valuations.get(key)
+        if cached is not None:
+            self._valuations.move_to_end(key)
+            self.stats["cache_hits"] += 1
+            return cached
+
+        if key[0] == "scalar":
+            mrr = key[1]
+            net = mrr * self._accrual_by_tenor - self._fixed_by_tenor
+            discount_factor = 1 + mrr * self._tenors
+            pv = np.where(discount_factor > 0, net / np.where(discount_factor > 0, discount_factor, 1.0), np.nan)
+            self.stats["tenor_revaluations"] += 1
+        else:
+            net, pv = self.trade_values(market_reference_rate)
+            self.stats["full_revaluations"] += 1
+
+        valuation = BookValuation(len(self), float(net.sum()), float(pv.sum()))
+        self._valuations[key] = valuation
+        if len(self._valuations) > MAX_CACHED_VALUATIONS:
+            self._valuations.popitem(last=False)
+        return valuation
+
+    def trade_values(self, market_reference_rate):
+        """Per-trade net payment and cash settlement PV from the cached legs."""
+        mrr = np.asarray(market_reference_rate, dtype=np.float64)
+        net = mrr * self.accrual - self.fixed_leg
+        discount_factor = 1 + mrr * self.tau
+        with np.errstate(divide="ignore", invalid="ignore"):
+            pv = np.where(discount_factor > 0, net / discount_factor, np.nan)
+        return net, pv
+
+    def _tenor(self, tau):
+        slot = self._tenor_slot.get(tau)
+        if slot is None:
+            slot = len(self._tenors)
+            self._tenor_slot[tau] = slot
+            self._tenors = np.append(self._tenors, tau)
+            self._accrual_by_tenor = np.append(self._accrual_by_tenor, 0.0)
+            self._fixed_by_tenor = np.append(self._fixed_by_tenor, 0.0)
+        return slot
+
+    def update_trade(self, i, notional_principal=None, fixed_rate=None, start_period=None, end_period=None):
+        """Edit trade `i` in place and adjust tenor sums and cached scalar-MRR totals by delta.
+
+        Changing A or B re-derives the trade's period fraction as (B - A) / 12, so it is
+        refused for `dated` books, whose fractions come from a day-count convention. The
+        new terms are validated before anything is written, so a rejected edit leaves
+        the book as it was.
+        """
+        old_tau, old_accrual, old_fixed = float(self.tau[i]), float(self.accrual[i]), float(self.fixed_leg[i])
+        terms = {
+            "notional_principal": self.notional_principal[i] if notional_principal is None else notional_principal,
+            "fixed_rate": self.fixed_rate[i] if fixed_rate is None else fixed_rate,
+            "start_period": self.start_period[i] if start_period is None else start_period,
+            "end_period": self.end_period[i] if end_period is None else end_period,
+        }
+        terms = {name: float(value) for name, value in terms.items()}
+        if not np.all(np.isfinite(list(terms.values()))):
+            raise ValueError("Trade terms must be finite numbers.")
+        if terms["end_period"] <= terms["start_period"]:
+            raise ValueError("End Period (B) must be greater than Start Period (A).")
+
+        tau = old_tau
+        if terms["start_period"] != self.start_period[i] or terms["end_period"] != self.end_period[i]:
+            if self.dated:
+                raise ValueError(
+                    "This book's period fractions come from trade dates and a day-count convention, so Start Period (A) "
+                    "and End Period (B) cannot be edited here. Change the dates in the blotter and reload it."
+                )
+            tau = float(months_fraction(terms["start_period"], terms["end_period"]))
+        accrual = terms["notional_principal"] * tau
+        fixed = accrual * terms["fixed_rate"]
+
+        for name in ("notional_principal", "fixed_rate", "start_period", "end_period", "tau"):
+            if not getattr(self, name).flags.writeable:
+                setattr(self, name, getattr(self, name).copy())
+        for name, value in terms.items():
+            getattr(self, name)[i] = value
+        self.tau[i], self.accrual[i], self.fixed_leg[i] = tau, accrual, fixed
+
+        old_slot = self._tenor_slot[float(old_tau)]
+        self._accrual_by_tenor[old_slot] -= old_accrual
+        self._fixed_by_tenor[old_slot] -= old_fixed
+        new_slot = self._tenor(tau)
+        self._accrual_by_tenor[new_slot] += accrual
+        self._fixed_by_tenor[new_slot] += fixed
+
+        # Scalar-MRR valuations update by the trade's change in contribution; per-trade
+        # market arrays are keyed by content and are simply dropped.
+        updated = OrderedDict()
+        for key, valuation in self._valuations.items():
+            if key[0] != "scalar":
+                continue
+            mrr = key[1]
+            old_net = mrr * old_accrual - old_fixed
+            new_net = mrr * accrual - fixed
+            old_pv = old_net / (1 + mrr * old_tau)
+            new_pv = new_net / (1 + mrr * tau)
+            updated[key] = BookValuation(
+                valuation.trades,
+                float(valuation.total_net_payment + new_net - old_net),
+                float(valuation.total_cash_settlement_pv + new_pv - old_pv),
+            )
+        self._valuations = updated
+        self.stats["trade_edits"] += 1
+
+
+def load_incremental_book(validated_chunks):
+    """Build an IncrementalBook from `validate_chunks` output.
+
+    Returns (book, blotter market reference rates, rejected row count).
+    """
+    import pandas as pd
+
+    frames, rejected, dated = [], 0, False
+    for terms, chunk_rejected in validated_chunks:
+        frames.append(terms)
+        rejected += chunk_rejected
+        dated = dated or bool(terms.attrs.get("dated", False))
+    terms = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(
+        columns=["notional_principal", "fixed_rate", "start_period", "end_period", "market_reference_rate"]
+    )
+    book = IncrementalBook(
+        terms["notional_principal"].to_numpy(dtype=np.float64),
+        terms["fixed_rate"].to_numpy(dtype=np.float64),
+        terms["start_period"].to_numpy(dtype=np.float64),
+        terms["end_period"].to_numpy(dtype=np.float64),
+        terms["period_fraction"].to_numpy(dtype=np.float64) if "period_fraction" in terms else None,
+        dated,
+    )
+    return book, terms["market_reference_rate"].to_numpy(dtype=np.float64), rejected
+
+
+def load_book(source, chunksize=DEFAULT_CHUNKSIZE, calendar=None):
+    """`load_incremental_book` for any blotter source; trade stores are mapped without copying."""
+    if is_trade_store(source):
+        source = TradeStore(source)
+    if isinstance(source, TradeStore):
+        book = IncrementalBook(
+            source["notional_principal"],
+            source["fixed_rate"],
+            source["start_period"],
+            source["end_period"],
+            source["period_fraction"],
+            source.dated,
+        )
+        return book, source["market_reference_rate"], source.rejected
+    return load_incremental_book(validated_blotter_chunks(source, chunksize, calendar=calendar))
@@ -0,0 +1,226 @@
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+
+import numpy as np
+
+from pricing.curve import DiscountCurve
+from pricing.fra import MONTHS_PER_YEAR, cash_settlement_pv
+
+
+DEFAULT_BLOCK_SIZE = 1_000_000
+DEFAULT_SHARD_PATHS = 4_000_000
+DEFAULT_HISTOGRAM_BINS = 20_000
+# Histogram range, in standard deviations of the short rate at settlement
+_HISTOGRAM_SPAN = 9.0
+# Pool workers start from a fresh interpreter rather than a fork of the caller, which
+# under Streamlit is a multithreaded server whose locks a fork could copy mid-use.
+POOL_START_METHOD = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+
+
+def _b(a, tau):
+    return (1 - np.exp(-a * tau)) / a
+
+
+@dataclass(frozen=True)
+class VasicekModel:
+    """dr = a (b - r) dt + sigma dW, starting from r0. Rates are annualized decimals."""
+    a: float
+    b: float
+    sigma: float
+    r0: float
+
+    def affine_term_rate(self, start_months, end_months):
+        """Moments of r(A) and coefficients of P(A, B) = exp(log_a - b_tau * r(A))."""
+        t = start_months / MONTHS_PER_YEAR
+        tau = (end_months - start_months) / MONTHS_PER_YEAR
+        a, b, sigma = self.a, self.b, self.sigma
+
+        r_mean = b + (self.r0 - b) * np.exp(-a * t)
+        r_std = sigma * np.sqrt((1 - np.exp(-2 * a * t)) / (2 * a))
+        b_tau = _b(a, tau)
+        log_a = (b - sigma ** 2 / (2 * a ** 2)) * (b_tau - tau) - sigma ** 2 * b_tau ** 2 / (4 * a)
+        return r_mean, r_std, log_a, b_tau
+
+
+@dataclass(frozen=True)
+class HullWhiteModel:
+    """One-factor Hull-White, dr = (theta(t) - a r) dt + sigma dW, fitted to `curve`."""
+    a: float
+    sigma: float
+    curve: DiscountCurve
+
+    def _instantaneous_forward(self, months, bump_months=1e-3):
+        lo = max(months - bump_months, 0.0)
+        hi = months + bump_months
+        log_df = np.log(self.curve.discount_factor([lo, hi]))
+        return -(log_df[1] - log_df[0]) / ((hi - lo) / MONTHS_PER_YEAR)
+
+    def affine_term_rate(self, start_months, end_months):
+        """Moments of r(A) and coefficients of P(A, B) = exp(log_a - b_tau * r(A))."""
+        t = start_months / MONTHS_PER_YEAR
+        tau = (end_months - start_months) / MONTHS_PER_YEAR
+        a, sigma = self.a, self.sigma
+
+        forward = self._instantaneous_forward(start_months)
+        r_mean = forward + sigma ** 2 / (2 * a ** 2) * (1 - np.exp(-a * t)) ** 2
+        r_std = sigma * np.sqrt((1 - np.exp(-2 * a * t)) / (2 * a))
+        b_tau = _b(a, tau)
+        df_start, df_end = self.curve.discount_factor([start_months, end_months])
+        log_a = (np.log(df_end / df_start) + b_tau * forward
+                 - sigma ** 2 / (4 * a) * (1 - np.exp(-2 * a * t)) * b_tau ** 2)
+        return r_mean, r_std, log_a, b_tau
+
+
+class SettlementStats:
+    """Streaming summary of simulated cash settlements.
+
+    Holds only moments, extremes and a fixed-bin histogram, so memory does not grow
+    with the number of paths. Instances from different shards combine with `merge`.
+    """
+
+    def __init__(self, edges):
+        self.edges = np.asarray(edges, dtype=np.float64)
+        self.counts = np.zeros(len(self.edges) - 1, dtype=np.int64)
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self.minimum = np.inf
+        self.maximum = -np.inf
+        self.positive = 0
+
+    def update(self, values):
+        n = values.size
+        if n == 0:
+            return
+        block_mean = float(values.mean())
+        block_m2 = float(np.square(values - block_mean).sum())
+        self._combine(n, block_mean, block_m2)
+        self.minimum = min(self.minimum, float(values.min()))
+        self.maximum = max(self.maximum, float(values.max()))
+        self.positive += int(np.count_nonzero(values > 0))
+        clipped = np.clip(values, self.edges[0], self.edges[-1])
+        self.counts += np.histogram(clipped, bins=self.edges)[0]
+
+    def merge(self, other):
+        self._combine(other.count, other.mean, other._m2)
+        self.minimum = min(self.minimum, other.minimum)
+        self.maximum = max(self.maximum, other.maximum)
+        self.positive += other.positive
+        self.counts += other.counts
+        return self
+
+    def _combine(self, n, mean, m2):
+        # Chan et al. parallel update of mean and sum of squared deviations
+        total = self.count + n
+        if total == 0:
+            return
+        delta = mean - self.mean
+        self.mean += delta * n / total
+        self._m2 += m2 + delta ** 2 * self.count * n / total
+        self.count = total
+
+    @property
+    def std(self):
+        return float(np.sqrt(self._m2 / (self.count - 1))) if self.count > 1 else 0.0
+
+    @property
+    def probability_positive(self):
+        return self.positive / self.count if self.count else np.nan
+
+    def percentile(self, q):
+        """Percentile(s) interpolated within histogram bins; `q` in [0, 100]."""
+        q = np.asarray(q, dtype=np.float64)
+        cumulative = np.cumsum(self.counts)
+        target = q / 100 * self.count
+        i = np.clip(np.searchsorted(cumulative, target, side="left"), 0, len(self.counts) - 1)
+        below = np.where(i > 0, cumulative[i - 1], 0)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            frac = np.where(self.counts[i] > 0, (target - below) / self.counts[i], 0.0)
+        values = self.edges[i] + frac * (self.edges[i + 1] - self.edges[i])
+        return np.clip(values, self.minimum, self.maximum)
+
+
+def process_pool(workers):
+    """A `ProcessPoolExecutor` whose workers are started with `POOL_START_METHOD`."""
+    return ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context(POOL_START_METHOD))
+
+
+def _accrual_fraction(start_period, end_period, year_fraction):
+    return (end_period - start_period) / MONTHS_PER_YEAR if year_fraction is None else year_fraction
+
+
+def _histogram_edges(model, notional_principal, fixed_rate, start_period, end_period, bins, year_fraction=None):
+    r_mean, r_std, log_a, b_tau = model.affine_term_rate(start_period, end_period)
+    tau = _accrual_fraction(start_period, end_period, year_fraction)
+    # PV is increasing in r, so the short-rate bounds map straight to PV bounds
+    r = np.array([r_mean - _HISTOGRAM_SPAN * r_std, r_mean + _HISTOGRAM_SPAN * r_std])
+    mrr = (np.exp(b_tau * r - log_a) - 1) / tau
+    lo, hi = cash_settlement_pv(notional_principal, fixed_rate, start_period, end_period, mrr, year_fraction)
+    if not hi > lo:
+        lo, hi = lo - 1.0, hi + 1.0
+    return np.linspace(lo, hi, bins + 1)
+
+
+def _simulate_shard(model, notional_principal, fixed_rate, start_period, end_period,
+                    n_paths, block_size, seed, edges, year_fraction=None):
+    rng = np.random.default_rng(seed)
+    r_mean, r_std, log_a, b_tau = model.affine_term_rate(start_period, end_period)
+    tau = _accrual_fraction(start_period, end_period, year_fraction)
+    stats = SettlementStats(edges)
+
+    remaining = n_paths
+    while remaining > 0:
+        n = min(block_size, remaining)
+        # r(A) is Gaussian in both models, so each path is one exact draw at settlement
+        rate = rng.standard_normal(n)
+        rate *= r_std
+        rate += r_mean
+        # MRR_{B-A} = (1 / P(A, B) - 1) / tau
+        rate *= b_tau
+        rate -= log_a
+        np.exp(rate, out=rate)
+        rate -= 1
+        rate /= tau
+        stats.update(cash_settlement_pv(notional_principal, fixed_rate, start_period, end_period, rate, year_fraction))
+        remaining -= n
+    return stats
+
+
+def simulate_settlement(model, notional_principal, fixed_rate, start_period, end_period,
+                        n_paths, seed=None, workers=None, block_size=DEFAULT_BLOCK_SIZE,
+                        shard_paths=DEFAULT_SHARD_PATHS, bins=DEFAULT_HISTOGRAM_BINS, year_fraction=None):
+    """Simulate the FRA cash settlement (PV at the settlement date) under `model`.
+
+    Paths are split into shards of `shard_paths`, each with its own child of
+    `SeedSequence(seed)`, and shards run on a `ProcessPoolExecutor` with `workers`
+    processes (all cores by default; 1 runs in-process). Because seeds belong to
+    shards rather than workers, results do not depend on the worker count.
+    Returns the merged `SettlementStats`.
+    """
+    if end_period <= start_period:
+        raise ValueError("End Period (B) must be greater than Start Period (A).")
+    if n_paths <= 0:
+        raise ValueError("Number of paths must be positive.")
+
+    edges = _histogram_edges(model, notional_principal, fixed_rate, start_period, end_period, bins, year_fraction)
+    n_shards = -(-n_paths // shard_paths)
+    shard_sizes = [shard_paths] * (n_shards - 1) + [n_paths - shard_paths * (n_shards - 1)]
+    seeds = np.random.SeedSequence(seed).spawn(n_shards)
+    args = [
+        (model, notional_principal, fixed_rate, start_period, end_period, size, block_size, s, edges, year_fraction)
+        for size, s in zip(shard_sizes, seeds)
+    ]
+
+    workers = min(workers or os.cpu_count() or 1, n_shards)
+    if workers == 1:
+        shards = [_simulate_shard(*a) for a in args]
+    else:
+        with process_pool(workers) as pool:
+            shards = list(pool.map(_simulate_shard, *zip(*args)))
+
+    stats = SettlementStats(edges)
+    for shard in shards:
+        stats.merge(shard)
+    return stats
@@ -0,0 +1,199 @@
+import os
+from multiprocessing import shared_memory
+from typing import NamedTuple
+
+import numpy as np
+
+from pricing.blotter import DEFAULT_CHUNKSIZE, BlotterTotals, count_blotter_rows, validated_blotter_chunks
+from pricing.monte_carlo import process_pool
+from pricing.risk import DEFAULT_BUCKET_EDGES, RiskLadderBuilder, fra_risk
+from pricing.store import TradeStore, is_trade_store
+
+
+SHARED_COLUMNS = ("notional_principal", "fixed_rate", "start_period", "end_period", "market_reference_rate", "period_fraction")
+# Worker processes used by the app pages unless changed in the sidebar
+DEFAULT_WORKERS = int(os.environ.get("QULAB_VALUATION_WORKERS", "1"))
+DEFAULT_SHARD_TRADES = 1_000_000
+# Trades evaluated at once inside a shard, bounding each worker's temporaries
+DEFAULT_BLOCK_TRADES = 250_000
+
+
+class ShardResult(NamedTuple):
+    trades: int
+    total_net_payment: float
+    total_cash_settlement_pv: float
+    ladder: RiskLadderBuilder
+
+
+class SharedBook:
+    """FRA book columns in one `multiprocessing.shared_memory` block.
+
+    Worker processes attach by name and view the columns in place, so trade data is
+    never pickled. The block holds `capacity` trades per column, of which the first
+    `trades` are in use; `append` fills it chunk by chunk and only reallocates when
+    it runs out of room. Use as a context manager; the block is unlinked on exit.
+    """
+
+    def __init__(self, trades, capacity=None):
+        self.trades = trades
+        self.capacity = max(trades, capacity or 0)
+        self._allocate(self.capacity)
+
+    def _allocate(self, capacity):
+        self.capacity = capacity
+        self.block = shared_memory.SharedMemory(create=True, size=max(capacity * len(SHARED_COLUMNS) * 8, 1))
+        self._data = _shared_array(self.block.buf, capacity)
+
+    @property
+    def columns(self):
+        return _column_views(self._data, self.trades)
+
+    def append(self, terms):
+        """Copy the SHARED_COLUMNS of a validated chunk after the trades already held."""
+        start, stop = self.trades, self.trades + len(terms)
+        if stop > self.capacity:
+            old_block, old_data = self.block, self._data
+            self._allocate(max(stop, 2 * self.capacity))
+            self._data[:, :start] = old_data[:, :start]
+            del old_data
+            old_block.close()
+            old_block.unlink()
+        for row, name in enumerate(SHARED_COLUMNS):
+            self._data[row, start:stop] = terms[name].to_numpy(dtype=np.float64)
+        self.trades = stop
+
+    @classmethod
+    def from_validated_chunks(cls, validated_chunks, capacity=None):
+        """Write validated blotter chunks into shared memory as they arrive. Returns (book, rejected rows).
+
+        With `capacity` at least the number of valid trades (e.g. from
+        `count_blotter_rows`), the block is allocated once and peak memory is the book
+        plus one chunk. Shared memory pages are only committed when written, so unused
+        capacity costs address space, not memory.
+        """
+        book = cls(0, capacity)
+        rejected = 0
+        try:
+            for terms, chunk_rejected in validated_chunks:
+                book.append(terms)
+                rejected += chunk_rejected
+        except BaseException:
+            book.close()
+            raise
+        return book, rejected
+
+    @property
+    def locator(self):
+        return ("shared_memory", self.block.name, self.trades, self.capacity)
+
+    def close(self):
+        self._data = None
+        self.block.close()
+        self.block.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _shared_array(buffer, capacity):
+    return np.ndarray((len(SHARED_COLUMNS), capacity), dtype=np.float64, buffer=buffer)
+
+
+def _column_views(data, trades):
+    return {name: column[:trades] for name, column in zip(SHARED_COLUMNS, data)}
+
+
+def _open_columns(locator):
+    kind, where, trades, capacity = locator
+    if kind == "store":
+        return None, TradeStore(where).columns
+    # Pool workers share the parent's resource tracker, so attaching here does not
+    # hand the block's lifetime to the worker; the parent unlinks it.
+    block = shared_memory.SharedMemory(name=where)
+    return block, _column_views(_shared_array(block.buf, capacity), trades)
+
+
+def _value_columns(columns, start, stop, market_reference_rate, edges, block_trades):
+    ladder = RiskLadderBuilder(edges)
+    total_net_payment = total_cash_settlement_pv = 0.0
+    for lo in range(start, stop, block_trades):
+        trades = slice(lo, min(lo + block_trades, stop))
+        notional_principal = columns["notional_principal"][trades]
+        fixed_rate = columns["fixed_rate"][trades]
+        start_period = columns["start_period"][trades]
+        mrr = columns["market_reference_rate"][trades] if market_reference_rate is None else market_reference_rate
+        tau = columns["period_fraction"][trades]
+        risk = fra_risk(notional_principal, fixed_rate, start_period, columns["end_period"][trades], mrr, tau)
+        ladder.add(start_period, risk)
+        total_net_payment += float(np.sum(notional_principal * tau * (mrr - fixed_rate)))
+        total_cash_settlement_pv += float(np.nansum(risk.cash_settlement_pv))
+    return ShardResult(stop - start, total_net_payment, total_cash_settlement_pv, ladder)
+
+
+def _value_shard(locator, start, stop, market_reference_rate, edges, block_trades):
+    block, columns = _open_columns(locator)
+    try:
+        return _value_columns(columns, start, stop, market_reference_rate, edges, block_trades)
+    finally:
+        # Views into the block must be gone before it can be closed
+        del columns
+        if block is not None:
+            block.close()
+
+
+def value_book(book, market_reference_rate=None, workers=None, edges=DEFAULT_BUCKET_EDGES,
+               shard_trades=DEFAULT_SHARD_TRADES, block_trades=DEFAULT_BLOCK_TRADES):
+    """Settlement totals and the PV01 ladder of a `SharedBook` or `TradeStore`, across processes.
+
+    The book is cut into shards of `shard_trades` that run on a `process_pool` with
+    `workers` processes (all cores by default; 1 runs in-process). Workers map the
+    trades from shared memory, or from the store's files, and return only partial
+    aggregates, which the parent reduces in shard order. Because shards do not depend
+    on the worker count, neither do the results. Returns (BlotterTotals, RiskLadder).
+    """
+    if isinstance(book, TradeStore):
+        locator, trades, rejected = ("store", book.path, len(book), len(book)), len(book), book.rejected
+    else:
+        locator, trades, rejected = book.locator, book.trades, 0
+    bounds = [(lo, min(lo + shard_trades, trades)) for lo in range(0, trades, shard_trades)]
+    args = [(locator, lo, hi, market_reference_rate, edges, block_trades) for lo, hi in bounds]
+
+    workers = min(workers or os.cpu_count() or 1, max(len(bounds), 1))
+    if workers == 1:
+        shards = [_value_shard(*a) for a in args]
+    else:
+        with process_pool(workers) as pool:
+            shards = list(pool.map(_value_shard, *zip(*args)))
+
+    totals = BlotterTotals(rejected=rejected)
+    ladder = RiskLadderBuilder(edges)
+    for shard in shards:
+        totals.chunks += 1
+        totals.trades += shard.trades
+        totals.total_net_payment += shard.total_net_payment
+        totals.total_cash_settlement_pv += shard.total_cash_settlement_pv
+        ladder.merge(shard.ladder)
+    return totals, ladder.ladder()
+
+
+def value_blotter(source, market_reference_rate=None, workers=None, chunksize=DEFAULT_CHUNKSIZE, fmt=None,
+                  calendar=None, edges=DEFAULT_BUCKET_EDGES, shard_trades=DEFAULT_SHARD_TRADES):
+    """`value_book` for any blotter source.
+
+    Trade stores are mapped by the workers directly; other sources are parsed and
+    validated in this process and written chunk by chunk into a shared memory block
+    sized from `count_blotter_rows`.
+    """
+    if is_trade_store(source):
+        source = TradeStore(source)
+    if isinstance(source, TradeStore):
+        return value_book(source, market_reference_rate, workers, edges, shard_trades)
+    capacity = count_blotter_rows(source, fmt)
+    book, rejected = SharedBook.from_validated_chunks(validated_blotter_chunks(source, chunksize, fmt, calendar), capacity)
+    with book:
+        totals, ladder = value_book(book, market_reference_rate, workers, edges, shard_trades)
+    totals.rejected += rejected
+    return totals, ladder
@@ -0,0 +1,134 @@
+import numpy as np
+from typing import NamedTuple
+
+from pricing.fra import period_fraction
+
+
+BASIS_POINT = 1e-4
+# Buckets by FRA start period (A), in months; the last bucket is open-ended
+DEFAULT_BUCKET_EDGES = (0, 3, 6, 9, 12, 18, 24, 36, 60, np.inf)
+
+
+class FRARisk(NamedTuple):
+    cash_settlement_pv: np.ndarray
+    pv01_mrr: np.ndarray
+    pv01_fixed_rate: np.ndarray
+
+
+class RiskLadder(NamedTuple):
+    bucket_labels: list
+    trades: np.ndarray
+    cash_settlement_pv: np.ndarray
+    pv01_mrr: np.ndarray
+    pv01_fixed_rate: np.ndarray
+
+
+def fra_risk(notional_principal, fixed_rate, start_period, end_period, market_reference_rate, year_fraction=None):
+    """Cash settlement PV and its closed-form PV01s, vectorized over a book.
+
+    With tau = (B - A) / 12 and PV = N tau (MRR - IFR) / (1 + MRR tau):
+
+        dPV/dMRR = N tau (1 + IFR tau) / (1 + MRR tau)^2
+        dPV/dIFR = -N tau / (1 + MRR tau)
+
+    PV01s are these derivatives scaled to a one basis point rise. MRR drives both the
+    floating leg and the discounting, so pv01_mrr covers both effects. `year_fraction`,
+    if given, replaces tau as in `pricing.fra.settle_fra`.
+    """
+    notional_principal = np.asarray(notional_principal, dtype=np.float64)
+    fixed_rate = np.asarray(fixed_rate, dtype=np.float64)
+    market_reference_rate = np.asarray(market_reference_rate, dtype=np.float64)
+    tau = period_fraction(start_period, end_period) if year_fraction is None else np.asarray(year_fraction, dtype=np.float64)
+
+    discount_factor = 1 + market_reference_rate * tau
+    with np.errstate(divide="ignore", invalid="ignore"):
+        valid = discount_factor > 0
+        annuity = np.where(valid, notional_principal * tau / discount_factor, np.nan)
+        pv = annuity * (market_reference_rate - fixed_rate)
+        pv01_fixed_rate = -annuity * BASIS_POINT
+        pv01_mrr = annuity * (1 + fixed_rate * tau) / discount_factor * BASIS_POINT
+    return FRARisk(pv, pv01_mrr, pv01_fixed_rate)
+
+
+def bucket_labels(edges=DEFAULT_BUCKET_EDGES):
+    labels = []
+    for lo, hi in zip(edges[:-1], edges[1:]):
+        labels.append(f"{lo:g}M+" if np.isinf(hi) else f"{lo:g}-{hi:g}M")
+    return labels
+
+
+def bucket_index(start_period, edges=DEFAULT_BUCKET_EDGES):
+    """Index of the start-period bucket each trade falls in."""
+    return np.clip(np.searchsorted(edges, start_period, side="right") - 1, 0, len(edges) - 2)
+
+
+def bucket_sums(values, start_period, edges=DEFAULT_BUCKET_EDGES):
+    """Sum `values` per start-period bucket, ignoring NaNs."""
+    values = np.asarray(values, dtype=np.float64)
+    finite = np.isfinite(values)
+    return np.bincount(
+        bucket_index(start_period, edges)[finite], weights=values[finite], minlength=len(edges) - 1
+    )
+
+
+class RiskLadderBuilder:
+    """Accumulates a bucketed risk ladder chunk by chunk, so books need not fit in memory."""
+
+    def __init__(self, edges=DEFAULT_BUCKET_EDGES):
+        self.edges = edges
+        n = len(edges) - 1
+        self.trades = np.zeros(n, dtype=np.int64)
+        self.cash_settlement_pv = np.zeros(n)
+        self.pv01_mrr = np.zeros(n)
+        self.pv01_fixed_rate = np.zeros(n)
+
+    def add(self, start_period, risk):
+        self.trades += np.bincount(bucket_index(start_period, self.edges), minlength=len(self.trades))
+        self.cash_settlement_pv += bucket_sums(risk.cash_settlement_pv, start_period, self.edges)
+        self.pv01_mrr += bucket_sums(risk.pv01_mrr, start_period, self.edges)
+        self.pv01_fixed_rate += bucket_sums(risk.pv01_fixed_rate, start_period, self.edges)
+
+    def merge(self, other):
+        """Fold in another builder's sums, e.g. from a worker process."""
+        self.trades += other.trades
+        self.cash_settlement_pv += other.cash_settlement_pv
+        self.pv01_mrr += other.pv01_mrr
+        self.pv01_fixed_rate += other.pv01_fixed_rate
+
+    def ladder(self):
+        return RiskLadder(
+            bucket_labels(self.edges), self.trades, self.cash_settlement_pv, self.pv01_mrr, self.pv01_fixed_rate
+        )
+
+
+def book_risk_ladder(validated_chunks, edges=DEFAULT_BUCKET_EDGES, market_reference_rate=None, sample_trades=1_000):
+    """Stream validated blotter chunks (see `pricing.blotter.validate_chunks`) into a risk ladder.
+
+    `market_reference_rate`, if given, replaces every trade's MRR. Returns the ladder,
+    the number of rejected rows and the first `sample_trades` trades with their risk.
+    """
+    builder = RiskLadderBuilder(edges)
+    rejected = 0
+    samples = []
+    sampled = 0
+    for terms, chunk_rejected in validated_chunks:
+        rejected += chunk_rejected
+        mrr = terms["market_reference_rate"].to_numpy() if market_reference_rate is None else market_reference_rate
+        start_period = terms["start_period"].to_numpy()
+        risk = fra_risk(
+            terms["notional_principal"].to_numpy(),
+            terms["fixed_rate"].to_numpy(),
+            start_period,
+            terms["end_period"].to_numpy(),
+            mrr,
+            terms["period_fraction"].to_numpy(),
+        )
+        builder.add(start_period, risk)
+        if sampled < sample_trades:
+            take = min(sample_trades - sampled, len(terms))
+            sample = terms.iloc[:take].copy()
+            for field in FRARisk._fields:
+                sample[field] = getattr(risk, field)[:take]
+            samples.append(sample)
+            sampled += take
+    return builder.ladder(), rejected, samples
@@ -0,0 +1,192 @@
+import os
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import NamedTuple
+
+import numpy as np
+
+from pricing.risk import BASIS_POINT
+
+
+DEFAULT_MEMORY_BUDGET_MB = 256
+DEFAULT_CONFIDENCE = 0.99
+# Bytes held per scenario x trade tile element: one float64 discount factor buffer
+_TILE_BYTES_PER_ELEMENT = 8
+_MIN_TRADE_TILE = 1_024
+
+
+class ScenarioSet(NamedTuple):
+    names: list
+    node_months: np.ndarray
+    shifts: np.ndarray
+
+
+class PnLSummary(NamedTuple):
+    scenarios: int
+    mean: float
+    worst: float
+    value_at_risk: float
+    expected_shortfall: float
+
+
+def parallel_scenarios(min_shift_bp=-200, max_shift_bp=200, count=401):
+    """The same shift at every tenor, evenly spaced between the two bounds."""
+    shifts_bp = np.linspace(min_shift_bp, max_shift_bp, count)
+    names = [f"parallel {s:+.1f}bp" for s in shifts_bp]
+    return ScenarioSet(names, np.array([0.0]), shifts_bp[:, np.newaxis] * BASIS_POINT)
+
+
+def twist_scenarios(max_shift_bp=100, count=21, short_node=0, long_node=120):
+    """Every combination of short- and long-end shifts, linear in between (count**2 scenarios)."""
+    shifts_bp = np.linspace(-max_shift_bp, max_shift_bp, count)
+    short, long = np.meshgrid(shifts_bp, shifts_bp, indexing="ij")
+    names = [f"twist {s:+.1f}/{l:+.1f}bp" for s, l in zip(short.ravel(), long.ravel())]
+    shifts = np.column_stack([short.ravel(), long.ravel()]) * BASIS_POINT
+    return ScenarioSet(names, np.array([short_node, long_node], dtype=np.float64), shifts)
+
+
+def _tenor_months(label):
+    match = re.fullmatch(r"\s*(\d+(?:\.\d+)?)\s*([MY]?)\s*", str(label), re.IGNORECASE)
+    if match is None:
+        raise ValueError(f"Cannot read a tenor from column '{label}'. Use months (6, 6M) or years (1Y).")
+    value = float(match.group(1))
+    return value * 12 if match.group(2).upper() == "Y" else value
+
+
+def load_historical_scenarios(source):
+    """Daily rate changes in basis points, one row per day and one column per tenor.
+
+    Tenor columns are labelled in months (3, 3M) or years (1Y); an optional `date`
+    column names the scenarios. Rows with missing values are skipped.
+    """
+    import pandas as pd
+
+    changes = pd.read_csv(source)
+    names = None
+    if "date" in changes.columns:
+        names = changes.pop("date").astype(str)
+    if changes.shape[1] == 0:
+        raise ValueError("The historical scenario file has no tenor columns.")
+    node_months = np.array([_tenor_months(c) for c in changes.columns])
+    order = np.argsort(node_months)
+    changes = changes.apply(pd.to_numeric, errors="coerce")
+    complete = changes.notna().all(axis=1).to_numpy()
+    shifts = changes.to_numpy(dtype=np.float64)[complete][:, order] * BASIS_POINT
+    if len(shifts) == 0:
+        raise ValueError("The historical scenario file has no complete rows.")
+    names = list(names[complete]) if names is not None else [f"day {i + 1}" for i in range(len(shifts))]
+    return ScenarioSet(names, node_months[order], shifts)
+
+
+def _interpolation_matrix(node_months, points):
+    """(nodes x points) linear interpolation weights, flat beyond the end nodes."""
+    node_months = np.asarray(node_months, dtype=np.float64)
+    weights = np.zeros((len(node_months), len(points)))
+    if len(node_months) == 1:
+        weights[0] = 1.0
+        return weights
+    points = np.clip(points, node_months[0], node_months[-1])
+    hi = np.clip(np.searchsorted(node_months, points, side="right"), 1, len(node_months) - 1)
+    lo = hi - 1
+    weight = (points - node_months[lo]) / (node_months[hi] - node_months[lo])
+    columns = np.arange(len(points))
+    weights[lo, columns] = 1 - weight
+    weights[hi, columns] += weight
+    return weights
+
+
+def _tile_bounds(n_scenarios, n_trades, workers, memory_budget_mb):
+    tile_elements = max(memory_budget_mb * 2**20 // (_TILE_BYTES_PER_ELEMENT * workers), _MIN_TRADE_TILE)
+    scenario_tile = int(min(n_scenarios, max(1, tile_elements // _MIN_TRADE_TILE)))
+    trade_tile = int(min(n_trades, max(1, tile_elements // scenario_tile)))
+    return scenario_tile, trade_tile
+
+
+def scenario_pnl(book, market_reference_rate, scenarios, workers=None, memory_budget_mb=DEFAULT_MEMORY_BUDGET_MB):
+    """Book P&L of cash settlement PV under each scenario, relative to the base market.
+
+    `book` is an `IncrementalBook`, whose cached period fractions and fixed legs are
+    reused. Each scenario shifts every trade's MRR by its shift curve interpolated at
+    the trade's start period (A). The scenario x trade matrix is never materialized:
+    it is evaluated in tiles sized so that all `workers` threads together stay within
+    `memory_budget_mb`, and NumPy releases the GIL inside each tile.
+
+    Writing PV = N - c / (1 + MRR tau) with c = N (1 + IFR tau), a tile reduces to
+    shifted discount factors (shifts @ interpolation weights * tau + base discount
+    factor) and a matrix-vector product of their reciprocals with c, both in BLAS.
+    Trades whose discount factor is not positive count as zero PV.
+    """
+    tau = book.tau
+    mrr = np.broadcast_to(np.asarray(market_reference_rate, dtype=np.float64), tau.shape)
+    shifts = np.asarray(scenarios.shifts, dtype=np.float64)
+    n_scenarios, n_trades = len(shifts), len(tau)
+    if n_scenarios == 0:
+        raise ValueError("The scenario set is empty.")
+    if n_trades == 0:
+        return np.zeros(n_scenarios)
+
+    base_discount_factor = 1 + mrr * tau
+    valued = base_discount_factor > 0
+    claim = np.where(valued, book.notional_principal + book.fixed_leg, 0.0)
+    base_total = float(np.sum(claim[valued] / base_discount_factor[valued]))
+
+    workers = max(1, workers or os.cpu_count() or 1)
+    scenario_tile, trade_tile = _tile_bounds(n_scenarios, n_trades, workers, memory_budget_mb)
+    tasks = [
+        (s, t)
+        for s in range(0, n_scenarios, scenario_tile)
+        for t in range(0, n_trades, trade_tile)
+    ]
+    buffers = threading.local()
+
+    def evaluate(task):
+        s, t = task
+        s_end, t_end = min(s + scenario_tile, n_scenarios), min(t + trade_tile, n_trades)
+        if not hasattr(buffers, "discount_factor"):
+            buffers.discount_factor = np.empty(scenario_tile * trade_tile)
+        shape = (s_end - s, t_end - t)
+        discount_factor = buffers.discount_factor[:shape[0] * shape[1]].reshape(shape)
+        trades = slice(t, t_end)
+
+        # 1 + (MRR + shift) * tau = base discount factor + shift curve at A * tau
+        weights = _interpolation_matrix(scenarios.node_months, book.start_period[trades])
+        weights *= tau[trades]
+        np.matmul(shifts[s:s_end], weights, out=discount_factor)
+        discount_factor += base_discount_factor[trades]
+        if discount_factor.min() <= 0:
+            # Zero PV means the c / DF term equals N
+            invalid = discount_factor <= 0
+            discount_factor[invalid] = np.broadcast_to(claim[trades] / book.notional_principal[trades], shape)[invalid]
+        np.reciprocal(discount_factor, out=discount_factor)
+        return s, discount_factor @ claim[trades]
+
+    totals = np.zeros(n_scenarios)
+    if workers == 1:
+        partials = map(evaluate, tasks)
+    else:
+        pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="scenarios")
+        partials = pool.map(evaluate, tasks)
+    try:
+        for s, partial in partials:
+            totals[s:s + len(partial)] += partial
+    finally:
+        if workers > 1:
+            pool.shutdown()
+    return base_total - totals
+
+
+def summarize_pnl(pnl, confidence=DEFAULT_CONFIDENCE):
+    """Historical-simulation VaR and expected shortfall, both reported as positive losses."""
+    pnl = np.asarray(pnl, dtype=np.float64)
+    if not 0 < confidence < 1:
+        raise ValueError("Confidence must be between 0 and 1.")
+    value_at_risk = -float(np.quantile(pnl, 1 - confidence))
+    tail = pnl[pnl <= -value_at_risk]
+    return PnLSummary(
+        len(pnl),
+        float(pnl.mean()),
+        float(pnl.min()),
+        value_at_risk,
+        -float(tail.mean()),
+    )
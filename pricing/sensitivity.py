@@ -0,0 +1,29 @@
+import numpy as np
+
+from pricing.fra import cash_settlement_pv
+
+
+def mrr_grid(mrr_min=0.01, mrr_max=0.10, points=100):
+    """Evenly spaced Market Reference Rates for sensitivity analysis."""
+    return np.linspace(mrr_min, mrr_max, points)
+
+
+def tenor_grid(max_tenor_months=120):
+    """Interest period lengths (B - A) in whole months, 1 to `max_tenor_months`."""
+    return np.arange(1, max_tenor_months + 1)
+
+
+def settlement_surface(notional_principal, fixed_rate, mrrs, tenor_months, start_period=0, year_fractions=None):
+    """Cash settlement PV over an MRR x tenor grid in one broadcast pass.
+
+    Returns an array of shape (len(mrrs), len(tenor_months)); row i is the
+    sensitivity curve for `mrrs[i]`, column j the contract with B - A = tenor_months[j].
+    `year_fractions`, one per tenor, replaces the (B - A) / 12 period fractions.
+    """
+    mrrs = np.asarray(mrrs, dtype=np.float64)[:, np.newaxis]
+    tenor_months = np.asarray(tenor_months)[np.newaxis, :]
+    if year_fractions is not None:
+        year_fractions = np.asarray(year_fractions, dtype=np.float64)[np.newaxis, :]
+    return cash_settlement_pv(
+        notional_principal, fixed_rate, start_period, start_period + tenor_months, mrrs, year_fractions
+    )
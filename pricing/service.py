@@ -0,0 +1,396 @@
+"""Local asynchronous HTTP service for FRA settlement and APR conversion quotes.
+
+Endpoints (JSON in, JSON out):
+
+- ``POST /fra/settle``: columns ``notional_principal``, ``fixed_rate``, ``start_period``,
+  ``end_period``, ``market_reference_rate`` as lists (or scalars for a single trade).
+  The period fraction defaults to (B - A) / 12. Either pass ``period_fraction`` (null
+  entries keep the default), or pass ``trade_date`` with an optional ``day_count``
+  (default ACT/360) and ``calendar`` (a file name in ``calendars/``; default weekends
+  only). The fraction is then measured between the accrual dates A and B months after
+  the trade date, rolled modified-following, as for dated blotters; A and B must then
+  be whole months of at most 1,200.
+- ``POST /apr/convert``: columns ``apr``, ``m``, ``n``; ``m``/``n`` may be ``"continuous"``.
+- ``GET /health``.
+
+Concurrent requests to the same endpoint are coalesced by a `MicroBatcher` into one
+vectorized call, which runs on a warm thread pool (NumPy releases the GIL, and
+threads avoid pickling request data to worker processes).
+"""
+import asyncio
+import functools
+import json
+import math
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+
+import numpy as np
+
+from pricing.apr import CONTINUOUS, convert_apr
+from pricing.daycount import DAY_COUNT_CONVENTIONS, accrual_fractions, available_calendars, load_holiday_calendar
+from pricing.fra import period_fraction, settle_fra, valid_terms
+
+
+FRA_FIELDS = ("notional_principal", "fixed_rate", "start_period", "end_period", "market_reference_rate")
+APR_FIELDS = ("apr", "m", "n")
+DEFAULT_MAX_BATCH = 100_000
+DEFAULT_MAX_WAIT_MS = 0.0
+_MAX_BODY_BYTES = 64 * 1024 * 1024
+# Dated trades further out than this (in months) are rejected before any date arithmetic
+_MAX_DATED_MONTHS = 1_200
+
+
+class RequestError(ValueError):
+    """A malformed request; reported to the client as HTTP 400."""
+
+
+def _parse_columns(payload, fields):
+    if not isinstance(payload, dict):
+        raise RequestError("Request body must be a JSON object.")
+    missing = [f for f in fields if f not in payload]
+    if missing:
+        raise RequestError(f"Missing fields: {', '.join(missing)}")
+    try:
+        columns = {f: np.atleast_1d(np.asarray(payload[f], dtype=np.float64)) for f in fields}
+        shape = np.broadcast_shapes(*(c.shape for c in columns.values()))
+    except (TypeError, ValueError) as e:
+        raise RequestError(f"Invalid field values: {e}") from e
+    if len(shape) != 1:
+        raise RequestError("Fields must be scalars or one-dimensional lists.")
+    return {f: np.broadcast_to(c, shape) for f, c in columns.items()}
+
+
+def _parse_frequency(value):
+    if isinstance(value, str) and value.lower() in ("continuous", "inf", "infinity"):
+        return CONTINUOUS
+    if isinstance(value, list):
+        return [_parse_frequency(v) for v in value]
+    return value
+
+
+@functools.lru_cache(maxsize=None)
+def _holiday_calendar(name):
+    calendars = available_calendars()
+    if name not in calendars:
+        raise RequestError(f"Unknown calendar: {name}. Available: {', '.join(calendars) or 'none'}.")
+    try:
+        return load_holiday_calendar(calendars[name])
+    except (ValueError, OSError) as e:
+        raise RequestError(f"Cannot load calendar {name}: {e}") from e
+
+
+def _dated_period_fractions(payload, columns):
+    start_period, end_period = columns["start_period"], columns["end_period"]
+    if np.any(start_period != np.round(start_period)) or np.any(end_period != np.round(end_period)):
+        raise RequestError("Dated trades need whole-month start_period and end_period.")
+    if np.any(np.abs(start_period) > _MAX_DATED_MONTHS) or np.any(np.abs(end_period) > _MAX_DATED_MONTHS):
+        raise RequestError(f"Dated trades need start_period and end_period within {_MAX_DATED_MONTHS} months.")
+    try:
+        trade_dates = np.broadcast_to(np.asarray(payload["trade_date"], dtype="datetime64[D]"), start_period.shape)
+    except (TypeError, ValueError) as e:
+        raise RequestError(f"Invalid trade_date: {e}") from e
+    try:
+        conventions = np.broadcast_to(np.asarray(payload.get("day_count", "ACT/360"), dtype=str), start_period.shape)
+    except (TypeError, ValueError) as e:
+        raise RequestError("day_count must be a string or match the length of the other fields.") from e
+    calendar = _holiday_calendar(payload["calendar"]) if payload.get("calendar") else None
+
+    fractions = np.empty(start_period.shape)
+    for convention in np.unique(conventions):
+        if convention.upper() not in DAY_COUNT_CONVENTIONS:
+            raise RequestError(f"Unknown day_count: {convention}. Expected one of {', '.join(DAY_COUNT_CONVENTIONS)}.")
+        rows = conventions == convention
+        try:
+            fractions[rows] = accrual_fractions(
+                trade_dates[rows], start_period[rows].astype(np.int64), end_period[rows].astype(np.int64),
+                convention.upper(), calendar
+            )
+        except (ValueError, IndexError, OverflowError) as e:
+            raise RequestError(f"Cannot compute accrual dates: {e}") from e
+    return fractions
+
+
+def parse_fra_request(payload):
+    columns = _parse_columns(payload, FRA_FIELDS)
+    rows = columns["notional_principal"].shape
+    if "period_fraction" in payload:
+        fractions = payload["period_fraction"]
+        if isinstance(fractions, list):
+            fractions = [np.nan if f is None else f for f in fractions]
+        fractions = _parse_columns({"period_fraction": np.nan if fractions is None else fractions}, ["period_fraction"])
+        try:
+            columns["period_fraction"] = np.broadcast_to(fractions["period_fraction"], rows)
+        except ValueError as e:
+            raise RequestError("period_fraction must match the length of the other fields.") from e
+    elif "trade_date" in payload:
+        columns["period_fraction"] = _dated_period_fractions(payload, columns)
+    else:
+        # NaN selects the default (B - A) / 12 inside the kernel
+        columns["period_fraction"] = np.full(rows, np.nan)
+    return columns
+
+
+def parse_apr_request(payload):
+    if isinstance(payload, dict):
+        payload = {k: _parse_frequency(v) if k in ("m", "n") else v for k, v in payload.items()}
+    return _parse_columns(payload, APR_FIELDS)
+
+
+def fra_kernel(columns):
+    fractions = columns["period_fraction"]
+    fractions = np.where(np.isnan(fractions), period_fraction(columns["start_period"], columns["end_period"]), fractions)
+    settlement = settle_fra(*(columns[f] for f in FRA_FIELDS), fractions)
+    valid = (valid_terms(columns["start_period"], columns["end_period"]) & (fractions > 0)
+             & np.isfinite(settlement.cash_settlement_pv))
+    results = {k: np.where(valid, v, np.nan) for k, v in settlement._asdict().items()}
+    results["valid"] = valid
+    return results
+
+
+def apr_kernel(columns):
+    return convert_apr(columns["apr"], columns["m"], columns["n"])._asdict()
+
+
+class MicroBatcher:
+    """Coalesces concurrent small requests into one vectorized kernel call.
+
+    The first queued request opens a batch window of `max_wait_ms`; everything that
+    arrives before it closes (up to `max_batch` rows) is concatenated, evaluated by
+    `kernel` on `executor`, and split back per request. With a zero window the
+    batch is whatever is already queued, so an idle service answers immediately and
+    batches form naturally under load while the previous kernel call is running.
+    """
+
+    def __init__(self, kernel, executor, max_batch=DEFAULT_MAX_BATCH, max_wait_ms=DEFAULT_MAX_WAIT_MS):
+        self.kernel = kernel
+        self.executor = executor
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000
+        self._queue = asyncio.Queue()
+        self._task = None
+        self.batches = 0
+        self.requests = 0
+
+    def start(self):
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    async def submit(self, columns):
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((columns, future))
+        return await future
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            pending = [await self._queue.get()]
+            rows = len(next(iter(pending[0][0].values())))
+            deadline = loop.time() + self.max_wait
+            # Let handlers that are ready to run enqueue before the batch is cut
+            await asyncio.sleep(0)
+            while rows < self.max_batch:
+                timeout = deadline - loop.time()
+                try:
+                    if timeout <= 0:
+                        item = self._queue.get_nowait()
+                    else:
+                        item = await asyncio.wait_for(self._queue.get(), timeout)
+                except (asyncio.QueueEmpty, asyncio.TimeoutError):
+                    break
+                pending.append(item)
+                rows += len(next(iter(item[0].values())))
+
+            try:
+                fields = pending[0][0].keys()
+                batch = {f: np.concatenate([columns[f] for columns, _ in pending]) for f in fields}
+                results = await loop.run_in_executor(self.executor, self.kernel, batch)
+            except Exception:
+                # One bad request must not fail the whole batch: evaluate each on its own
+                await self._run_each(pending)
+                continue
+
+            self.batches += 1
+            self.requests += len(pending)
+            offset = 0
+            for columns, future in pending:
+                n = len(next(iter(columns.values())))
+                if not future.done():
+                    future.set_result({k: v[offset:offset + n] for k, v in results.items()})
+                offset += n
+
+
+    async def _run_each(self, pending):
+        loop = asyncio.get_running_loop()
+        for columns, future in pending:
+            try:
+                result = await loop.run_in_executor(self.executor, self.kernel, columns)
+            except Exception as e:
+                if not future.done():
+                    future.set_exception(e)
+                continue
+            self.batches += 1
+            self.requests += 1
+            if not future.done():
+                future.set_result(result)
+
+
+def _to_json(results):
+    # JSON has no NaN; invalid entries are reported as null alongside the `valid` mask
+    return {
+        k: [None if isinstance(x, float) and not math.isfinite(x) else x for x in v.tolist()]
+        for k, v in results.items()
+    }
+
+
+class PricingService:
+    """Minimal HTTP/1.1 server on asyncio streams exposing the batched kernels."""
+
+    def __init__(self, host="127.0.0.1", port=8600, workers=4,
+                 max_batch=DEFAULT_MAX_BATCH, max_wait_ms=DEFAULT_MAX_WAIT_MS):
+        self.host = host
+        self.port = port
+        self.workers = workers
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="pricing")
+        self.routes = {
+            "/fra/settle": (parse_fra_request, MicroBatcher(fra_kernel, self.executor, max_batch, max_wait_ms)),
+            "/apr/convert": (parse_apr_request, MicroBatcher(apr_kernel, self.executor, max_batch, max_wait_ms)),
+        }
+        self._server = None
+
+    def _warm_up(self):
+        # Touch every worker thread and kernel once so the first real request pays no setup cost
+        warm = [
+            (fra_kernel, parse_fra_request({"notional_principal": 1e6, "fixed_rate": 0.05, "start_period": 3,
+                                            "end_period": 6, "market_reference_rate": 0.05})),
+            (apr_kernel, parse_apr_request({"apr": 0.05, "m": 2, "n": 12})),
+        ]
+        futures = [self.executor.submit(k, c) for _ in range(self.workers) for k, c in warm]
+        for future in futures:
+            future.result()
+
+    async def start(self):
+        self._warm_up()
+        for _, batcher in self.routes.values():
+            batcher.start()
+        self._server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        return self._server
+
+    async def stop(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        for _, batcher in self.routes.values():
+            await batcher.stop()
+        self.executor.shutdown(wait=False)
+
+    async def serve_forever(self):
+        server = await self.start()
+        async with server:
+            await server.serve_forever()
+
+    async def _handle_connection(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                try:
+                    method, path, version = request_line.decode("latin-1").split()
+                except ValueError:
+                    await self._respond(writer, HTTPStatus.BAD_REQUEST, {"error": "Malformed request line."}, False)
+                    break
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                try:
+                    length = int(headers.get("content-length", 0) or 0)
+                except ValueError:
+                    length = -1
+                if length < 0:
+                    await self._respond(writer, HTTPStatus.BAD_REQUEST, {"error": "Invalid Content-Length header."}, False)
+                    break
+                if length > _MAX_BODY_BYTES:
+                    await self._respond(writer, HTTPStatus.REQUEST_ENTITY_TOO_LARGE, {"error": "Body too large."}, False)
+                    break
+                body = await reader.readexactly(length) if length else b""
+                keep_alive = headers.get("connection", "").lower() != "close" and version == "HTTP/1.1"
+
+                try:
+                    status, payload = await self._dispatch(method, path, body)
+                except Exception as e:
+                    # Answer rather than drop the connection, then close it
+                    status, payload, keep_alive = HTTPStatus.INTERNAL_SERVER_ERROR, {"error": f"Internal error: {e}"}, False
+                await self._respond(writer, status, payload, keep_alive)
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionResetError):
+            pass
+        finally:
+            writer.close()
+
+    async def _dispatch(self, method, path, body):
+        path = path.split("?", 1)[0]
+        if path == "/health" and method == "GET":
+            return HTTPStatus.OK, {
+                "status": "ok",
+                "batches": {route: batcher.batches for route, (_, batcher) in self.routes.items()},
+                "requests": {route: batcher.requests for route, (_, batcher) in self.routes.items()},
+            }
+        if path not in self.routes:
+            return HTTPStatus.NOT_FOUND, {"error": f"Unknown path: {path}"}
+        if method != "POST":
+            return HTTPStatus.METHOD_NOT_ALLOWED, {"error": "Use POST."}
+
+        parse, batcher = self.routes[path]
+        start = time.perf_counter()
+        try:
+            columns = parse(json.loads(body or b"{}"))
+        except json.JSONDecodeError as e:
+            return HTTPStatus.BAD_REQUEST, {"error": f"Invalid JSON: {e}"}
+        except RequestError as e:
+            return HTTPStatus.BAD_REQUEST, {"error": str(e)}
+        except Exception as e:
+            # Anything else the parser trips over is still a request it cannot read
+            return HTTPStatus.BAD_REQUEST, {"error": f"Invalid request: {e}"}
+        try:
+            results = await batcher.submit(columns)
+        except RequestError as e:
+            return HTTPStatus.BAD_REQUEST, {"error": str(e)}
+        except Exception as e:
+            return HTTPStatus.INTERNAL_SERVER_ERROR, {"error": f"Pricing failed: {e}"}
+        response = _to_json(results)
+        response["elapsed_ms"] = (time.perf_counter() - start) * 1000
+        return HTTPStatus.OK, response
+
+    async def _respond(self, writer, status, payload, keep_alive):
+        body = json.dumps(payload).encode()
+        head = (
+            f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+            "Content-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+        )
+        writer.write(head.encode("latin-1") + body)
+        await writer.drain()
+
+
+def serve(host="127.0.0.1", port=8600, workers=4, max_batch=DEFAULT_MAX_BATCH, max_wait_ms=DEFAULT_MAX_WAIT_MS):
+    """Run the pricing service until interrupted."""
+    service = PricingService(host, port, workers, max_batch, max_wait_ms)
+    print(f"QuLab pricing service listening on http://{host}:{port}")
+    try:
+        asyncio.run(service.serve_forever())
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,204 @@
+import datetime
+import json
+import os
+import shutil
+import tempfile
+
+import numpy as np
+
+
+STORE_FORMAT = "qulab-fra-store"
+STORE_VERSION = 1
+MANIFEST_FILE = "manifest.json"
+STORE_COLUMNS = {
+    "notional_principal": "float64",
+    "fixed_rate": "float64",
+    "start_period": "float64",
+    "end_period": "float64",
+    "days_in_year_basis": "float64",
+    "market_reference_rate": "float64",
+    "period_fraction": "float64",
+}
+DEFAULT_STORE_DIR = os.environ.get(
+    "QULAB_TRADE_STORE_DIR", os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "trade_stores")
+)
+# Rows copied at a time when a spooled column is moved into its .npy file
+_COPY_ROWS = 4_000_000
+
+
+def is_trade_store(path):
+    return isinstance(path, (str, os.PathLike)) and os.path.isfile(os.path.join(path, MANIFEST_FILE))
+
+
+def _check_replaceable(path):
+    # Only an existing trade store may be overwritten, never an arbitrary directory or file
+    if os.path.lexists(path) and (os.path.islink(path) or not is_trade_store(path)):
+        raise FileExistsError(f"{path} already exists and is not a trade store; refusing to replace it.")
+
+
+def _integer_ids(ids):
+    """Trade ids as int64, or None if any id is missing or not an integer."""
+    values = ids.to_numpy()
+    if np.issubdtype(values.dtype, np.integer):
+        return values.astype(np.int64, copy=False)
+    try:
+        values = np.asarray(values, dtype=np.float64)
+    except (TypeError, ValueError):
+        return None
+    with np.errstate(invalid="ignore"):
+        integral = np.isfinite(values) & (values == np.round(values)) & (np.abs(values) < 2**63)
+    return values.astype(np.int64) if integral.all() else None
+
+
+def write_trade_store(validated_chunks, path, source=None):
+    """Persist validated blotter chunks (see `pricing.blotter.validate_chunks`) as a trade store.
+
+    The store is a directory holding one `.npy` file per column plus `manifest.json`.
+    Chunks are spooled to raw column files as they arrive, so memory stays bounded by
+    one chunk; the directory is written next to `path` and renamed into place at the end.
+    An existing trade store at `path` is replaced; any other existing path raises
+    FileExistsError. Trade ids are kept as int64 if every id in every chunk is an
+    integer; a missing or non-integer id anywhere drops the column. Returns the
+    opened store.
+    """
+    path = os.path.abspath(path)
+    _check_replaceable(path)
+    parent = os.path.dirname(path)
+    os.makedirs(parent, exist_ok=True)
+    staging = tempfile.mkdtemp(prefix=".fra-store-", dir=parent)
+    os.chmod(staging, 0o755)
+    try:
+        columns = dict(STORE_COLUMNS)
+        spools = {}
+        trades = rejected = 0
+        dated = False
+        for terms, chunk_rejected in validated_chunks:
+            rejected += chunk_rejected
+            dated = dated or bool(terms.attrs.get("dated", False))
+            if trades == 0 and not spools:
+                if "trade_id" in terms.columns:
+                    columns = {"trade_id": "int64", **columns}
+                spools = {name: open(os.path.join(staging, name + ".raw"), "wb") for name in columns}
+            if "trade_id" in columns:
+                # Checked per chunk: a later chunk's ids may be blank or not integers at all
+                ids = _integer_ids(terms["trade_id"])
+                if ids is None:
+                    del columns["trade_id"]
+                    spools.pop("trade_id").close()
+                    os.remove(os.path.join(staging, "trade_id.raw"))
+                else:
+                    ids.tofile(spools["trade_id"])
+            for name, dtype in columns.items():
+                if name != "trade_id":
+                    terms[name].to_numpy(dtype=dtype).tofile(spools[name])
+            trades += len(terms)
+        for spool in spools.values():
+            spool.close()
+
+        for name, dtype in columns.items():
+            column = np.lib.format.open_memmap(os.path.join(staging, name + ".npy"), mode="w+", dtype=dtype, shape=(trades,))
+            if name in spools:
+                raw = np.memmap(os.path.join(staging, name + ".raw"), dtype=dtype, mode="r", shape=(trades,)) if trades else ()
+                for start in range(0, trades, _COPY_ROWS):
+                    column[start:start + _COPY_ROWS] = raw[start:start + _COPY_ROWS]
+                del raw
+                os.remove(os.path.join(staging, name + ".raw"))
+            column.flush()
+            del column
+
+        manifest = {
+            "format": STORE_FORMAT,
+            "version": STORE_VERSION,
+            "trades": trades,
+            "rejected": rejected,
+            "columns": columns,
+            "dated": dated,
+            "source": None if source is None else str(source),
+            "created": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+        }
+        with open(os.path.join(staging, MANIFEST_FILE), "w") as f:
+            json.dump(manifest, f, indent=2)
+
+        # Re-checked here: the path may have been created while the chunks were spooled
+        _check_replaceable(path)
+        if os.path.exists(path):
+            retired = tempfile.mkdtemp(prefix=".fra-store-old-", dir=parent)
+            os.replace(path, os.path.join(retired, "store"))
+            os.replace(staging, path)
+            shutil.rmtree(retired, ignore_errors=True)
+        else:
+            os.replace(staging, path)
+    except BaseException:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+    return TradeStore(path)
+
+
+class TradeStore:
+    """A persisted FRA book, opened as read-only memory maps (no parsing, no copy).
+
+    Columns are NumPy arrays backed by the page cache, so several processes or
+    Streamlit sessions opening the same store share one copy of the data.
+    """
+
+    def __init__(self, path):
+        self.path = os.path.abspath(path)
+        manifest_path = os.path.join(self.path, MANIFEST_FILE)
+        if not os.path.isfile(manifest_path):
+            raise ValueError(f"Not a trade store (no {MANIFEST_FILE}): {path}")
+        with open(manifest_path) as f:
+            self.manifest = json.load(f)
+        if self.manifest.get("format") != STORE_FORMAT or self.manifest.get("version") != STORE_VERSION:
+            raise ValueError(f"Unsupported trade store format in {path}.")
+        self.columns = {}
+        for name, dtype in self.manifest["columns"].items():
+            column = np.load(os.path.join(self.path, name + ".npy"), mmap_mode="r")
+            if column.dtype != np.dtype(dtype) or column.shape != (self.manifest["trades"],):
+                raise ValueError(f"Column {name} of trade store {path} does not match its manifest.")
+            self.columns[name] = column
+
+    def __len__(self):
+        return self.manifest["trades"]
+
+    def __getitem__(self, name):
+        return self.columns[name]
+
+    @property
+    def rejected(self):
+        return self.manifest["rejected"]
+
+    @property
+    def dated(self):
+        """Whether period fractions came from trade dates and a day count rather than (B - A) / 12."""
+        return bool(self.manifest.get("dated", False))
+
+    def validated_chunks(self, chunksize):
+        """Yield stored trades as `validate_chunks`-style (terms, rejected) pairs.
+
+        Trades were validated when the store was written, so the store's rejected
+        count is reported once, with the first chunk.
+        """
+        import pandas as pd
+
+        def chunk(start, stop):
+            terms = pd.DataFrame({name: column[start:stop] for name, column in self.columns.items()})
+            terms.attrs["dated"] = self.dated
+            return terms
+
+        rejected = self.rejected
+        for start in range(0, len(self), chunksize):
+            yield chunk(start, min(start + chunksize, len(self))), rejected
+            rejected = 0
+        if len(self) == 0:
+            yield chunk(0, 0), rejected
+
+
+def available_trade_stores(directory=DEFAULT_STORE_DIR):
+    """Trade stores in `directory`, as {name: path}."""
+    if not os.path.isdir(directory):
+        return {}
+    return {
+        entry: os.path.join(directory, entry)
+        for entry in sorted(os.listdir(directory))
+        if is_trade_store(os.path.join(directory, entry))
+    }
@@ -0,0 +1,44 @@
+import numpy as np
+import pytest
+
+from pricing.apr import CONTINUOUS, STANDARD_FREQUENCIES, convert_apr, convert_to_frequencies, equivalence_matrix
+
+
+def test_conversion_preserves_the_effective_annual_rate():
+    apr = np.array([0.001, 0.05, 0.12, 0.8])
+    for m in (1, 2, 12, 365):
+        for n in (1, 4, 52):
+            converted = convert_apr(apr, m, n)
+            assert converted.valid.all()
+            np.testing.assert_allclose((1 + converted.apr / n) ** n, (1 + apr / m) ** m, rtol=1e-13)
+
+
+def test_continuous_compounding():
+    assert convert_apr(0.05, CONTINUOUS, 1).apr == pytest.approx(np.expm1(0.05), rel=1e-15)
+    assert convert_apr(np.expm1(0.05), 1, CONTINUOUS).apr == pytest.approx(0.05, rel=1e-15)
+    assert convert_apr(0.05, 1e9, CONTINUOUS).apr == pytest.approx(0.05, rel=1e-8)
+
+
+def test_round_trip_is_the_identity():
+    apr = np.linspace(-0.5, 2.0, 101)
+    there = convert_apr(apr, 12, 2)
+    back = convert_apr(there.apr, 2, 12)
+    np.testing.assert_allclose(back.apr, apr, rtol=1e-12, atol=1e-15)
+
+
+def test_invalid_inputs_are_masked_not_raised():
+    converted = convert_apr([0.05, -3.0, np.nan, 0.05], [2, 2, 2, 0], 12)
+    np.testing.assert_array_equal(converted.valid, [True, False, False, False])
+    assert np.isnan(converted.apr[1:]).all()
+
+
+def test_batch_helpers_agree_with_pairwise_conversion():
+    apr = np.array([0.03, 0.07])
+    table = convert_to_frequencies(apr, 4)
+    assert table.apr.shape == (2, len(STANDARD_FREQUENCIES))
+    for j, n in enumerate(STANDARD_FREQUENCIES):
+        np.testing.assert_allclose(table.apr[:, j], convert_apr(apr, 4, n).apr, rtol=1e-15)
+    matrix = equivalence_matrix(0.06)
+    for i, m in enumerate(STANDARD_FREQUENCIES):
+        for j, n in enumerate(STANDARD_FREQUENCIES):
+            assert matrix.apr[i, j] == pytest.approx(convert_apr(0.06, m, n).apr, rel=1e-14)
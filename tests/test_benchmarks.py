@@ -0,0 +1,45 @@
+import ast
+import json
+import os
+import re
+
+from benchmarks.run_benchmarks import DEFAULT_THRESHOLDS, PAGES, check_thresholds
+
+
+RESULTS = {
+    "fra_settlement": {"settle_fra/1e+06": {"trades_per_sec": 9e6, "seconds": 0.11}},
+    "pages": {"FRA Blotter Ingestion": {"seconds": 0.25}},
+}
+
+
+def test_thresholds_flag_only_breaches():
+    failures = check_thresholds(RESULTS, {
+        "fra_settlement:settle_fra/1e+06": {"min_trades_per_sec": 8e6, "max_seconds": 0.1},
+        "pages:FRA Blotter Ingestion": {"max_seconds": 0.1},
+        "pages:Not Measured": {"max_seconds": 0.1},
+        "sensitivity:curve/100": {"max_seconds": 0.001},
+    })
+    assert len(failures) == 2
+    assert failures[0].startswith("fra_settlement:settle_fra/1e+06 seconds=0.11 above maximum")
+    assert failures[1].startswith("pages:FRA Blotter Ingestion seconds=0.25 above maximum")
+
+
+def test_every_benchmarked_page_has_a_threshold():
+    with open(DEFAULT_THRESHOLDS) as f:
+        thresholds = json.load(f)
+    assert all(f"pages:{page}" in thresholds for page in PAGES)
+    for limits in thresholds.values():
+        assert all(metric.partition("_")[0] in ("min", "max") for metric in limits)
+
+
+def test_benchmarked_pages_are_navigation_options():
+    with open(os.path.join(os.path.dirname(DEFAULT_THRESHOLDS), os.pardir, "app.py")) as f:
+        app = f.read()
+    assert all(f'"{page}"' in app for page in PAGES)
+
+
+def test_every_navigation_page_is_benchmarked():
+    with open(os.path.join(os.path.dirname(DEFAULT_THRESHOLDS), os.pardir, "app.py")) as f:
+        app = f.read()
+    options = re.search(r'label="Navigation", options=(\[.*?\])', app).group(1)
+    assert sorted(ast.literal_eval(options)) == sorted(PAGES)
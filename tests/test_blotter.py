@@ -0,0 +1,89 @@
+import os
+
+import pandas as pd
+import pytest
+
+from application_pages.blotter_ingestion import resolve_data_path
+from pricing.blotter import OUTPUT_COLUMNS, generate_sample_blotter, settle_blotter
+from pricing.fra import settle_fra
+
+
+def _expected_totals(blotter):
+    settlement = settle_fra(
+        blotter["notional_principal"], blotter["fixed_rate"], blotter["start_period"],
+        blotter["end_period"], blotter["market_reference_rate"],
+    )
+    return settlement.net_payment_at_maturity.sum(), settlement.cash_settlement_pv.sum()
+
+
+@pytest.mark.parametrize("chunksize", [7, 100, 10_000])
+def test_totals_match_kernel_whatever_the_chunk_size(chunksize):
+    blotter = generate_sample_blotter(1_000, seed=3)
+    totals = settle_blotter(blotter, chunksize=chunksize)
+    net, pv = _expected_totals(blotter)
+    assert totals.trades == 1_000
+    assert totals.rejected == 0
+    assert totals.chunks == -(-1_000 // chunksize)
+    assert totals.total_net_payment == pytest.approx(net, rel=1e-12)
+    assert totals.total_cash_settlement_pv == pytest.approx(pv, rel=1e-12)
+
+
+def test_invalid_rows_are_counted_and_skipped():
+    blotter = pd.DataFrame({
+        "notional_principal": [1e6, 1e6, "x", 1e6, 1e6],
+        "fixed_rate": [0.05, 0.05, 0.05, 0.05, 0.05],
+        "start_period": [3, 6, 3, None, 3],
+        "end_period": [9, 6, 9, 9, 9],
+        "market_reference_rate": [0.06, 0.06, 0.06, 0.06, -5.0],
+    })
+    totals = settle_blotter(blotter, chunksize=2)
+    assert (totals.trades, totals.rejected) == (1, 4)
+    assert totals.total_net_payment == pytest.approx(1e6 * 0.5 * 0.01)
+
+
+def test_missing_columns_raise():
+    with pytest.raises(ValueError, match="market_reference_rate"):
+        settle_blotter(pd.DataFrame({"notional_principal": [1.0]}))
+
+
+def test_csv_source_and_output_round_trip(tmp_path):
+    blotter = generate_sample_blotter(500, seed=1)
+    blotter.to_csv(tmp_path / "book.csv", index=False)
+    totals = settle_blotter(str(tmp_path / "book.csv"), str(tmp_path / "out.csv"), chunksize=64)
+    results = pd.read_csv(tmp_path / "out.csv")
+    assert len(results) == totals.trades == 500
+    assert results["cash_settlement_pv"].sum() == pytest.approx(totals.total_cash_settlement_pv)
+
+
+def test_parquet_output_keeps_one_schema_across_chunks(tmp_path):
+    blotter = pd.DataFrame({
+        "trade_id": [1, 2, "swap-3", 4, 5, 6],
+        "notional_principal": [1e6] * 6,
+        "fixed_rate": [0.05] * 6,
+        # A blank cell in the second chunk turns that chunk's start_period into floats
+        "start_period": ["3", "3", "", "6", "6", "6"],
+        "end_period": [9] * 6,
+        "market_reference_rate": [0.06] * 6,
+    })
+    blotter.to_csv(tmp_path / "book.csv", index=False)
+    totals = settle_blotter(str(tmp_path / "book.csv"), str(tmp_path / "out.parquet"), chunksize=2)
+
+    pq = pytest.importorskip("pyarrow.parquet")
+    table = pq.read_table(tmp_path / "out.parquet")
+    assert table.schema.names == ["trade_id"] + OUTPUT_COLUMNS
+    assert str(table.schema.field("trade_id").type) == "string"
+    assert all(str(table.schema.field(c).type) == "double" for c in OUTPUT_COLUMNS)
+    assert table.num_rows == totals.trades == 5
+    assert table.column("trade_id").to_pylist() == ["1", "2", "4", "5", "6"]
+
+
+def test_data_paths_stay_inside_the_data_directory(tmp_path):
+    data_dir = tmp_path / "data"
+    (data_dir / "books").mkdir(parents=True)
+    (tmp_path / "secret.csv").write_text("x")
+    os.symlink(tmp_path / "secret.csv", data_dir / "link.csv")
+
+    assert resolve_data_path("books/book.csv", str(data_dir)) == os.path.join(os.path.realpath(data_dir), "books", "book.csv")
+    for escaping in ["../secret.csv", "books/../../secret.csv", str(tmp_path / "secret.csv"), "link.csv"]:
+        with pytest.raises(ValueError):
+            resolve_data_path(escaping, str(data_dir))
@@ -0,0 +1,72 @@
+import numpy as np
+import pytest
+
+from application_pages.charts import binned_bar_trace, heatmap_trace, histogram_trace, line_trace, lttb_downsample
+
+
+def _reference_lttb(x, y, n_out):
+    """Textbook LTTB, one bucket at a time."""
+    n = len(x)
+    edges = (np.arange(n_out - 1) * ((n - 2) / (n_out - 2))).astype(np.int64) + 1
+    edges[-1] = n - 1
+    selected = [0]
+    for k in range(n_out - 2):
+        lo, hi = edges[k], edges[k + 1]
+        if k + 1 < n_out - 2:
+            next_x, next_y = x[hi:edges[k + 2]].mean(), y[hi:edges[k + 2]].mean()
+        else:
+            next_x, next_y = x[-1], y[-1]
+        a = selected[-1]
+        area = [abs((x[a] - next_x) * (y[i] - y[a]) - (x[a] - x[i]) * (next_y - y[a])) for i in range(lo, hi)]
+        selected.append(lo + int(np.argmax(area)))
+    selected.append(n - 1)
+    return x[selected], y[selected]
+
+
+@pytest.mark.parametrize("n, n_out", [(1_000, 50), (10_007, 333), (12, 5)])
+def test_lttb_matches_the_reference_algorithm(n, n_out):
+    rng = np.random.default_rng(n)
+    x = np.sort(rng.uniform(0, 100, n))
+    y = np.cumsum(rng.normal(size=n))
+    # An outlier at the end would skew the final bucket mean if it were included
+    y[-1] = 1e6
+    sx, sy = lttb_downsample(x, y, n_out)
+    rx, ry = _reference_lttb(x, y, n_out)
+    np.testing.assert_array_equal(sx, rx)
+    np.testing.assert_array_equal(sy, ry)
+    assert len(sx) == n_out and sx[0] == x[0] and sx[-1] == x[-1]
+
+
+def test_line_trace_switches_to_webgl_and_bounds_points():
+    x = np.arange(50_000.0)
+    y = np.sin(x / 100)
+    y[10] = np.nan
+    trace = line_trace(x, y, max_points=500)
+    assert trace.type == "scattergl" and len(trace.x) == 500
+    assert line_trace(x[:100], y[:100]).type == "scatter"
+
+
+def test_histogram_bins_are_merged_without_losing_counts():
+    values = np.random.default_rng(0).normal(size=100_000)
+    trace = histogram_trace(values, bins=1_000, bin_range=(-10, 10), normalize=False)
+    assert sum(trace.y) == 100_000
+    counts, edges = np.histogram(values, bins=1_000, range=(-10, 10))
+    merged = binned_bar_trace(counts, edges, max_bins=100, normalize=False, trim=False)
+    assert len(merged.y) == 100 and sum(merged.y) == 100_000
+    np.testing.assert_allclose(merged.width, 0.2)
+
+
+@pytest.mark.parametrize("rows", [1_000, 1_001, 1_037])
+def test_heatmap_keeps_every_row_within_the_cell_budget(rows):
+    y = np.linspace(0.01, 0.10, rows)
+    z = np.outer(y, np.arange(1, 121, dtype=np.float64))
+    trace = heatmap_trace(np.arange(120), y, z, max_cells=30_000)
+    z_out = np.asarray(trace.z)
+    assert z_out.size <= 30_000
+    assert trace.y[-1] > y[-8]
+    # Block means of a linear column are the mean of the rows they cover, so the
+    # row-count-weighted average over blocks equals the full average
+    group = -(-rows // (30_000 // 120))
+    counts = np.diff(np.append(np.arange(0, rows, group), rows))
+    assert np.average(trace.y, weights=counts) == pytest.approx(y.mean(), rel=1e-12)
+    np.testing.assert_allclose(np.average(z_out, axis=0, weights=counts), z.mean(axis=0), rtol=1e-12)
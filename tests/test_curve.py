@@ -0,0 +1,43 @@
+import numpy as np
+import pytest
+
+from pricing.curve import INTERPOLATION_METHODS, DiscountCurve, bootstrap_curve
+
+
+DEPOSITS = [(1, 0.0530), (3, 0.0540), (6, 0.0545)]
+# Off-node starts (2x8, 4x10) make DF(A) depend on the interpolator
+FRAS = [(2, 8, 0.0550), (3, 9, 0.0551), (4, 10, 0.0552), (6, 12, 0.0555), (12, 18, 0.0560),
+        (18, 24, 0.0565), (24, 36, 0.0570), (36, 48, 0.0575), (48, 60, 0.0580)]
+
+
+@pytest.mark.parametrize("method", INTERPOLATION_METHODS)
+def test_bootstrapped_curve_reprices_every_quote(method):
+    curve = bootstrap_curve(DEPOSITS, FRAS, method)
+    starts, ends, rates = np.array(FRAS).T
+    np.testing.assert_allclose(curve.forward_rate(starts, ends), rates, rtol=0, atol=1e-12)
+    tenors, deposit_rates = np.array(DEPOSITS).T
+    np.testing.assert_allclose(curve.forward_rate(0, tenors), deposit_rates, rtol=0, atol=1e-12)
+
+
+@pytest.mark.parametrize("method", INTERPOLATION_METHODS)
+def test_discount_factors_decrease_and_start_at_one(method):
+    curve = bootstrap_curve(DEPOSITS, FRAS, method)
+    months = np.linspace(0, 72, 721)
+    discount_factors = curve.discount_factor(months)
+    assert discount_factors[0] == pytest.approx(1.0)
+    assert np.all(np.diff(discount_factors) < 0)
+
+
+def test_flat_forward_extrapolation_beyond_the_last_node():
+    curve = DiscountCurve([0, 12], [1.0, np.exp(-0.05)])
+    assert curve.zero_rate(36) == pytest.approx(0.05)
+    assert curve.forward_rate(24, 36) == pytest.approx(np.expm1(0.05))
+
+
+def test_invalid_quotes_raise():
+    with pytest.raises(ValueError, match="beyond the curve"):
+        bootstrap_curve([(3, 0.05)], [(6, 12, 0.05)])
+    with pytest.raises(ValueError, match="Duplicate"):
+        bootstrap_curve([(6, 0.05)], [(3, 6, 0.05)])
+    with pytest.raises(ValueError, match="interpolation method"):
+        bootstrap_curve([(6, 0.05)], method="spline")
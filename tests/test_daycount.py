@@ -0,0 +1,84 @@
+import threading
+
+import numpy as np
+import pytest
+
+from pricing.daycount import BusinessDayCalendar, accrual_fractions, add_months, to_dates, year_fraction
+
+
+HOLIDAYS = ["2025-01-01", "2025-05-26", "2025-07-04", "2025-12-25", "2026-01-01"]
+
+
+def _dates(n=5_000, seed=3):
+    rng = np.random.default_rng(seed)
+    return np.datetime64("2024-01-01") + rng.integers(0, 1_500, n).astype("timedelta64[D]")
+
+
+@pytest.mark.parametrize("convention, numpy_roll", [("following", "forward"), ("preceding", "backward")])
+def test_rolls_match_numpy_busday_offset(convention, numpy_roll):
+    calendar = BusinessDayCalendar(HOLIDAYS)
+    dates = _dates()
+    expected = np.busday_offset(dates, 0, roll=numpy_roll, holidays=HOLIDAYS)
+    np.testing.assert_array_equal(calendar.roll(dates, convention), expected)
+
+
+def test_modified_following_stays_in_the_month():
+    calendar = BusinessDayCalendar(HOLIDAYS)
+    dates = _dates()
+    expected = np.busday_offset(dates, 0, roll="modifiedfollowing", holidays=HOLIDAYS)
+    np.testing.assert_array_equal(calendar.roll(dates), expected)
+    # Saturday 2025-05-31 would roll into June
+    assert calendar.roll(to_dates(["2025-05-31"]))[0] == np.datetime64("2025-05-30")
+
+
+def test_index_grows_for_dates_outside_it():
+    calendar = BusinessDayCalendar(HOLIDAYS)
+    calendar.roll(to_dates(["2025-06-01"]))
+    far = to_dates(["1990-01-06", "2060-07-04"])
+    expected = np.busday_offset(far, 0, roll="forward", holidays=HOLIDAYS)
+    np.testing.assert_array_equal(calendar.roll(far, "following"), expected)
+
+
+def test_concurrent_rolls_on_a_shared_calendar():
+    calendar = BusinessDayCalendar(HOLIDAYS)
+    errors = []
+
+    def roll(offset):
+        # Each thread needs a different range, so the shared index is rebuilt under contention
+        dates = _dates(2_000, offset + 10) + np.timedelta64(offset * 900, "D")
+        expected = np.busday_offset(dates, 0, roll="modifiedfollowing", holidays=HOLIDAYS)
+        for _ in range(20):
+            if not np.array_equal(calendar.roll(dates), expected):
+                errors.append(offset)
+
+    threads = [threading.Thread(target=roll, args=(i,)) for i in range(-4, 5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert errors == []
+
+
+def test_add_months_clips_to_month_end():
+    dates = to_dates(["2024-01-31", "2023-01-31", "2024-03-31", "2024-08-15"])
+    np.testing.assert_array_equal(
+        add_months(dates, [1, 1, -1, 6]), to_dates(["2024-02-29", "2023-02-28", "2024-02-29", "2025-02-15"])
+    )
+
+
+def test_year_fractions():
+    start = to_dates(["2024-01-31", "2023-07-01"])
+    end = to_dates(["2024-03-31", "2024-07-01"])
+    np.testing.assert_allclose(year_fraction(start, end, "ACT/360"), [60 / 360, 366 / 360])
+    np.testing.assert_allclose(year_fraction(start, end, "ACT/365F"), [60 / 365, 366 / 365])
+    np.testing.assert_allclose(year_fraction(start, end, "30/360"), [60 / 360, 1.0])
+    np.testing.assert_allclose(year_fraction(start, end, "ACT/ACT"), [60 / 366, 184 / 365 + 182 / 366])
+    with pytest.raises(ValueError):
+        year_fraction(start, end, "BUS/252")
+
+
+def test_accrual_fractions_roll_the_accrual_dates():
+    calendar = BusinessDayCalendar(HOLIDAYS)
+    # 2025-04-04 + 3M = 2025-07-04 (holiday) -> 07-07; + 6M = 2025-10-04 (Saturday) -> 10-06
+    fraction = accrual_fractions(to_dates(["2025-04-04"]), 3, 6, "ACT/360", calendar)
+    assert fraction[0] == pytest.approx(91 / 360)
@@ -0,0 +1,153 @@
+import tracemalloc
+
+import numpy as np
+import pytest
+
+from pricing.blotter import generate_sample_blotter, settle_blotter, validated_blotter_chunks
+from pricing.fra import settle_fra
+from pricing.incremental import MAX_CACHED_VALUATIONS, IncrementalBook, fingerprint, load_book, load_incremental_book
+
+
+def _terms(book):
+    return book.notional_principal, book.fixed_rate, book.start_period, book.end_period
+
+
+def _full_totals(book, mrr):
+    settlement = settle_fra(*_terms(book), mrr, book.tau)
+    return settlement.net_payment_at_maturity.sum(), settlement.cash_settlement_pv.sum()
+
+
+@pytest.fixture
+def loaded():
+    return load_incremental_book(validated_blotter_chunks(generate_sample_blotter(3_000, seed=4), 1_000))
+
+
+def test_scalar_and_array_revaluation_match_a_full_pass(loaded):
+    book, blotter_mrr, rejected = loaded
+    assert rejected == 0
+    for mrr in (0.03, 0.055, blotter_mrr):
+        valuation = book.revalue(mrr)
+        net, pv = _full_totals(book, mrr)
+        assert valuation.total_net_payment == pytest.approx(net, rel=1e-11)
+        assert valuation.total_cash_settlement_pv == pytest.approx(pv, rel=1e-11)
+    assert book.stats["tenor_revaluations"] == 2 and book.stats["full_revaluations"] == 1
+    book.revalue(0.03)
+    assert book.stats["cache_hits"] == 1
+
+
+def test_trade_edits_match_a_rebuilt_book(loaded):
+    book, blotter_mrr, _ = loaded
+    book.revalue(0.05)
+    rng = np.random.default_rng(0)
+    for i in rng.integers(0, len(book), 25):
+        start = int(rng.integers(0, 24))
+        book.update_trade(int(i), notional_principal=rng.uniform(1e5, 1e7), fixed_rate=rng.uniform(0.01, 0.08),
+                          start_period=start, end_period=start + int(rng.integers(1, 13)))
+    book.update_trade(7, fixed_rate=0.0123)
+
+    rebuilt = IncrementalBook(*(a.copy() for a in _terms(book)))
+    for mrr in (0.05, 0.061, blotter_mrr):
+        edited = book.revalue(mrr)
+        fresh = rebuilt.revalue(mrr)
+        assert edited.total_net_payment == pytest.approx(fresh.total_net_payment, rel=1e-10)
+        assert edited.total_cash_settlement_pv == pytest.approx(fresh.total_cash_settlement_pv, rel=1e-10)
+
+
+def test_rejected_edit_leaves_the_trade_unchanged(loaded):
+    book, _, _ = loaded
+    before = [a.copy() for a in (*_terms(book), book.tau, book.accrual, book.fixed_leg)]
+    valuation = book.revalue(0.05)
+    end = book.end_period[3]
+    with pytest.raises(ValueError):
+        book.update_trade(3, notional_principal=5e6, start_period=end + 3)
+    with pytest.raises(ValueError):
+        book.update_trade(3, fixed_rate=np.nan)
+    for array, saved in zip((*_terms(book), book.tau, book.accrual, book.fixed_leg), before):
+        np.testing.assert_array_equal(array, saved)
+    assert book.revalue(0.05) == valuation
+    book.update_trade(3, fixed_rate=0.02)
+    assert book.fixed_rate[3] == 0.02
+
+
+def test_edit_keeps_a_day_count_fraction_unless_the_dates_move():
+    book = IncrementalBook([1e6, 2e6], [0.05, 0.05], [3, 6], [9, 12], period_fraction=[0.5083, 0.5])
+    book.update_trade(0, notional_principal=3e6, start_period=3, end_period=9)
+    assert book.tau[0] == 0.5083
+    book.update_trade(0, end_period=15)
+    assert book.tau[0] == 1.0
+
+
+def test_dated_books_refuse_edits_to_a_and_b(tmp_path):
+    from pricing.store import write_trade_store
+
+    blotter = generate_sample_blotter(200, seed=5)
+    blotter["start_period"] = blotter["start_period"].round()
+    blotter["end_period"] = blotter["end_period"].round()
+    blotter["trade_date"] = "2025-01-31"
+    blotter["day_count"] = "ACT/360"
+    book, _, _ = load_incremental_book(validated_blotter_chunks(blotter, 50))
+    store = write_trade_store(validated_blotter_chunks(blotter, 50), tmp_path / "book")
+    assert book.dated and store.dated and load_book(store)[0].dated
+    tau = book.tau[0]
+    with pytest.raises(ValueError, match="day-count"):
+        book.update_trade(0, end_period=book.end_period[0] + 3)
+    book.update_trade(0, notional_principal=3e6, start_period=book.start_period[0])
+    assert book.tau[0] == tau and book.accrual[0] == 3e6 * tau
+
+    undated, _, _ = load_incremental_book(validated_blotter_chunks(blotter.drop(columns="trade_date"), 50))
+    assert not undated.dated
+    undated.update_trade(0, start_period=0, end_period=6)
+    assert undated.tau[0] == 0.5
+
+
+def test_valuation_cache_is_bounded(loaded):
+    book, _, _ = loaded
+    for mrr in np.linspace(0.01, 0.1, MAX_CACHED_VALUATIONS + 50):
+        book.revalue(mrr)
+    assert len(book._valuations) == MAX_CACHED_VALUATIONS
+    book.update_trade(0, fixed_rate=0.03)
+    assert len(book._valuations) == MAX_CACHED_VALUATIONS
+
+
+def test_trade_store_books_are_mapped_and_copied_only_on_edit(tmp_path):
+    from pricing.store import write_trade_store
+
+    blotter = generate_sample_blotter(2_000, seed=8)
+    store = write_trade_store(validated_blotter_chunks(blotter, 500), tmp_path / "book")
+    book, mrr, _ = load_book(store)
+    assert np.shares_memory(book.notional_principal, store["notional_principal"])
+    assert book.revalue(mrr).total_cash_settlement_pv == pytest.approx(settle_blotter(blotter).total_cash_settlement_pv, rel=1e-11)
+    book.update_trade(0, notional_principal=1.0)
+    assert not np.shares_memory(book.notional_principal, store["notional_principal"])
+    assert store["notional_principal"][0] == blotter["notional_principal"][0]
+
+
+def test_fingerprint_hashes_without_copying():
+    values = np.random.default_rng(1).random(1_000_000)
+    mapped = np.frombuffer(values.tobytes(), dtype=np.float64)
+    assert fingerprint(values) == fingerprint(mapped) != fingerprint(values[::-1])
+    tracemalloc.start()
+    fingerprint(mapped)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    assert peak < values.nbytes // 10
+
+
+def test_page_editor_passes_only_changed_fields():
+    from streamlit.testing.v1 import AppTest
+
+    def page():
+        import streamlit as st
+        from application_pages.book_whatif import _render_trade_editor
+        from pricing.incremental import IncrementalBook
+
+        if "book" not in st.session_state:
+            st.session_state.book = IncrementalBook([1e6], [0.05], [2.5], [8.75], period_fraction=[0.53], dated=True)
+        _render_trade_editor(st.session_state.book)
+
+    at = AppTest.from_function(page).run()
+    at.number_input[1].set_value(2e6)
+    at.button[0].click().run()
+    assert not at.error and not at.exception
+    book = at.session_state.book
+    assert (book.notional_principal[0], book.start_period[0], book.end_period[0], book.tau[0]) == (2e6, 2.5, 8.75, 0.53)
@@ -0,0 +1,51 @@
+import os
+
+import pytest
+
+from application_pages import instrumentation
+from application_pages.instrumentation import RerunProfile, prometheus_text
+
+
+APP = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app.py")
+
+
+def test_segments_partition_the_rerun():
+    profile = RerunProfile()
+    for name in ("widget parsing", "settlement math", "figure build"):
+        profile.checkpoint(name)
+    assert [name for name, _ in profile.segments] == ["widget parsing", "settlement math", "figure build"]
+    assert sum(seconds for _, seconds in profile.segments) == pytest.approx(profile.total, abs=1e-12)
+
+
+def test_profiled_rerun_records_counters_and_writes_prometheus_file(tmp_path, monkeypatch):
+    from streamlit.testing.v1 import AppTest
+
+    prom_file = tmp_path / "qulab.prom"
+    monkeypatch.setenv(instrumentation.PROFILE_ENV_VAR, "1")
+    monkeypatch.setenv(instrumentation.PROMETHEUS_FILE_ENV_VAR, str(prom_file))
+    monkeypatch.setattr(instrumentation, "_rerun_counters", {})
+    monkeypatch.setattr(instrumentation, "_segment_counters", {})
+
+    at = AppTest.from_file(APP, default_timeout=60).run()
+    at.sidebar.selectbox[0].set_value("APR Conversion Utility").run()
+    assert not at.exception
+    assert any("Diagnostics" in e.label for e in at.sidebar.expander)
+
+    page = "APR Conversion Utility"
+    count, seconds = instrumentation._rerun_counters[page]
+    segment_seconds = sum(s for (p, _), (_, s) in instrumentation._segment_counters.items() if p == page)
+    assert count == 1
+    assert segment_seconds == pytest.approx(seconds, rel=1e-9)
+    assert ("APR Conversion Utility", "page import") in instrumentation._segment_counters
+    assert prom_file.read_text() == prometheus_text()
+    assert f'qulab_reruns_total{{page="{page}"}} 1' in prom_file.read_text()
+
+
+def test_profiling_off_records_nothing(monkeypatch):
+    from streamlit.testing.v1 import AppTest
+
+    monkeypatch.delenv(instrumentation.PROFILE_ENV_VAR, raising=False)
+    monkeypatch.setattr(instrumentation, "_rerun_counters", {})
+    at = AppTest.from_file(APP, default_timeout=60).run()
+    assert not at.exception
+    assert instrumentation._rerun_counters == {}
@@ -0,0 +1,72 @@
+import numpy as np
+import pytest
+
+from pricing.curve import DiscountCurve
+from pricing.monte_carlo import HullWhiteModel, SettlementStats, VasicekModel, simulate_settlement
+
+
+TERMS = dict(notional_principal=1_000_000.0, fixed_rate=0.05, start_period=6.0, end_period=12.0)
+
+
+def _expected_pv(model, notional_principal, fixed_rate, start_period, end_period):
+    # PV = N - N (1 + K tau) P(A, B) with P(A, B) = exp(log_a - b_tau r(A)), r(A) Gaussian
+    r_mean, r_std, log_a, b_tau = model.affine_term_rate(start_period, end_period)
+    tau = (end_period - start_period) / 12
+    return notional_principal * (1 - (1 + fixed_rate * tau) * np.exp(log_a - b_tau * r_mean + (b_tau * r_std) ** 2 / 2))
+
+
+@pytest.mark.parametrize("model", [
+    VasicekModel(a=0.3, b=0.05, sigma=0.01, r0=0.045),
+    HullWhiteModel(a=0.1, sigma=0.01, curve=DiscountCurve([0, 60], [1.0, np.exp(-0.05 * 5)])),
+])
+def test_mean_settlement_matches_the_affine_expectation(model):
+    stats = simulate_settlement(model, n_paths=400_000, seed=7, workers=1, **TERMS)
+    assert stats.count == 400_000
+    assert abs(stats.mean - _expected_pv(model, **TERMS)) < 4 * stats.std / np.sqrt(stats.count)
+
+
+def test_results_do_not_depend_on_the_worker_count():
+    model = VasicekModel(a=0.3, b=0.05, sigma=0.01, r0=0.045)
+    serial = simulate_settlement(model, n_paths=30_000, seed=1, workers=1, shard_paths=10_000, **TERMS)
+    pooled = simulate_settlement(model, n_paths=30_000, seed=1, workers=2, shard_paths=10_000, **TERMS)
+    assert pooled.mean == pytest.approx(serial.mean, rel=1e-12)
+    assert pooled.std == pytest.approx(serial.std, rel=1e-12)
+    np.testing.assert_array_equal(pooled.counts, serial.counts)
+
+
+def test_merged_stats_equal_one_pass():
+    values = np.random.default_rng(0).normal(size=10_001)
+    edges = np.linspace(-5, 5, 101)
+    whole = SettlementStats(edges)
+    whole.update(values)
+    merged = SettlementStats(edges)
+    for part in np.array_split(values, 3):
+        shard = SettlementStats(edges)
+        shard.update(part)
+        merged.merge(shard)
+    assert merged.mean == pytest.approx(whole.mean, abs=1e-15)
+    assert merged.std == pytest.approx(whole.std, rel=1e-12)
+    np.testing.assert_array_equal(merged.counts, whole.counts)
+    assert merged.percentile(50) == pytest.approx(np.median(values), abs=0.1)
+
+
+def test_invalid_inputs_raise():
+    model = VasicekModel(a=0.3, b=0.05, sigma=0.01, r0=0.045)
+    with pytest.raises(ValueError):
+        simulate_settlement(model, 1e6, 0.05, 12, 6, n_paths=10)
+    with pytest.raises(ValueError):
+        simulate_settlement(model, n_paths=0, **TERMS)
+
+
+def test_day_count_fraction_replaces_months_fraction():
+    model = VasicekModel(a=0.3, b=0.05, sigma=0.01, r0=0.045)
+    fraction = 184 / 360
+    stats = simulate_settlement(model, n_paths=400_000, seed=7, workers=1, year_fraction=fraction, **TERMS)
+    # MRR = (1 / P - 1) / fraction, so the expected PV has the same form with K * fraction
+    r_mean, r_std, log_a, b_tau = model.affine_term_rate(TERMS["start_period"], TERMS["end_period"])
+    expected = TERMS["notional_principal"] * (
+        1 - (1 + TERMS["fixed_rate"] * fraction) * np.exp(log_a - b_tau * r_mean + (b_tau * r_std) ** 2 / 2)
+    )
+    assert abs(stats.mean - expected) < 4 * stats.std / np.sqrt(stats.count)
+    months = simulate_settlement(model, n_paths=400_000, seed=7, workers=1, **TERMS)
+    assert abs(stats.mean - months.mean) > 4 * stats.std / np.sqrt(stats.count)
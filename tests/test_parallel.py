@@ -0,0 +1,102 @@
+import io
+import os
+import tracemalloc
+
+import numpy as np
+import pytest
+
+from pricing.blotter import count_blotter_rows, generate_sample_blotter, settle_blotter, validated_blotter_chunks
+from pricing.parallel import SHARED_COLUMNS, SharedBook, value_blotter
+from pricing.risk import book_risk_ladder
+from pricing.store import write_trade_store
+
+
+def _blotter(n=5_000, seed=9):
+    blotter = generate_sample_blotter(n, seed)
+    blotter.loc[[3, 40], "end_period"] = 0
+    return blotter
+
+
+def _shared_memory_blocks():
+    return set(os.listdir("/dev/shm")) if os.path.isdir("/dev/shm") else set()
+
+
+def _assert_matches_serial(totals, ladder, blotter, market_reference_rate=None):
+    serial = settle_blotter(blotter, chunksize=700)
+    assert (totals.trades, totals.rejected) == (serial.trades, serial.rejected)
+    assert totals.total_cash_settlement_pv == pytest.approx(serial.total_cash_settlement_pv, rel=1e-12)
+    if market_reference_rate is None:
+        assert totals.total_net_payment == pytest.approx(serial.total_net_payment, rel=1e-12)
+    expected, rejected, _ = book_risk_ladder(
+        validated_blotter_chunks(blotter, 700), market_reference_rate=market_reference_rate
+    )
+    assert rejected == totals.rejected
+    np.testing.assert_array_equal(ladder.trades, expected.trades)
+    for field in ("cash_settlement_pv", "pv01_mrr", "pv01_fixed_rate"):
+        np.testing.assert_allclose(getattr(ladder, field), getattr(expected, field), rtol=1e-12)
+
+
+@pytest.mark.parametrize("market_reference_rate", [None, 0.045])
+def test_workers_match_the_serial_pipeline_exactly(market_reference_rate):
+    blotter = _blotter()
+    before = _shared_memory_blocks()
+    results = [
+        value_blotter(blotter, market_reference_rate, workers, chunksize=700, shard_trades=1_100)
+        for workers in (1, 2, 3)
+    ]
+    assert _shared_memory_blocks() <= before
+    for totals, ladder in results[1:]:
+        # Shards are reduced in order, so the worker count cannot change a single bit
+        assert totals == results[0][0]
+        for field in ladder._fields:
+            np.testing.assert_array_equal(getattr(ladder, field), getattr(results[0][1], field))
+    if market_reference_rate is None:
+        _assert_matches_serial(*results[0], blotter)
+    else:
+        assert results[0][0].trades == settle_blotter(blotter).trades
+
+
+def test_trade_stores_are_valued_in_place(tmp_path):
+    blotter = _blotter()
+    store = write_trade_store(validated_blotter_chunks(blotter, 700), tmp_path / "book")
+    totals, ladder = value_blotter(store.path, workers=2, shard_trades=1_500)
+    _assert_matches_serial(totals, ladder, blotter)
+
+
+@pytest.mark.parametrize("capacity", [None, 10, 5_000, 50_000])
+def test_shared_book_holds_every_chunk_whatever_the_capacity(capacity):
+    blotter = _blotter()
+    expected = [terms for terms, _ in validated_blotter_chunks(blotter, 700)]
+    book, rejected = SharedBook.from_validated_chunks(validated_blotter_chunks(blotter, 700), capacity)
+    with book:
+        assert (book.trades, rejected) == (sum(len(t) for t in expected), 2)
+        assert book.capacity >= book.trades
+        for name in SHARED_COLUMNS:
+            np.testing.assert_array_equal(book.columns[name], np.concatenate([t[name].to_numpy() for t in expected]))
+
+
+def test_chunks_are_not_held_while_loading():
+    blotter = generate_sample_blotter(400_000, 2)
+    book_bytes = len(blotter) * len(SHARED_COLUMNS) * 8
+    tracemalloc.start()
+    try:
+        book, _ = SharedBook.from_validated_chunks(validated_blotter_chunks(blotter, 20_000), len(blotter))
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    with book:
+        assert book.trades == len(blotter)
+    # Shared memory is not traced, so this is the chunk working set only
+    assert peak < book_bytes / 3
+
+
+def test_row_counts_bound_the_valid_trades(tmp_path):
+    blotter = _blotter(1_000)
+    path = tmp_path / "book.csv"
+    blotter.to_csv(path, index=False)
+    assert count_blotter_rows(blotter) == 1_000
+    assert count_blotter_rows(str(path)) >= 1_000
+    assert count_blotter_rows(io.BytesIO(path.read_bytes())) >= 1_000
+    blotter.to_parquet(tmp_path / "book.parquet")
+    assert count_blotter_rows(str(tmp_path / "book.parquet")) == 1_000
+    assert count_blotter_rows(str(tmp_path / "book.csv.gz")) is None
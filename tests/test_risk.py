@@ -0,0 +1,72 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from pricing.blotter import generate_sample_blotter, validated_blotter_chunks
+from pricing.fra import cash_settlement_pv
+from pricing.risk import BASIS_POINT, RiskLadderBuilder, bucket_index, book_risk_ladder, fra_risk
+
+
+def _book(n=2_000, seed=5):
+    blotter = generate_sample_blotter(n, seed)
+    return (blotter["notional_principal"].to_numpy(), blotter["fixed_rate"].to_numpy(),
+            blotter["start_period"].to_numpy(), blotter["end_period"].to_numpy(),
+            blotter["market_reference_rate"].to_numpy())
+
+
+@pytest.mark.parametrize("year_fraction", [None, 0.27])
+def test_closed_form_pv01_matches_central_differences(year_fraction):
+    notional, fixed, start, end, mrr = _book()
+    risk = fra_risk(notional, fixed, start, end, mrr, year_fraction)
+    h = 1e-7
+
+    def pv(fixed_rate, market_reference_rate):
+        return cash_settlement_pv(notional, fixed_rate, start, end, market_reference_rate, year_fraction)
+
+    np.testing.assert_allclose(risk.cash_settlement_pv, pv(fixed, mrr), rtol=1e-12)
+    bumped_mrr = (pv(fixed, mrr + h) - pv(fixed, mrr - h)) / (2 * h) * BASIS_POINT
+    bumped_fixed = (pv(fixed + h, mrr) - pv(fixed - h, mrr)) / (2 * h) * BASIS_POINT
+    np.testing.assert_allclose(risk.pv01_mrr, bumped_mrr, rtol=1e-6)
+    np.testing.assert_allclose(risk.pv01_fixed_rate, bumped_fixed, rtol=1e-6)
+
+
+def test_ladder_buckets_sum_to_the_book_whatever_the_chunking():
+    blotter = generate_sample_blotter(5_000, seed=9)
+    whole, rejected, samples = book_risk_ladder(validated_blotter_chunks(blotter, 5_000), sample_trades=10)
+    chunked, _, _ = book_risk_ladder(validated_blotter_chunks(blotter, 333))
+    risk = fra_risk(*_book(5_000, 9))
+
+    assert rejected == 0 and int(whole.trades.sum()) == 5_000
+    assert whole.pv01_mrr.sum() == pytest.approx(risk.pv01_mrr.sum(), rel=1e-12)
+    assert whole.cash_settlement_pv.sum() == pytest.approx(risk.cash_settlement_pv.sum(), rel=1e-12)
+    np.testing.assert_allclose(chunked.pv01_fixed_rate, whole.pv01_fixed_rate, rtol=1e-12)
+    np.testing.assert_array_equal(np.bincount(bucket_index(blotter["start_period"].to_numpy()), minlength=9),
+                                  whole.trades)
+    assert len(pd.concat(samples)) == 10
+
+
+def test_merged_builders_equal_one_builder():
+    notional, fixed, start, end, mrr = _book()
+    risk = fra_risk(notional, fixed, start, end, mrr)
+    one = RiskLadderBuilder()
+    one.add(start, risk)
+    merged = RiskLadderBuilder()
+    for part in np.array_split(np.arange(len(start)), 4):
+        shard = RiskLadderBuilder()
+        shard.add(start[part], type(risk)(*(field[part] for field in risk)))
+        merged.merge(shard)
+    for a, b in zip(one.ladder()[1:], merged.ladder()[1:]):
+        np.testing.assert_allclose(a, b, rtol=1e-12)
+
+
+def test_page_samples_close_the_blotter_file(tmp_path):
+    from application_pages.risk_ladder import _sample_trades
+
+    generate_sample_blotter(5_000).to_csv(tmp_path / "book.csv", index=False)
+    open_files = len(os.listdir("/proc/self/fd")) if os.path.isdir("/proc/self/fd") else None
+    samples = _sample_trades(str(tmp_path / "book.csv"), None, None, sample_trades=100)
+    assert len(pd.concat(samples)) == 100
+    if open_files is not None:
+        assert len(os.listdir("/proc/self/fd")) == open_files
@@ -0,0 +1,74 @@
+import io
+
+import numpy as np
+import pytest
+
+from pricing.blotter import generate_sample_blotter, validated_blotter_chunks
+from pricing.fra import cash_settlement_pv
+from pricing.incremental import load_incremental_book
+from pricing.scenarios import (
+    ScenarioSet,
+    load_historical_scenarios,
+    parallel_scenarios,
+    scenario_pnl,
+    summarize_pnl,
+    twist_scenarios,
+)
+
+
+def _book(n=3_000, seed=11):
+    return load_incremental_book(validated_blotter_chunks(generate_sample_blotter(n, seed), 1_000))[:2]
+
+
+def _brute_force_pnl(book, mrr, scenarios):
+    shifts = np.array([np.interp(book.start_period, scenarios.node_months, s) for s in scenarios.shifts])
+    base = cash_settlement_pv(book.notional_principal, book.fixed_rate, book.start_period, book.end_period, mrr, book.tau)
+    shifted = cash_settlement_pv(
+        book.notional_principal, book.fixed_rate, book.start_period, book.end_period, mrr + shifts, book.tau
+    )
+    return np.nansum(shifted, axis=1) - np.nansum(base)
+
+
+@pytest.mark.parametrize("scenarios", [parallel_scenarios(-300, 300, 61), twist_scenarios(150, 9, 0, 60)])
+def test_pnl_matches_full_revaluation(scenarios):
+    book, mrr = _book()
+    np.testing.assert_allclose(
+        scenario_pnl(book, mrr, scenarios, workers=1), _brute_force_pnl(book, mrr, scenarios), rtol=1e-9, atol=1e-4
+    )
+
+
+def test_tiling_and_workers_do_not_change_the_result():
+    book, mrr = _book()
+    scenarios = twist_scenarios(200, 15, 0, 60)
+    whole = scenario_pnl(book, mrr, scenarios, workers=1, memory_budget_mb=1_024)
+    # A tiny budget forces many scenario x trade tiles, shared by several threads
+    tiled = scenario_pnl(book, mrr, scenarios, workers=3, memory_budget_mb=1)
+    np.testing.assert_allclose(tiled, whole, rtol=1e-11, atol=1e-2)
+
+
+def test_unpriceable_trades_count_as_zero():
+    book, _ = _book(200)
+    # A -20% shift drives 1 + (MRR + shift) * tau negative for every trade
+    scenarios = ScenarioSet(["crash"], np.array([0.0]), np.array([[-20.0]]))
+    pnl = scenario_pnl(book, 0.05, scenarios, workers=1)
+    base = cash_settlement_pv(book.notional_principal, book.fixed_rate, book.start_period, book.end_period, 0.05, book.tau)
+    assert pnl[0] == pytest.approx(-base.sum(), rel=1e-9)
+
+
+def test_historical_scenarios_sort_tenors_and_skip_gaps():
+    csv = io.StringIO("date,1Y,3M,6\n2024-01-02,10,1,5\n2024-01-03,,2,6\n2024-01-04,-4,3,-1\n")
+    scenarios = load_historical_scenarios(csv)
+    assert scenarios.names == ["2024-01-02", "2024-01-04"]
+    np.testing.assert_array_equal(scenarios.node_months, [3, 6, 12])
+    np.testing.assert_allclose(scenarios.shifts, [[1e-4, 5e-4, 10e-4], [3e-4, -1e-4, -4e-4]])
+
+
+def test_summarize_pnl():
+    pnl = np.arange(-50.0, 50.0)
+    summary = summarize_pnl(pnl, confidence=0.95)
+    assert summary.scenarios == 100
+    assert summary.worst == -50.0
+    assert summary.value_at_risk == pytest.approx(-np.quantile(pnl, 0.05))
+    assert summary.expected_shortfall == pytest.approx(-pnl[pnl <= np.quantile(pnl, 0.05)].mean())
+    with pytest.raises(ValueError):
+        summarize_pnl(pnl, confidence=1.0)
@@ -0,0 +1,20 @@
+import numpy as np
+
+from pricing.fra import cash_settlement_pv
+from pricing.sensitivity import mrr_grid, settlement_surface, tenor_grid
+
+
+def test_surface_columns_match_single_contracts():
+    mrrs, tenors = mrr_grid(0.01, 0.10, 7), tenor_grid(24)
+    surface = settlement_surface(1e6, 0.05, mrrs, tenors, start_period=3)
+    assert surface.shape == (7, 24)
+    for j, tenor in enumerate(tenors):
+        np.testing.assert_allclose(surface[:, j], cash_settlement_pv(1e6, 0.05, 3, 3 + tenor, mrrs), rtol=1e-14)
+
+
+def test_surface_uses_per_tenor_year_fractions():
+    mrrs, tenors = mrr_grid(0.01, 0.10, 5), tenor_grid(12)
+    fractions = tenors * 30.4 / 360
+    surface = settlement_surface(1e6, 0.05, mrrs, tenors, year_fractions=fractions)
+    for j, fraction in enumerate(fractions):
+        np.testing.assert_allclose(surface[:, j], cash_settlement_pv(1e6, 0.05, 0, tenors[j], mrrs, fraction), rtol=1e-14)
@@ -0,0 +1,153 @@
+import asyncio
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+from pricing.daycount import accrual_fractions, available_calendars, load_holiday_calendar
+from pricing.fra import settle_fra
+from pricing.service import MicroBatcher, PricingService, RequestError, fra_kernel, parse_fra_request
+
+
+TRADES = {
+    "notional_principal": [1e6, 2e6, 5e5],
+    "fixed_rate": [0.05, 0.045, 0.06],
+    "start_period": [3, 6, 12],
+    "end_period": [9, 12, 24],
+    "market_reference_rate": [0.055, 0.05, 0.058],
+}
+
+
+def _kernel(payload):
+    return fra_kernel(parse_fra_request(payload))
+
+
+def test_default_period_fraction_matches_the_kernel():
+    results = _kernel(TRADES)
+    expected = settle_fra(*(np.array(TRADES[f]) for f in TRADES))
+    np.testing.assert_allclose(results["cash_settlement_pv"], expected.cash_settlement_pv, rtol=1e-15)
+    assert results["valid"].all()
+
+
+def test_explicit_and_dated_period_fractions():
+    explicit = _kernel({**TRADES, "period_fraction": [0.5, None, 1.02]})
+    np.testing.assert_allclose(explicit["period_fraction"], [0.5, 0.5, 1.02])
+
+    dated = _kernel({**TRADES, "trade_date": "2025-01-31", "day_count": "act/365f", "calendar": "TARGET"})
+    expected = accrual_fractions(
+        np.full(3, "2025-01-31", dtype="datetime64[D]"), TRADES["start_period"], TRADES["end_period"],
+        "ACT/365F", load_holiday_calendar(available_calendars()["TARGET"]),
+    )
+    np.testing.assert_allclose(dated["period_fraction"], expected, rtol=1e-15)
+    pv = settle_fra(*(np.array(TRADES[f]) for f in TRADES), expected).cash_settlement_pv
+    np.testing.assert_allclose(dated["cash_settlement_pv"], pv, rtol=1e-15)
+
+
+@pytest.mark.parametrize("extra", [
+    {"trade_date": "2025-01-31", "day_count": "BUS/252"},
+    {"trade_date": "not a date"},
+    {"trade_date": "2025-01-31", "calendar": "nowhere"},
+    {"period_fraction": [0.5, 0.5]},
+    {"trade_date": "2025-01-31", "day_count": ["ACT/360", "ACT/365F"]},
+    {"trade_date": "2025-01-31", "end_period": [9, 12, 1e300]},
+    {"trade_date": "2025-01-31", "end_period": [9, 12, 1e18]},
+])
+def test_bad_day_count_inputs_are_request_errors(extra):
+    with pytest.raises(RequestError):
+        parse_fra_request({**TRADES, **extra})
+
+
+def test_a_failing_request_does_not_fail_its_batch():
+    def kernel(columns):
+        if np.any(columns["x"] < 0):
+            raise ArithmeticError("negative input")
+        return {"y": columns["x"] * 2}
+
+    async def run():
+        batcher = MicroBatcher(kernel, ThreadPoolExecutor(1))
+        batcher.start()
+        try:
+            return await asyncio.gather(
+                batcher.submit({"x": np.array([1.0, 2.0])}),
+                batcher.submit({"x": np.array([-1.0])}),
+                batcher.submit({"x": np.array([3.0])}),
+                return_exceptions=True,
+            )
+        finally:
+            await batcher.stop()
+
+    good, bad, other = asyncio.run(run())
+    np.testing.assert_array_equal(good["y"], [2.0, 4.0])
+    assert isinstance(bad, ArithmeticError)
+    np.testing.assert_array_equal(other["y"], [6.0])
+
+
+async def _exchange(port, request):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(request)
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    head, _, body = response.partition(b"\r\n\r\n")
+    return int(head.split()[1]), json.loads(body)
+
+
+def test_http_status_codes():
+    async def run():
+        service = PricingService(port=0, workers=1)
+        server = await service.start()
+        port = server.sockets[0].getsockname()[1]
+        try:
+            body = json.dumps(TRADES).encode()
+            ok = await _exchange(port, b"POST /fra/settle HTTP/1.1\r\nConnection: close\r\n"
+                                 b"Content-Length: %d\r\n\r\n%s" % (len(body), body))
+            bad_length = await _exchange(port, b"POST /fra/settle HTTP/1.1\r\nContent-Length: ten\r\n\r\n")
+            bad_terms = await _exchange(port, b"POST /fra/settle HTTP/1.1\r\nConnection: close\r\n"
+                                        b"Content-Length: 2\r\n\r\n{}")
+            return ok, bad_length, bad_terms
+        finally:
+            await service.stop()
+
+    (ok_status, ok_body), (length_status, _), (terms_status, terms_body) = asyncio.run(run())
+    assert ok_status == 200 and ok_body["valid"] == [True, True, True]
+    assert length_status == 400
+    assert terms_status == 400 and "Missing fields" in terms_body["error"]
+
+
+def _post(path, payload):
+    body = json.dumps(payload).encode()
+    return b"POST %s HTTP/1.1\r\nConnection: close\r\nContent-Length: %d\r\n\r\n%s" % (path, len(body), body)
+
+
+def test_unexpected_errors_are_answered_not_dropped(monkeypatch):
+    async def run():
+        service = PricingService(port=0, workers=1)
+        server = await service.start()
+        port = server.sockets[0].getsockname()[1]
+        try:
+            mismatched = await _exchange(port, _post(b"/fra/settle", {**TRADES, "trade_date": "2025-01-31",
+                                                                       "day_count": ["ACT/360", "ACT/365F"]}))
+            far_out = await _exchange(port, _post(b"/fra/settle", {**TRADES, "trade_date": "2025-01-31",
+                                                                    "end_period": [9, 12, 1e300]}))
+
+            def broken_parser(payload):
+                raise KeyError("unexpected")
+
+            service.routes["/fra/settle"] = (broken_parser, service.routes["/fra/settle"][1])
+            parser_bug = await _exchange(port, _post(b"/fra/settle", TRADES))
+
+            async def broken_dispatch(method, path, body):
+                raise RuntimeError("boom")
+
+            monkeypatch.setattr(service, "_dispatch", broken_dispatch)
+            dispatch_bug = await _exchange(port, _post(b"/fra/settle", TRADES))
+            return mismatched, far_out, parser_bug, dispatch_bug
+        finally:
+            await service.stop()
+
+    mismatched, far_out, parser_bug, dispatch_bug = asyncio.run(run())
+    assert mismatched[0] == 400 and "day_count" in mismatched[1]["error"]
+    assert far_out[0] == 400 and "1200 months" in far_out[1]["error"]
+    assert parser_bug[0] == 400 and "Invalid request" in parser_bug[1]["error"]
+    assert dispatch_bug[0] == 500 and "boom" in dispatch_bug[1]["error"]
@@ -0,0 +1,92 @@
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from pricing.blotter import generate_sample_blotter, settle_blotter, validate_chunks, validated_blotter_chunks
+from pricing.store import MANIFEST_FILE, TradeStore, available_trade_stores, write_trade_store
+
+
+def _validated(n=2_500, seed=4):
+    blotter = generate_sample_blotter(n, seed)
+    blotter.loc[7, "end_period"] = blotter.loc[7, "start_period"]
+    return blotter, pd.concat([terms for terms, _ in validated_blotter_chunks(blotter, 10_000)], ignore_index=True)
+
+
+def test_round_trip_keeps_every_column_and_the_rejected_count(tmp_path):
+    blotter, expected = _validated()
+    store = write_trade_store(validated_blotter_chunks(blotter, 700), tmp_path / "book", source="sample")
+    assert len(store) == len(expected) and store.rejected == 1
+    assert store.manifest["source"] == "sample"
+    for name in store.columns:
+        np.testing.assert_array_equal(store[name], expected[name].to_numpy())
+        assert not store[name].flags.writeable
+    reopened = pd.concat([terms for terms, _ in TradeStore(store.path).validated_chunks(1_000)], ignore_index=True)
+    pd.testing.assert_frame_equal(reopened, expected[list(store.columns)], check_dtype=False)
+    assert settle_blotter(store.path) == settle_blotter(blotter)
+    assert available_trade_stores(tmp_path) == {"book": store.path}
+
+
+def test_empty_book_round_trips(tmp_path):
+    blotter = generate_sample_blotter(10).iloc[:0]
+    store = write_trade_store(validate_chunks([blotter]), tmp_path / "empty")
+    assert len(store) == 0
+    assert settle_blotter(store).trades == 0
+
+
+def test_existing_store_is_replaced(tmp_path):
+    write_trade_store(validated_blotter_chunks(generate_sample_blotter(100), 50), tmp_path / "book")
+    store = write_trade_store(validated_blotter_chunks(generate_sample_blotter(30), 50), tmp_path / "book")
+    assert len(store) == 30
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["book"]
+
+
+def test_non_store_directory_is_left_untouched(tmp_path):
+    target = tmp_path / "reports"
+    target.mkdir()
+    (target / "keep.txt").write_text("important")
+    with pytest.raises(FileExistsError):
+        write_trade_store(validated_blotter_chunks(generate_sample_blotter(100), 50), target)
+    assert [p.name for p in target.iterdir()] == ["keep.txt"]
+    assert (target / "keep.txt").read_text() == "important"
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["reports"]
+
+    plain_file = tmp_path / "notes.csv"
+    plain_file.write_text("a,b\n")
+    with pytest.raises(FileExistsError):
+        write_trade_store(validated_blotter_chunks(generate_sample_blotter(100), 50), plain_file)
+    assert plain_file.read_text() == "a,b\n"
+
+
+def test_manifest_mismatches_are_rejected(tmp_path):
+    store = write_trade_store(validated_blotter_chunks(generate_sample_blotter(100), 50), tmp_path / "book")
+    manifest_path = tmp_path / "book" / MANIFEST_FILE
+    manifest = json.loads(manifest_path.read_text())
+
+    manifest_path.write_text(json.dumps(dict(manifest, trades=101)))
+    with pytest.raises(ValueError, match="does not match"):
+        TradeStore(store.path)
+    manifest_path.write_text(json.dumps(dict(manifest, version=99)))
+    with pytest.raises(ValueError, match="Unsupported"):
+        TradeStore(store.path)
+    with pytest.raises(ValueError, match="Not a trade store"):
+        TradeStore(tmp_path)
+
+
+@pytest.mark.parametrize("late_id, kept", [("17", True), ("", False), ("X7", False)])
+def test_trade_ids_are_checked_in_every_chunk(tmp_path, late_id, kept):
+    blotter = generate_sample_blotter(10, 1).astype({"trade_id": str})
+    blotter.loc[9, "trade_id"] = late_id
+    csv = tmp_path / "book.csv"
+    blotter.to_csv(csv, index=False)
+    # Chunks of 4 rows: the first two parse as integers, the last holds the odd id
+    store = write_trade_store(validated_blotter_chunks(str(csv), 4), tmp_path / "book")
+    assert len(store) == 10
+    if kept:
+        np.testing.assert_array_equal(store["trade_id"], list(range(9)) + [17])
+    else:
+        assert "trade_id" not in store.columns
+        assert sorted(p.name for p in (tmp_path / "book").iterdir()) == sorted(
+            [name + ".npy" for name in store.columns] + [MANIFEST_FILE]
+        )